@@ -2,8 +2,10 @@ from django.contrib import admin
 from .models import (
     MateriaCurso, Alumno, Materia, Inscripcion, Curso, 
     TipoEvaluacion, Carrera, CondicionFinal, Evaluacion, 
-    Profesor, ProfesorMateriaCurso, AlumnoMateriaCurso, CarreraMateria, AlumnoMateria
+    Profesor, ProfesorMateriaCurso, AlumnoMateriaCurso, CarreraMateria, AlumnoMateria,
+    ListaEspera
 )
+from .form import MateriaAdminForm
 
 class CarreraMateriaInline(admin.TabularInline):
     # Este Inline permite editar la relación CarreraMateria
@@ -12,6 +14,8 @@ class CarreraMateriaInline(admin.TabularInline):
 
 # Paso 2: Configurar la clase MateriaAdmin
 class MateriaAdmin(admin.ModelAdmin):
+    form = MateriaAdminForm
+
     # CLAVE: list_display muestra estas columnas en la tabla de listado
     list_display = (
         'sigla', 
@@ -35,6 +39,15 @@ class AlumnoMateriaCursoAdmin(admin.ModelAdmin):
     search_fields = ("alumno__nombre", "materia_curso__materia__nombre")
     list_editable = ("nota",)
 
+class MateriaCursoAdmin(admin.ModelAdmin):
+    list_display = ("materia", "curso", "turno_cursado", "horario", "cupo", "inscriptos")
+    list_filter = ("turno_cursado",)
+    readonly_fields = ("inscriptos",)
+
+class ListaEsperaAdmin(admin.ModelAdmin):
+    list_display = ("alumno", "materia_curso", "fecha_alta")
+    list_filter = ("materia_curso",)
+
 class ProfesorMateriaCursoInline(admin.TabularInline):
     model = ProfesorMateriaCurso
     extra = 1
@@ -45,10 +58,10 @@ class ProfesorAdmin(admin.ModelAdmin):
 
 admin.site.register(AlumnoMateriaCurso, AlumnoMateriaCursoAdmin)
 
-admin.site.register(MateriaCurso)
+admin.site.register(MateriaCurso, MateriaCursoAdmin)
 admin.site.register(Alumno)
 admin.site.register(Curso)
-admin.site.register(Materia)
+admin.site.register(Materia, MateriaAdmin)
 admin.site.register(CarreraMateria)
 admin.site.register(Inscripcion)
 admin.site.register(TipoEvaluacion)
@@ -57,6 +70,7 @@ admin.site.register(CondicionFinal)
 admin.site.register(Evaluacion)
 admin.site.register(ProfesorMateriaCurso)
 admin.site.register(AlumnoMateria)
+admin.site.register(ListaEspera, ListaEsperaAdmin)
 
 # ---------------------------------------------------------------------
 # 🔥 AGREGADO: Inline para asignar materias a un profesor
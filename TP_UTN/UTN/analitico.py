@@ -0,0 +1,124 @@
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+
+from .catalogo import version_catalogo
+from .models import AlumnoMateria, AlumnoMateriaCurso, CarreraMateria
+
+
+# ======================================================
+#   ANALÍTICO DEL ALUMNO
+# ======================================================
+
+DURACION_CACHE_ANALITICO = 60 * 60
+
+APROBADA = "aprobada"
+EN_CURSO = "en_curso"
+PENDIENTE = "pendiente"
+
+
+def calcular_analitico(alumno):
+    """
+    Historial consolidado del alumno en tres consultas agregadas: cursadas
+    (AlumnoMateriaCurso) y aprobaciones cargadas a mano (AlumnoMateria)
+    agrupadas por materia, más el plan de su carrera. Lo que queda en
+    Python es unir resultados ya agregados, una fila por materia.
+    """
+    materias = {}
+
+    def materia(sigla, nombre):
+        return materias.setdefault(sigla, {
+            "sigla": sigla,
+            "nombre": nombre,
+            "anio": None,
+            "estado": PENDIENTE,
+            "nota": None,
+            "cursadas": 0,
+            "desaprobadas": 0,
+        })
+
+    for fila in AlumnoMateriaCurso.objects.filter(alumno=alumno).values(
+        "materia_curso__materia_id",
+        "materia_curso__materia__nombre"
+    ).order_by().annotate(
+        aprobada=Count("pk", filter=Q(aprobado=True)),
+        nota=Max("nota", filter=Q(aprobado=True)),
+        en_curso=Count("pk", filter=Q(finalizado=False)),
+        desaprobadas=Count("pk", filter=Q(finalizado=True, aprobado=False)),
+        cursadas=Count("pk")
+    ):
+        m = materia(fila["materia_curso__materia_id"], fila["materia_curso__materia__nombre"])
+        m["cursadas"] = fila["cursadas"]
+        m["desaprobadas"] = fila["desaprobadas"]
+        if fila["aprobada"]:
+            m["estado"] = APROBADA
+            m["nota"] = fila["nota"]
+        elif fila["en_curso"]:
+            m["estado"] = EN_CURSO
+
+    # Mismo criterio que Alumno.tiene_aprobada
+    for fila in AlumnoMateria.objects.filter(alumno=alumno, aprobado=True).values(
+        "materia_id", "materia__nombre", "nota_final"
+    ):
+        m = materia(fila["materia_id"], fila["materia__nombre"])
+        m["estado"] = APROBADA
+        if fila["nota_final"] is not None and (m["nota"] is None or fila["nota_final"] > m["nota"]):
+            m["nota"] = fila["nota_final"]
+
+    plan = list(
+        CarreraMateria.objects.filter(carrera_id=alumno.carrera_id).values(
+            "materia_id", "materia__nombre", "anio"
+        ).order_by("anio", "materia__nombre")
+    )
+    for fila in plan:
+        materia(fila["materia_id"], fila["materia__nombre"])["anio"] = fila["anio"]
+
+    en_plan = [materias[fila["materia_id"]] for fila in plan]
+    fuera_del_plan = sorted(
+        (m for m in materias.values() if m["anio"] is None),
+        key=lambda m: m["nombre"]
+    )
+
+    por_anio = {}
+    for m in en_plan:
+        anio = por_anio.setdefault(m["anio"], {"anio": m["anio"], "total": 0, "aprobadas": 0})
+        anio["total"] += 1
+        anio["aprobadas"] += m["estado"] == APROBADA
+
+    aprobadas = [m for m in materias.values() if m["estado"] == APROBADA]
+    notas = [m["nota"] for m in aprobadas if m["nota"] is not None]
+    aprobadas_del_plan = sum(m["estado"] == APROBADA for m in en_plan)
+
+    return {
+        "alumno": {
+            "id": alumno.pk,
+            "nombre": alumno.nombre,
+            "apellido": alumno.apellido,
+            "carrera_id": alumno.carrera_id,
+        },
+        "materias": en_plan + fuera_del_plan,
+        "por_anio": list(por_anio.values()),
+        "aprobadas": len(aprobadas),
+        "en_curso": sum(m["estado"] == EN_CURSO for m in materias.values()),
+        "total_plan": len(en_plan),
+        "avance": round(100 * aprobadas_del_plan / len(en_plan), 1) if en_plan else 0.0,
+        "promedio": round(sum(notas) / len(notas), 2) if notas else None,
+        "version": alumno.version_inscripciones,
+    }
+
+
+def analitico_de(alumno):
+    """
+    Versión cacheada. La clave incluye version_inscripciones, que avanza
+    con cada cambio de notas o inscripciones, la carrera y la versión del
+    catálogo (planes y nombres de materias): no hace falta borrar nada,
+    las claves viejas simplemente dejan de usarse.
+    """
+    clave = (
+        f"analitico:{alumno.pk}:v{alumno.version_inscripciones}"
+        f":c{alumno.carrera_id}:k{version_catalogo()}"
+    )
+    datos = cache.get(clave)
+    if datos is None:
+        datos = calcular_analitico(alumno)
+        cache.set(clave, datos, DURACION_CACHE_ANALITICO)
+    return datos
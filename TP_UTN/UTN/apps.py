@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UtnConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'UTN'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,147 @@
+import re
+
+from django.db import DatabaseError, connection, connections
+from django.db.models import Case, Q, When
+
+from .models import Carrera, Materia
+
+
+# ======================================================
+#   BÚSQUEDA DE TEXTO COMPLETO (SQLITE FTS5)
+# ======================================================
+
+TABLA_BUSQUEDA = 'UTN_busqueda'
+
+# unicode61 con remove_diacritics 2 compara sin acentos ni mayúsculas:
+# "fisica" encuentra "Física". El índice de prefijos acelera "ing*".
+SQL_CREAR_INDICE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA_BUSQUEDA} USING fts5("
+    "tipo UNINDEXED, clave UNINDEXED, nombre, sigla, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+SQL_BORRAR_INDICE = f"DROP TABLE IF EXISTS {TABLA_BUSQUEDA}"
+
+MATERIA = 'materia'
+CARRERA = 'carrera'
+
+# Pesos de bm25 por columna (tipo, clave, nombre, sigla)
+PESOS_BM25 = '0, 0, 10.0, 5.0'
+
+MAX_RESULTADOS = 500
+
+
+def _tipo_de(modelo):
+    return {Materia: MATERIA, Carrera: CARRERA}[modelo]
+
+
+def _filas_de(materias, carreras):
+    for materia in materias:
+        yield (MATERIA, materia.sigla, materia.nombre, materia.sigla)
+    for carrera in carreras:
+        yield (CARRERA, str(carrera.pk), carrera.nombre or '', '')
+
+
+def disponible(conexion=None):
+    return (conexion or connection).vendor == 'sqlite'
+
+
+def reconstruir_indice(materias, carreras, conexion=None):
+    """Vacía y vuelve a llenar el índice con esas materias y carreras."""
+    conexion = conexion or connection
+    if not disponible(conexion):
+        return 0
+
+    filas = list(_filas_de(materias, carreras))
+    with conexion.cursor() as cursor:
+        cursor.execute(SQL_CREAR_INDICE)
+        cursor.execute(f"DELETE FROM {TABLA_BUSQUEDA}")
+        cursor.executemany(
+            f"INSERT INTO {TABLA_BUSQUEDA} (tipo, clave, nombre, sigla) VALUES (%s, %s, %s, %s)",
+            filas
+        )
+        # Compacta los segmentos que dejan los INSERT sueltos
+        cursor.execute(f"INSERT INTO {TABLA_BUSQUEDA} ({TABLA_BUSQUEDA}) VALUES ('optimize')")
+    return len(filas)
+
+
+def _quitar(cursor, tipo, clave):
+    cursor.execute(f"DELETE FROM {TABLA_BUSQUEDA} WHERE tipo = %s AND clave = %s", [tipo, clave])
+
+
+def indexar(instancia):
+    """Agrega o reemplaza una materia o carrera en el índice."""
+    if not disponible():
+        return
+    if isinstance(instancia, Materia):
+        fila = next(_filas_de([instancia], []))
+    else:
+        fila = next(_filas_de([], [instancia]))
+    with connection.cursor() as cursor:
+        _quitar(cursor, fila[0], fila[1])
+        cursor.execute(
+            f"INSERT INTO {TABLA_BUSQUEDA} (tipo, clave, nombre, sigla) VALUES (%s, %s, %s, %s)",
+            fila
+        )
+
+
+def desindexar(instancia):
+    if not disponible():
+        return
+    with connection.cursor() as cursor:
+        _quitar(cursor, _tipo_de(type(instancia)), str(instancia.pk))
+
+
+def consulta_fts(texto):
+    """
+    Convierte lo que escribió el usuario en una consulta FTS5: cada
+    palabra entre comillas (así no se interpreta la sintaxis de FTS) y
+    como prefijo, todas obligatorias. None si no queda ninguna palabra.
+    """
+    palabras = re.findall(r'\w+', texto)
+    if not palabras:
+        return None
+    return ' '.join(f'"{palabra}"*' for palabra in palabras)
+
+
+def buscar(tipo, texto, limite=MAX_RESULTADOS, conexion=None):
+    """Claves de `tipo` que coinciden con `texto`, de la más relevante a la menos."""
+    consulta = consulta_fts(texto)
+    if consulta is None:
+        return []
+    with (conexion or connection).cursor() as cursor:
+        cursor.execute(
+            f"SELECT clave FROM {TABLA_BUSQUEDA} "
+            f"WHERE {TABLA_BUSQUEDA} MATCH %s AND tipo = %s "
+            f"ORDER BY bm25({TABLA_BUSQUEDA}, {PESOS_BM25}) LIMIT %s",
+            [consulta, tipo, limite]
+        )
+        return [clave for (clave,) in cursor.fetchall()]
+
+
+def filtrar_por_texto(queryset, texto):
+    """
+    Filtra un queryset de Materia o Carrera por `texto` y lo ordena por
+    relevancia, anotada en `relevancia` (0 = la mejor). Si el índice no
+    está disponible (otra base de datos o la tabla todavía no existe)
+    vuelve al icontains de siempre, sin esa anotación.
+    """
+    modelo = queryset.model
+    conexion = connections[queryset.db]
+
+    if disponible(conexion) and consulta_fts(texto) is not None:
+        try:
+            claves = buscar(_tipo_de(modelo), texto, conexion=conexion)
+        except DatabaseError:
+            pass
+        else:
+            if modelo is Carrera:
+                claves = [int(clave) for clave in claves]
+            if not claves:
+                return queryset.none()
+            orden = Case(*(When(pk=clave, then=posicion) for posicion, clave in enumerate(claves)))
+            return queryset.filter(pk__in=claves).annotate(relevancia=orden).order_by('relevancia')
+
+    filtro = Q(nombre__icontains=texto)
+    if modelo is Materia:
+        filtro |= Q(sigla__icontains=texto)
+    return queryset.filter(filtro)
@@ -0,0 +1,114 @@
+import datetime
+
+from django.core import signing
+from django.utils import timezone
+
+from .models import AlumnoMateriaCurso
+
+
+# ======================================================
+#   FEED ICALENDAR (.ics) DEL ALUMNO
+# ======================================================
+
+FIRMA_CALENDARIO = signing.Signer(salt='UTN.calendario')
+
+
+def firma_calendario(alumno_id):
+    """
+    Firma del link del feed. Las apps de calendario no inician sesión,
+    así que el link en sí funciona como credencial.
+    """
+    return FIRMA_CALENDARIO.signature(str(alumno_id))
+
+
+def firma_valida(alumno_id, firma):
+    return signing.constant_time_compare(firma_calendario(alumno_id), firma)
+
+
+def etag_calendario(alumno_id, version):
+    return f'"alumno-{alumno_id}-v{version}"'
+
+
+def _escapar(texto):
+    return (
+        str(texto)
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\n', '\\n')
+    )
+
+
+def _plegar(linea):
+    """RFC 5545: líneas de hasta 75 octetos, las siguientes empiezan con espacio."""
+    datos = linea.encode('utf-8')
+    if len(datos) <= 75:
+        return linea
+
+    partes, actual = [], b''
+    for caracter in linea:
+        codificado = caracter.encode('utf-8')
+        if len(actual) + len(codificado) > (75 if not partes else 74):
+            partes.append(actual.decode('utf-8'))
+            actual = b''
+        actual += codificado
+    partes.append(actual.decode('utf-8'))
+    return '\r\n '.join(partes)
+
+
+def _fecha_hora(fecha, minutos):
+    return f"{fecha:%Y%m%d}T{minutos // 60:02d}{minutos % 60:02d}00"
+
+
+def generar_ics(alumno):
+    """
+    Un evento semanal (RRULE) por franja de cada cursada en curso.
+
+    La salida depende sólo de datos que avanzan `version_inscripciones`:
+    las fechas se anclan en la semana de `inscripciones_modificadas`, así
+    misma versión implica el mismo archivo y el ETag es válido. Las horas
+    van sin zona (hora local "flotante"), que es como se publican los
+    horarios de cursada.
+    """
+    inscripciones = AlumnoMateriaCurso.objects.filter(
+        alumno=alumno,
+        finalizado=False
+    ).select_related(
+        "materia_curso__materia",
+        "materia_curso__curso"
+    ).prefetch_related(
+        "materia_curso__franjas"
+    ).order_by("pk")
+
+    modificado = alumno.inscripciones_modificadas
+    dia = timezone.localtime(modificado).date()
+    lunes = dia - datetime.timedelta(days=dia.weekday())
+    sello = f"{modificado.astimezone(datetime.timezone.utc):%Y%m%dT%H%M%SZ}"
+
+    lineas = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//UTN//Horario de cursada//ES",
+        "CALSCALE:GREGORIAN",
+        "X-WR-CALNAME:Cursada UTN",
+    ]
+
+    for ins in inscripciones:
+        mc = ins.materia_curso
+        for franja in mc.franjas.all():
+            fecha = lunes + datetime.timedelta(days=franja.dia)
+            lineas += [
+                "BEGIN:VEVENT",
+                f"UID:cursada-{ins.pk}-franja-{franja.pk}@utn",
+                f"DTSTAMP:{sello}",
+                f"DTSTART:{_fecha_hora(fecha, franja.inicio)}",
+                f"DTEND:{_fecha_hora(fecha, franja.fin)}",
+                "RRULE:FREQ=WEEKLY",
+                f"SUMMARY:{_escapar(mc.materia.nombre)}",
+                f"LOCATION:{_escapar(mc.curso.nombre)}",
+                f"DESCRIPTION:{_escapar(f'Curso {mc.curso.nombre} - Turno {mc.get_turno_cursado_display()}')}",
+                "END:VEVENT",
+            ]
+
+    lineas.append("END:VCALENDAR")
+    return "".join(_plegar(linea) + "\r\n" for linea in lineas)
@@ -0,0 +1,131 @@
+import bisect
+import heapq
+import threading
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .horarios import sin_acentos
+from .models import Materia, VersionCatalogo
+
+
+# ======================================================
+#   VERSIÓN DEL CATÁLOGO
+# ======================================================
+
+CLAVE_VERSION_CATALOGO = 'catalogo:version'
+
+# Cada cuánto se relee la versión de la base. Acota lo que tarda un
+# proceso en enterarse de un cambio hecho en otro si la caché no es
+# compartida; mientras tanto leer la versión no consulta la base.
+DURACION_VERSION_CATALOGO = 30
+
+
+def version_catalogo():
+    version = cache.get(CLAVE_VERSION_CATALOGO)
+    if version is None:
+        version = VersionCatalogo.objects.filter(pk=1).values_list('numero', flat=True).first() or 0
+        cache.set(CLAVE_VERSION_CATALOGO, version, DURACION_VERSION_CATALOGO)
+    return version
+
+
+def avanzar_version_catalogo():
+    """
+    Lo llaman las señales de Materia, Carrera, CarreraMateria y
+    correlativas. La caché se limpia al confirmar la transacción, así
+    nadie arma datos nuevos con el catálogo todavía sin confirmar.
+    """
+    if not VersionCatalogo.objects.filter(pk=1).update(numero=F('numero') + 1, modificado=timezone.now()):
+        VersionCatalogo.objects.get_or_create(pk=1, defaults={'numero': 1})
+    transaction.on_commit(lambda: cache.delete(CLAVE_VERSION_CATALOGO))
+
+
+# ======================================================
+#   AUTOCOMPLETADO DE MATERIAS (ÍNDICE DE PREFIJOS)
+# ======================================================
+
+MAX_SUGERENCIAS = 20
+
+# Prioridad de cada clave al ordenar las sugerencias
+SIGLA, NOMBRE, PALABRA = 0, 1, 2
+
+
+def normalizar(texto):
+    """Minúsculas, sin acentos y con los espacios colapsados."""
+    return ' '.join(sin_acentos(texto or '').casefold().split())
+
+
+class IndicePrefijos:
+    """
+    Lista ordenada de claves normalizadas: la sigla, el nombre completo y
+    el nombre desde cada palabra ("analitica" encuentra "Álgebra y
+    Geometría Analítica"). Un prefijo es un rango contiguo de la lista,
+    que se ubica con dos búsquedas binarias.
+    """
+
+    def __init__(self, materias):
+        self.nombres = {}
+        self.orden = {}
+        entradas = set()
+
+        for sigla, nombre in materias:
+            self.nombres[sigla] = nombre
+            nombre_normalizado = normalizar(nombre)
+            self.orden[sigla] = nombre_normalizado
+
+            entradas.add((normalizar(sigla), SIGLA, sigla))
+            entradas.add((nombre_normalizado, NOMBRE, sigla))
+            palabras = nombre_normalizado.split()
+            for i in range(1, len(palabras)):
+                entradas.add((' '.join(palabras[i:]), PALABRA, sigla))
+
+        self.entradas = sorted(entradas)
+        self.claves = [clave for clave, _, _ in self.entradas]
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def buscar(self, texto, limite=MAX_SUGERENCIAS):
+        prefijo = normalizar(texto)
+        if not prefijo:
+            return []
+
+        inicio = bisect.bisect_left(self.claves, prefijo)
+        fin = bisect.bisect_left(self.claves, prefijo + '\U0010ffff', inicio)
+
+        # La mejor prioridad con la que aparece cada materia
+        mejores = {}
+        for _, prioridad, sigla in self.entradas[inicio:fin]:
+            if prioridad < mejores.get(sigla, PALABRA + 1):
+                mejores[sigla] = prioridad
+
+        elegidas = heapq.nsmallest(limite, mejores, key=lambda sigla: (mejores[sigla], self.orden[sigla], sigla))
+        return [{'sigla': sigla, 'nombre': self.nombres[sigla]} for sigla in elegidas]
+
+
+_indice_materias = None
+_lock_indice = threading.Lock()
+
+
+def indice_materias():
+    """
+    Índice en memoria del proceso, armado con una sola consulta. Se
+    vuelve a armar recién cuando cambia la versión del catálogo; mientras
+    tanto cada búsqueda no toca la base.
+    """
+    global _indice_materias
+
+    version = version_catalogo()
+    actual = _indice_materias
+    if actual is None or actual[0] != version:
+        with _lock_indice:
+            if _indice_materias is None or _indice_materias[0] != version:
+                _indice_materias = (version, IndicePrefijos(Materia.objects.values_list('sigla', 'nombre')))
+            actual = _indice_materias
+    return actual[1]
+
+
+def autocompletar_materias(texto, limite=MAX_SUGERENCIAS):
+    return indice_materias().buscar(texto, limite)
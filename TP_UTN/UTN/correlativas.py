@@ -0,0 +1,272 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from .models import AlumnoMateriaCurso, CorrelativaClausura, Materia
+
+
+# ======================================================
+#   MOTOR DE CORRELATIVIDADES
+# ======================================================
+
+class EvaluadorCorrelativas:
+    """
+    Evalúa correlatividades de un alumno sin consultar la base por materia.
+
+    Al construirse hace dos consultas: las materias aprobadas del alumno y
+    las correlativas directas de las materias a evaluar (o de toda la
+    carrera). Después responde el estado de cada materia en memoria.
+    """
+
+    APROBADA = "aprobada"
+    CORRELATIVA = "correlativa"
+    OK = "ok"
+
+    def __init__(self, alumno, materias=None, carrera=None):
+        # carrera: id de la carrera cuyo grafo completo se quiere cargar
+        self.alumno = alumno
+
+        self.aprobadas = set(
+            AlumnoMateriaCurso.objects.filter(
+                alumno=alumno,
+                aprobado=True
+            ).values_list('materia_curso__materia_id', flat=True)
+        )
+
+        correlativas = Materia.correlativas_requeridas.through.objects.select_related('to_materia')
+
+        if materias is not None:
+            siglas = [m.pk if isinstance(m, Materia) else m for m in materias]
+            correlativas = correlativas.filter(from_materia_id__in=siglas)
+        elif carrera is not None:
+            correlativas = correlativas.filter(from_materia__carreramateria__carrera_id=carrera)
+
+        self.requeridas = {}
+        for rel in correlativas.order_by('from_materia_id', 'to_materia_id'):
+            self.requeridas.setdefault(rel.from_materia_id, []).append(rel.to_materia)
+
+    @classmethod
+    def para_carrera(cls, alumno):
+        """Carga el grafo completo de la carrera del alumno."""
+        return cls(alumno, carrera=alumno.carrera_id)
+
+    def aprobo(self, materia):
+        sigla = materia.pk if isinstance(materia, Materia) else materia
+        return sigla in self.aprobadas
+
+    def correlativa_faltante(self, materia):
+        """Devuelve la primera correlativa directa sin aprobar, o None."""
+        sigla = materia.pk if isinstance(materia, Materia) else materia
+        for correlativa in self.requeridas.get(sigla, []):
+            if correlativa.sigla not in self.aprobadas:
+                return correlativa
+        return None
+
+    def cumple(self, materia):
+        """Misma firma que alumno_cumple_correlativas: (cumple, faltante)."""
+        faltante = self.correlativa_faltante(materia)
+        return faltante is None, faltante
+
+    def estado(self, materia):
+        """
+        Devuelve (estado, correlativa_faltante) con estado en
+        "aprobada", "correlativa" u "ok".
+        """
+        if self.aprobo(materia):
+            return self.APROBADA, None
+
+        faltante = self.correlativa_faltante(materia)
+        if faltante is not None:
+            return self.CORRELATIVA, faltante
+
+        return self.OK, None
+
+
+def alumnos_que_cumplen(alumno_ids, materia):
+    """
+    Versión por lote: de `alumno_ids`, devuelve el set de los que tienen
+    aprobadas todas las correlativas directas de `materia`. Dos consultas
+    sin importar la cantidad de alumnos.
+    """
+    alumno_ids = set(alumno_ids)
+    requeridas = set(materia.correlativas_requeridas.values_list('sigla', flat=True))
+    if not requeridas:
+        return alumno_ids
+
+    aprobadas = {}
+    for alumno_id, sigla in AlumnoMateriaCurso.objects.filter(
+        alumno_id__in=alumno_ids,
+        materia_curso__materia_id__in=requeridas,
+        aprobado=True
+    ).values_list('alumno_id', 'materia_curso__materia_id').distinct():
+        aprobadas.setdefault(alumno_id, set()).add(sigla)
+
+    return {a for a in alumno_ids if aprobadas.get(a, set()) >= requeridas}
+
+
+# ======================================================
+#   CLAUSURA TRANSITIVA DE CORRELATIVAS
+# ======================================================
+
+def calcular_clausura(aristas):
+    """
+    Recibe pares (materia, requerida) y devuelve
+    {(ancestro, descendiente): profundidad} con el camino más corto.
+    No consulta la base.
+    """
+    requeridas = {}
+    for materia, requerida in aristas:
+        requeridas.setdefault(materia, []).append(requerida)
+
+    clausura = {}
+    for origen in requeridas:
+        visitadas = {}
+        frontera = [origen]
+        profundidad = 0
+
+        while frontera:
+            profundidad += 1
+            siguiente = []
+            for materia in frontera:
+                for requerida in requeridas.get(materia, []):
+                    if requerida != origen and requerida not in visitadas:
+                        visitadas[requerida] = profundidad
+                        siguiente.append(requerida)
+            frontera = siguiente
+
+        for ancestro, prof in visitadas.items():
+            clausura[(ancestro, origen)] = prof
+
+    return clausura
+
+
+def validar_sin_ciclos(aristas):
+    """
+    Valida que agregar las aristas (materia, requerida) no genere un ciclo.
+    Con la clausura alcanza una sola consulta: hay ciclo si la requerida ya
+    depende (directa o indirectamente) de la materia.
+    """
+    aristas = list(aristas)
+
+    for materia, requerida in aristas:
+        if materia == requerida:
+            raise ValidationError("Una materia no puede ser correlativa de sí misma.")
+
+    if not aristas:
+        return
+
+    condicion = Q()
+    for materia, requerida in aristas:
+        condicion |= Q(ancestro_id=materia, descendiente_id=requerida)
+
+    ciclo = CorrelativaClausura.objects.filter(condicion).select_related('ancestro', 'descendiente').first()
+    if ciclo is not None:
+        raise ValidationError(
+            f"{ciclo.descendiente.nombre} ya requiere {ciclo.ancestro.nombre}: "
+            f"agregarla como correlativa generaría un ciclo."
+        )
+
+
+def agregar_a_clausura(aristas):
+    """Actualiza la clausura después de agregar aristas (materia, requerida)."""
+    for materia, requerida in aristas:
+        ancestros = {requerida: 0}
+        ancestros.update(
+            CorrelativaClausura.objects.filter(descendiente_id=requerida).values_list('ancestro_id', 'profundidad')
+        )
+        descendientes = {materia: 0}
+        descendientes.update(
+            CorrelativaClausura.objects.filter(ancestro_id=materia).values_list('descendiente_id', 'profundidad')
+        )
+
+        existentes = {
+            (fila.ancestro_id, fila.descendiente_id): fila
+            for fila in CorrelativaClausura.objects.filter(
+                ancestro_id__in=ancestros,
+                descendiente_id__in=descendientes
+            )
+        }
+
+        nuevas, actualizadas = [], []
+        for ancestro, prof_ancestro in ancestros.items():
+            for descendiente, prof_descendiente in descendientes.items():
+                profundidad = prof_ancestro + 1 + prof_descendiente
+                fila = existentes.get((ancestro, descendiente))
+
+                if fila is None:
+                    nuevas.append(CorrelativaClausura(
+                        ancestro_id=ancestro,
+                        descendiente_id=descendiente,
+                        profundidad=profundidad
+                    ))
+                elif profundidad < fila.profundidad:
+                    fila.profundidad = profundidad
+                    actualizadas.append(fila)
+
+        CorrelativaClausura.objects.bulk_create(nuevas)
+        CorrelativaClausura.objects.bulk_update(actualizadas, ['profundidad'])
+
+
+def recalcular_clausura(materias):
+    """
+    Recalcula las filas de las materias indicadas y de todas las que
+    dependen de ellas (por ejemplo, después de quitar una correlativa).
+    El resto de la clausura no cambia y se reutiliza tal cual.
+    """
+    materias = set(materias)
+    afectadas = materias | set(
+        CorrelativaClausura.objects.filter(ancestro_id__in=materias).values_list('descendiente_id', flat=True)
+    )
+
+    requeridas = {}
+    for materia, requerida in Materia.correlativas_requeridas.through.objects.filter(
+        from_materia_id__in=afectadas
+    ).values_list('from_materia_id', 'to_materia_id'):
+        requeridas.setdefault(materia, []).append(requerida)
+
+    externas = {r for lista in requeridas.values() for r in lista if r not in afectadas}
+    clausura = {materia: {} for materia in externas}
+    for ancestro, descendiente, profundidad in CorrelativaClausura.objects.filter(
+        descendiente_id__in=externas
+    ).values_list('ancestro_id', 'descendiente_id', 'profundidad'):
+        clausura[descendiente][ancestro] = profundidad
+
+    def resolver(materia):
+        if materia not in clausura:
+            ancestros = {}
+            for requerida in requeridas.get(materia, []):
+                candidatos = {requerida: 0}
+                candidatos.update(resolver(requerida))
+                for ancestro, profundidad in candidatos.items():
+                    if ancestro not in ancestros or profundidad + 1 < ancestros[ancestro]:
+                        ancestros[ancestro] = profundidad + 1
+            clausura[materia] = ancestros
+        return clausura[materia]
+
+    filas = []
+    for materia in afectadas:
+        for ancestro, profundidad in resolver(materia).items():
+            filas.append(CorrelativaClausura(
+                ancestro_id=ancestro,
+                descendiente_id=materia,
+                profundidad=profundidad
+            ))
+
+    CorrelativaClausura.objects.filter(descendiente_id__in=afectadas).delete()
+    CorrelativaClausura.objects.bulk_create(filas)
+
+
+def reconstruir_clausura():
+    """
+    Reconstruye la clausura completa desde las correlativas directas
+    (ver `manage.py reconstruir_correlativas`). Devuelve la cantidad de filas.
+    """
+    aristas = Materia.correlativas_requeridas.through.objects.values_list('from_materia_id', 'to_materia_id')
+
+    filas = [
+        CorrelativaClausura(ancestro_id=ancestro, descendiente_id=descendiente, profundidad=profundidad)
+        for (ancestro, descendiente), profundidad in calcular_clausura(aristas).items()
+    ]
+    CorrelativaClausura.objects.all().delete()
+    CorrelativaClausura.objects.bulk_create(filas)
+    return len(filas)
+
@@ -0,0 +1,152 @@
+import heapq
+import math
+from functools import lru_cache
+
+from .models import AlumnoMateria, AlumnoMateriaCurso
+from .plan import GrafoCorrelativas, plan_de
+
+
+# ======================================================
+#   CAMINO MÁS CORTO AL EGRESO
+# ======================================================
+
+CARGA_POR_DEFECTO = 5
+CARGA_MAXIMA = 12
+
+
+def aprobadas_de(alumno_ids):
+    """
+    {alumno_id: siglas aprobadas} con el mismo criterio que el analítico
+    (cursadas aprobadas y aprobaciones cargadas a mano). Dos consultas
+    para todo el grupo de alumnos.
+    """
+    aprobadas = {alumno_id: set() for alumno_id in alumno_ids}
+    for alumno_id, sigla in AlumnoMateriaCurso.objects.filter(
+        alumno_id__in=aprobadas,
+        aprobado=True
+    ).values_list('alumno_id', 'materia_curso__materia_id'):
+        aprobadas[alumno_id].add(sigla)
+    for alumno_id, sigla in AlumnoMateria.objects.filter(
+        alumno_id__in=aprobadas,
+        aprobado=True
+    ).values_list('alumno_id', 'materia_id'):
+        aprobadas[alumno_id].add(sigla)
+    return aprobadas
+
+
+class GrafoPlan(GrafoCorrelativas):
+    """GrafoCorrelativas armado desde el JSON de plan_de, con año y nombre."""
+
+    def __init__(self, datos):
+        nodos = {nodo['sigla']: nodo for nodo in datos['nodos']}
+        super().__init__(nodos, {sigla: nodo['requiere'] for sigla, nodo in nodos.items()})
+        self.en_plan = frozenset(nodos)
+        self.anio = {sigla: nodo['anio'] for sigla, nodo in nodos.items()}
+        self.nombre = {sigla: nodo['nombre'] for sigla, nodo in nodos.items()}
+        self.fuera_del_plan = {
+            sigla: nodo['requiere_fuera_del_plan']
+            for sigla, nodo in nodos.items() if nodo['requiere_fuera_del_plan']
+        }
+
+
+# {carrera_id: (version, GrafoPlan)}
+_grafos = {}
+
+
+def grafo_de(carrera_id):
+    """Un GrafoPlan por carrera y versión del catálogo, armado una sola vez."""
+    version, datos = plan_de(carrera_id)
+    guardado = _grafos.get(carrera_id)
+    if guardado is None or guardado[0] != version:
+        guardado = _grafos[carrera_id] = (version, GrafoPlan(datos))
+    return guardado[1]
+
+
+@lru_cache(maxsize=4096)
+def _planificar(grafo, aprobadas, carga):
+    """
+    Memoizado por (grafo, aprobadas, carga): los alumnos de una misma
+    cohorte suelen tener las mismas aprobadas, así que en un lote la
+    mayoría de las llamadas no calcula nada. El resultado es compartido:
+    no se debe modificar.
+    """
+    restantes = [m for m in grafo.orden if m not in aprobadas]
+    pendientes = {m: sum(r not in aprobadas for r in grafo.requeridas[m]) for m in restantes}
+
+    # Ruta crítica dentro de lo que falta
+    altura = {}
+    for materia in reversed(restantes):
+        altura[materia] = max(
+            (altura[d] + 1 for d in grafo.dependientes[materia] if d in pendientes),
+            default=0
+        )
+
+    # Por niveles: cada cuatrimestre toma hasta `carga` materias
+    # disponibles, primero las de la ruta crítica más larga
+    disponibles = [(-altura[m], grafo.anio[m], m) for m in restantes if pendientes[m] == 0]
+    heapq.heapify(disponibles)
+    cuatrimestres = []
+    while disponibles:
+        cursadas = [heapq.heappop(disponibles)[2] for _ in range(min(carga, len(disponibles)))]
+        cuatrimestres.append(sorted(cursadas, key=lambda m: (grafo.anio[m], m)))
+        for materia in cursadas:
+            for dependiente in grafo.dependientes[materia]:
+                if dependiente in pendientes:
+                    pendientes[dependiente] -= 1
+                    if pendientes[dependiente] == 0:
+                        heapq.heappush(disponibles, (-altura[dependiente], grafo.anio[dependiente], dependiente))
+
+    ruta_critica = []
+    if altura:
+        actual = min(altura, key=lambda m: (-altura[m], m))
+        ruta_critica.append(actual)
+        while altura[actual] > 0:
+            actual = min(d for d in grafo.dependientes[actual] if altura.get(d) == altura[actual] - 1)
+            ruta_critica.append(actual)
+
+    return {
+        "restantes": len(restantes),
+        "carga": carga,
+        "cuatrimestres": len(cuatrimestres),
+        # Ninguna planificación puede bajar de esto; si coincide con
+        # `cuatrimestres`, la sugerida es óptima
+        "minimo_teorico": max(len(ruta_critica), math.ceil(len(restantes) / carga)),
+        "ruta_critica": ruta_critica,
+        "plan": [
+            {
+                "cuatrimestre": numero,
+                "materias": [{"sigla": m, "nombre": grafo.nombre[m]} for m in materias],
+            }
+            for numero, materias in enumerate(cuatrimestres, start=1)
+        ],
+        "correlativas_fuera_del_plan": {
+            m: requeridas for m, requeridas in grafo.fuera_del_plan.items()
+            if m not in aprobadas and not set(requeridas) <= aprobadas
+        },
+        "sin_orden": [m for m in grafo.ciclicas if m not in aprobadas],
+    }
+
+
+def carga_desde(valor):
+    """Carga por cuatrimestre pedida (por ejemplo, de la query string), acotada."""
+    if valor is not None and str(valor).isdigit():
+        return min(max(int(valor), 1), CARGA_MAXIMA)
+    return CARGA_POR_DEFECTO
+
+
+def egreso_de(alumno, carga=CARGA_POR_DEFECTO, aprobadas=None):
+    """Cuatrimestres que le faltan al alumno y una secuencia sugerida."""
+    if aprobadas is None:
+        aprobadas = aprobadas_de([alumno.pk])[alumno.pk]
+    grafo = grafo_de(alumno.carrera_id)
+    return _planificar(grafo, grafo.en_plan.intersection(aprobadas), carga)
+
+
+def egreso_de_cohorte(alumnos, carga=CARGA_POR_DEFECTO):
+    """
+    Versión por lote: [(alumno, resultado)]. Las aprobadas de todos salen
+    en dos consultas y el grafo de cada carrera se arma una vez.
+    """
+    alumnos = list(alumnos)
+    aprobadas = aprobadas_de([alumno.pk for alumno in alumnos])
+    return [(alumno, egreso_de(alumno, carga, aprobadas[alumno.pk])) for alumno in alumnos]
@@ -0,0 +1,131 @@
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import AlumnoMateriaCurso, EstadisticaMateriaCurso, aporte_estadistico
+
+
+# ======================================================
+#   ESTADÍSTICAS POR CURSO (MANTENIMIENTO INCREMENTAL)
+# ======================================================
+
+CAMPOS_ESTADISTICA = [
+    'inscriptos', 'calificados', 'aprobados', 'suma_notas',
+] + [f'hist_{nota}' for nota in range(11)]
+
+
+def agregados_por_curso(inscripciones):
+    """
+    Calcula desde cero los campos de EstadisticaMateriaCurso agrupando
+    `inscripciones` por curso.
+    """
+    calificada = Q(finalizado=True)
+    return inscripciones.order_by().values('materia_curso').annotate(
+        inscriptos=Count('pk'),
+        calificados=Count('pk', filter=calificada),
+        aprobados=Count('pk', filter=calificada & Q(aprobado=True)),
+        suma_notas=Coalesce(Sum(F('nota_1') + F('nota_2') + F('nota_3'), filter=calificada), 0),
+        **{f'hist_{nota}': Count('pk', filter=calificada & Q(nota=nota)) for nota in range(11)}
+    )
+
+
+def recalcular_estadisticas(materia_curso_ids):
+    """Recalcula desde cero las estadísticas de los cursos indicados."""
+    filas = {
+        materia_curso_id: EstadisticaMateriaCurso(materia_curso_id=materia_curso_id)
+        for materia_curso_id in materia_curso_ids
+    }
+    if not filas:
+        return
+
+    for valores in agregados_por_curso(AlumnoMateriaCurso.objects.filter(materia_curso_id__in=filas)):
+        fila = filas[valores.pop('materia_curso')]
+        for campo, valor in valores.items():
+            setattr(fila, campo, valor)
+
+    EstadisticaMateriaCurso.objects.bulk_create(
+        filas.values(),
+        update_conflicts=True,
+        unique_fields=['materia_curso'],
+        update_fields=CAMPOS_ESTADISTICA
+    )
+
+
+def _acumular(deltas, aporte, signo):
+    materia_curso_id, finalizado, aprobado, suma, nota = aporte
+    delta = deltas.setdefault(materia_curso_id, {})
+
+    def sumar(campo, valor=1):
+        delta[campo] = delta.get(campo, 0) + signo * valor
+
+    sumar('inscriptos')
+    if finalizado:
+        sumar('calificados')
+        sumar('suma_notas', suma)
+        if nota is not None:
+            sumar(f'hist_{nota}')
+        if aprobado:
+            sumar('aprobados')
+
+
+def _aplicar(deltas, recalcular=(), crear=True):
+    """
+    Un UPDATE con F() por curso afectado: concurrente-seguro y sin leer
+    la fila. Si el curso todavía no tiene fila, se calcula completa
+    (salvo en borrados, donde no hace falta crearla).
+    """
+    faltantes = set(recalcular)
+
+    for materia_curso_id, delta in deltas.items():
+        if materia_curso_id in faltantes:
+            continue
+        cambios = {campo: F(campo) + valor for campo, valor in delta.items() if valor}
+        if not cambios:
+            continue
+        if not EstadisticaMateriaCurso.objects.filter(materia_curso_id=materia_curso_id).update(**cambios):
+            faltantes.add(materia_curso_id)
+
+    if crear:
+        recalcular_estadisticas(faltantes)
+
+
+def actualizar_estadisticas(inscripciones, creadas=False):
+    """
+    Aplica a EstadisticaMateriaCurso la diferencia entre lo que cada
+    inscripción aportaba al leerse de la base (ver
+    AlumnoMateriaCurso.from_db) y lo que aporta ahora.
+
+    Lo llaman el post_save de AlumnoMateriaCurso y, como bulk_create y
+    bulk_update no disparan señales, también notas.guardar_notas y las
+    altas por lote de inscripciones.py. `creadas=True` indica filas
+    recién insertadas. Si no se conoce el estado anterior de una fila,
+    su curso se recalcula completo.
+    """
+    deltas, recalcular = {}, set()
+
+    for ins in inscripciones:
+        anterior = None if creadas else getattr(ins, '_aporte_original', None)
+        nuevo = aporte_estadistico(ins)
+
+        if nuevo is None or (anterior is None and not creadas):
+            recalcular.add(ins.materia_curso_id)
+            if anterior is not None:
+                recalcular.add(anterior[0])
+        elif anterior != nuevo:
+            if anterior is not None:
+                _acumular(deltas, anterior, -1)
+            _acumular(deltas, nuevo, 1)
+
+        ins._aporte_original = nuevo
+
+    _aplicar(deltas, recalcular)
+
+
+def descontar_estadisticas(inscripcion):
+    """Resta el aporte de una inscripción borrada."""
+    aporte = getattr(inscripcion, '_aporte_original', None) or aporte_estadistico(inscripcion)
+    if aporte is None:
+        return
+
+    deltas = {}
+    _acumular(deltas, aporte, -1)
+    _aplicar(deltas, crear=False)
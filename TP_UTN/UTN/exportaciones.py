@@ -0,0 +1,86 @@
+import csv
+
+from django.http import StreamingHttpResponse
+
+from .models import AlumnoMateriaCurso
+
+
+# ======================================================
+#   EXPORTACIÓN DE NOTAS EN CSV (STREAMING)
+# ======================================================
+
+TAMANIO_LOTE_EXPORTACION = 2000
+
+# (encabezado, campo de values_list). Las primeras columnas coinciden con
+# las que espera importar_notas_csv, así un CSV exportado se puede volver
+# a importar tal cual.
+COLUMNAS_EXPORTACION = [
+    ('dni', 'alumno__dni'),
+    ('nota_1', 'nota_1'),
+    ('nota_2', 'nota_2'),
+    ('nota_3', 'nota_3'),
+    ('promedio', 'promedio'),
+    ('nota', 'nota'),
+    ('aprobado', 'aprobado'),
+    ('finalizado', 'finalizado'),
+    ('apellido', 'alumno__apellido'),
+    ('nombre', 'alumno__nombre'),
+    ('carrera', 'alumno__carrera__nombre'),
+    ('sigla', 'materia_curso__materia__sigla'),
+    ('materia', 'materia_curso__materia__nombre'),
+    ('ciclo_lectivo', 'materia_curso__materia__ciclo_lectivo'),
+    ('curso', 'materia_curso__curso__nombre'),
+    ('turno', 'materia_curso__turno_cursado'),
+]
+
+
+class Eco:
+    """Pseudo-archivo para csv.writer: devuelve la línea en vez de guardarla."""
+
+    def write(self, valor):
+        return valor
+
+
+# Cada consulta sale en el orden en que la base recorre sus índices, así
+# no hay que juntar el resultado para ordenarlo antes de mandar la primera
+# fila. El curso se lee por su índice de materia_curso, que ya viene por
+# clave primaria; la carrera queda agrupada por alumno y el ciclo por
+# materia y curso. Un ORDER BY por la clave en estas dos obliga a SQLite a
+# ordenar todo en un B-tree temporal.
+
+def notas_de_curso(materia_curso_id):
+    return AlumnoMateriaCurso.objects.filter(materia_curso_id=materia_curso_id).order_by('pk')
+
+
+def notas_de_carrera(carrera_id):
+    return AlumnoMateriaCurso.objects.filter(alumno__carrera_id=carrera_id).order_by()
+
+
+def notas_de_ciclo(ciclo_lectivo):
+    return AlumnoMateriaCurso.objects.filter(materia_curso__materia__ciclo_lectivo=ciclo_lectivo).order_by()
+
+
+def filas_csv(inscripciones, tamanio_lote=TAMANIO_LOTE_EXPORTACION):
+    """
+    Genera el CSV línea por línea. Usa values_list + iterator, así nunca
+    se construyen instancias del modelo ni se carga el resultado completo:
+    la memoria queda acotada por el tamaño del lote.
+
+    El encabezado sale antes de ejecutar la consulta, así el primer byte
+    llega al cliente de inmediato. Las filas salen en el orden que trae
+    `inscripciones` (ver notas_de_curso y siguientes).
+    """
+    escritor = csv.writer(Eco())
+
+    # BOM para que Excel reconozca el UTF-8 (importar_notas_csv lo descarta)
+    yield '\ufeff' + escritor.writerow([encabezado for encabezado, _ in COLUMNAS_EXPORTACION])
+
+    campos = [campo for _, campo in COLUMNAS_EXPORTACION]
+    for fila in inscripciones.values_list(*campos).iterator(chunk_size=tamanio_lote):
+        yield escritor.writerow(fila)
+
+
+def respuesta_csv(inscripciones, nombre_archivo):
+    respuesta = StreamingHttpResponse(filas_csv(inscripciones), content_type='text/csv; charset=utf-8')
+    respuesta['Content-Disposition'] = f'attachment; filename="{nombre_archivo}"'
+    return respuesta
@@ -1,4 +1,5 @@
 from django import forms
+from django.core.exceptions import ValidationError
 from .models import (
     Alumno, Carrera, Curso, Materia, MateriaCurso,
     Inscripcion, TipoEvaluacion, CondicionFinal, Evaluacion
@@ -48,6 +49,28 @@ class MateriaForm(forms.ModelForm):
         }
 
 
+class MateriaAdminForm(forms.ModelForm):
+    """Formulario del admin de Materia: rechaza correlativas que formen un ciclo."""
+
+    class Meta:
+        model = Materia
+        fields = '__all__'
+
+    def clean_correlativas_requeridas(self):
+        from .correlativas import validar_sin_ciclos
+
+        requeridas = self.cleaned_data.get('correlativas_requeridas')
+        sigla = self.cleaned_data.get('sigla') or self.instance.pk
+
+        if requeridas and sigla:
+            try:
+                validar_sin_ciclos((sigla, requerida.pk) for requerida in requeridas)
+            except ValidationError as e:
+                raise forms.ValidationError(e.messages)
+
+        return requeridas
+
+
 class MateriaCursoForm(forms.ModelForm):
     class Meta:
         model = MateriaCurso
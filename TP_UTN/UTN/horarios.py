@@ -0,0 +1,92 @@
+import re
+import unicodedata
+
+
+# ======================================================
+#   PARSEO DE HORARIOS
+# ======================================================
+# No importa modelos: lo importa UTN/models.py.
+
+DIAS_SEMANA = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
+
+HORARIO_RE = re.compile(
+    r"^(?P<dias>.*?)\s*(?P<h1>\d{1,2}):(?P<m1>\d{2})\s*-\s*(?P<h2>\d{1,2}):(?P<m2>\d{2})$"
+)
+
+
+def sin_acentos(texto):
+    """Quita tildes y diéresis: "Física" -> "Fisica"."""
+    texto = unicodedata.normalize('NFKD', texto)
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def normalizar(texto):
+    """Minúsculas y sin tildes: "Miércoles" -> "miercoles"."""
+    return sin_acentos(texto).lower().strip()
+
+
+INDICE_DIAS = {normalizar(dia): i for i, dia in enumerate(DIAS_SEMANA)}
+
+
+def parsear_horario(horario):
+    """
+    Convierte el texto libre de MateriaCurso.horario en franjas
+    (dia, minuto_inicio, minuto_fin), con dia 0 = Lunes.
+
+    Ejemplo:
+        "Lunes y Miércoles 08:00-10:00" -> [(0, 480, 600), (2, 480, 600)]
+
+    Lanza ValueError si el texto no se puede interpretar.
+    """
+    match = HORARIO_RE.match((horario or "").strip())
+    if not match:
+        raise ValueError(f"Horario inválido: {horario!r}")
+
+    inicio = int(match.group('h1')) * 60 + int(match.group('m1'))
+    fin = int(match.group('h2')) * 60 + int(match.group('m2'))
+    if not 0 <= inicio < fin <= 24 * 60:
+        raise ValueError(f"Rango horario inválido: {horario!r}")
+
+    dias = []
+    for nombre in re.split(r",|\by\b|/", match.group('dias')):
+        if not nombre.strip():
+            continue
+        try:
+            dia = INDICE_DIAS[normalizar(nombre)]
+        except KeyError:
+            raise ValueError(f"Día inválido en el horario: {nombre.strip()!r}")
+        if dia not in dias:
+            dias.append(dia)
+
+    if not dias:
+        raise ValueError(f"El horario no indica días: {horario!r}")
+
+    return [(dia, inicio, fin) for dia in dias]
+
+
+def minutos_a_hora(minutos):
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+def superposiciones(franjas):
+    """
+    Recibe franjas (dia, inicio, fin, clave) y devuelve los pares
+    (clave_a, clave_b) que se pisan. Barrido por día ordenado por inicio:
+    O(n log n + k) en lugar de comparar todas contra todas.
+    """
+    pares = []
+    activas = []
+    dia_actual = None
+
+    for dia, inicio, fin, clave in sorted(franjas, key=lambda f: (f[0], f[1])):
+        if dia != dia_actual:
+            dia_actual = dia
+            activas = []
+
+        activas = [(fin_a, clave_a) for fin_a, clave_a in activas if fin_a > inicio]
+        for _, clave_a in activas:
+            if clave_a != clave:
+                pares.append((clave_a, clave))
+        activas.append((fin, clave))
+
+    return pares
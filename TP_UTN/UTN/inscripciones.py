@@ -0,0 +1,213 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+
+from .correlativas import EvaluadorCorrelativas, alumnos_que_cumplen
+from .estadisticas import actualizar_estadisticas
+from .horarios import superposiciones
+from .models import AlumnoMateriaCurso, CarreraMateria, FranjaHoraria, ListaEspera, MateriaCurso
+from .semana import invalidar_semana_de_alumnos
+
+
+# ======================================================
+#   LISTA DE ESPERA
+# ======================================================
+
+TAMANIO_LOTE_ESPERA = 100
+
+
+def anotar_en_lista_espera(alumno, materia_curso):
+    """Agrega al alumno al final de la cola. Devuelve (entrada, creada)."""
+    return ListaEspera.objects.get_or_create(alumno=alumno, materia_curso=materia_curso)
+
+
+def alumnos_con_superposicion(alumno_ids, materia_curso):
+    """
+    De `alumno_ids`, los que ya cursan algo que se pisa con `materia_curso`.
+    Una sola consulta para todo el lote.
+    """
+    superpuestas = FranjaHoraria.objects.filter(
+        materia_curso=OuterRef('materia_curso')
+    ).superpuestas_con(materia_curso)
+
+    return set(
+        AlumnoMateriaCurso.objects.filter(
+            alumno_id__in=alumno_ids,
+            finalizado=False
+        ).filter(Exists(superpuestas)).values_list('alumno_id', flat=True)
+    )
+
+
+def promover_lista_espera(materia_curso, tamanio_lote=TAMANIO_LOTE_ESPERA):
+    """
+    Inscribe, en orden de llegada, a los alumnos de la lista de espera
+    mientras el curso tenga vacantes. Devuelve las inscripciones creadas.
+
+    La cola se recorre por lotes (keyset sobre fecha_alta, id) y cada lote
+    se valida entero con una cantidad fija de consultas: inscripción previa
+    en la materia, correlativas y superposición horaria. Los que ya se
+    inscribieron en otra comisión salen de la cola; los que todavía no
+    pueden cursar quedan en su lugar para una próxima vacante.
+    """
+    promovidas = []
+
+    with transaction.atomic():
+        curso = MateriaCurso.objects.select_for_update().select_related('materia').get(pk=materia_curso.pk)
+        cola = ListaEspera.objects.filter(materia_curso=curso).order_by('fecha_alta', 'id')
+        ultimo = None
+
+        while curso.cupo is None or curso.inscriptos < curso.cupo:
+            lote = cola
+            if ultimo is not None:
+                lote = lote.filter(
+                    Q(fecha_alta__gt=ultimo.fecha_alta) | Q(fecha_alta=ultimo.fecha_alta, id__gt=ultimo.id)
+                )
+            lote = list(lote[:tamanio_lote])
+            if not lote:
+                break
+            ultimo = lote[-1]
+
+            alumno_ids = [entrada.alumno_id for entrada in lote]
+
+            ya_inscriptos = set(
+                AlumnoMateriaCurso.objects.filter(
+                    alumno_id__in=alumno_ids,
+                    materia_curso__materia_id=curso.materia_id
+                ).values_list('alumno_id', flat=True)
+            )
+            habilitados = alumnos_que_cumplen(alumno_ids, curso.materia)
+            superpuestos = alumnos_con_superposicion(alumno_ids, curso)
+
+            elegibles = [
+                entrada for entrada in lote
+                if entrada.alumno_id not in ya_inscriptos
+                and entrada.alumno_id in habilitados
+                and entrada.alumno_id not in superpuestos
+            ]
+
+            if curso.cupo is not None:
+                elegibles = elegibles[:curso.cupo - curso.inscriptos]
+
+            if elegibles and not curso.reservar_vacante(len(elegibles)):
+                break
+
+            nuevas = AlumnoMateriaCurso.objects.bulk_create(
+                AlumnoMateriaCurso(alumno_id=entrada.alumno_id, materia_curso=curso)
+                for entrada in elegibles
+            )
+            actualizar_estadisticas(nuevas, creadas=True)
+            invalidar_semana_de_alumnos([entrada.alumno_id for entrada in elegibles])
+            promovidas.extend(nuevas)
+
+            ListaEspera.objects.filter(
+                materia_curso=curso,
+                alumno_id__in=ya_inscriptos | {entrada.alumno_id for entrada in elegibles}
+            ).delete()
+
+    return promovidas
+
+
+# ======================================================
+#   REINSCRIPCIÓN POR LOTE
+# ======================================================
+
+def reinscribir_en_lote(alumno, curso_ids):
+    """
+    Inscribe al alumno en varios MateriaCurso a la vez: o se crean todas
+    las inscripciones o ninguna.
+
+    Todo se valida junto y con una cantidad fija de consultas: año y
+    carrera, materias repetidas, inscripciones previas, correlativas,
+    superposiciones entre los cursos elegidos y con lo que ya cursa, y
+    vacantes. Si algo falla lanza ValidationError con todos los errores.
+    """
+    curso_ids = {int(curso_id) for curso_id in curso_ids}
+    if not curso_ids:
+        raise ValidationError("No elegiste ningún curso.")
+
+    cursos = list(
+        MateriaCurso.objects.filter(
+            pk__in=curso_ids,
+            profesores__isnull=False
+        ).distinct().select_related('materia').prefetch_related('franjas')
+    )
+    errores = []
+
+    if len(cursos) != len(curso_ids):
+        errores.append("Alguno de los cursos elegidos no existe o no tiene profesor asignado.")
+
+    por_materia = {}
+    for curso in cursos:
+        por_materia.setdefault(curso.materia_id, []).append(curso)
+    for cursos_materia in por_materia.values():
+        if len(cursos_materia) > 1:
+            errores.append(f"Elegiste más de un curso de {cursos_materia[0].materia.nombre}.")
+
+    del_plan = set(
+        CarreraMateria.objects.filter(
+            carrera_id=alumno.carrera_id,
+            materia_id__in=por_materia,
+            anio__lte=alumno.anio_universitario
+        ).values_list('materia_id', flat=True)
+    )
+    ya_inscriptas = set(
+        AlumnoMateriaCurso.objects.filter(
+            alumno=alumno,
+            materia_curso__materia_id__in=por_materia
+        ).values_list('materia_curso__materia_id', flat=True)
+    )
+    evaluador = EvaluadorCorrelativas(alumno, list(por_materia))
+
+    for curso in cursos:
+        materia = curso.materia
+        if materia.sigla not in del_plan:
+            errores.append(f"{materia.nombre} no corresponde a tu carrera o a tu año.")
+        elif materia.sigla in ya_inscriptas:
+            errores.append(f"Ya estás reinscripto en {materia.nombre}.")
+        else:
+            faltante = evaluador.correlativa_faltante(materia)
+            if faltante is not None:
+                errores.append(f"No podés inscribirte a {materia.nombre} sin aprobar {faltante.nombre}.")
+
+    # Franjas elegidas + franjas de lo que ya cursa, en un solo barrido
+    nombres = {}
+    franjas = []
+    for curso in cursos:
+        nombres[('nuevo', curso.pk)] = curso.materia.nombre
+        franjas.extend((f.dia, f.inicio, f.fin, ('nuevo', curso.pk)) for f in curso.franjas.all())
+
+    for franja in FranjaHoraria.objects.filter(
+        materia_curso__alumnos__alumno=alumno,
+        materia_curso__alumnos__finalizado=False
+    ).select_related('materia_curso__materia'):
+        clave = ('actual', franja.materia_curso_id)
+        nombres[clave] = franja.materia_curso.materia.nombre
+        franjas.append((franja.dia, franja.inicio, franja.fin, clave))
+
+    informados = set()
+    for clave_a, clave_b in superposiciones(franjas):
+        par = frozenset((clave_a, clave_b))
+        if 'nuevo' not in (clave_a[0], clave_b[0]) or par in informados:
+            continue
+        informados.add(par)
+        errores.append(f"{nombres[clave_a]} y {nombres[clave_b]} se superponen en horario.")
+
+    if errores:
+        raise ValidationError(errores)
+
+    with transaction.atomic():
+        for curso in cursos:
+            if not curso.reservar_vacante():
+                raise ValidationError(
+                    f"No quedan vacantes en {curso.materia.nombre} ({curso.horario}).",
+                    code='sin_vacantes'
+                )
+
+        nuevas = AlumnoMateriaCurso.objects.bulk_create(
+            AlumnoMateriaCurso(alumno=alumno, materia_curso=curso)
+            for curso in cursos
+        )
+        actualizar_estadisticas(nuevas, creadas=True)
+        invalidar_semana_de_alumnos([alumno.pk])
+
+    return nuevas
@@ -0,0 +1,330 @@
+"""
+Prueba de carga del circuito de reinscripción.
+
+Arma una base SQLite aparte con un catálogo y un alumnado sintéticos y
+lanza varios procesos que, todos a la vez, recorren
+MateriaReinscripcionView y reinscribir_materia como lo haría un alumno a
+las 8:00 del día de apertura. Al final informa throughput, latencias,
+bloqueos de la base y anomalías (sobreasignación de cupo, inscripciones
+duplicadas) y guarda todo en JSON para comparar corridas.
+
+    python manage.py carga_reinscripcion --alumnos 2000 --procesos 16
+
+La base de desarrollo (db.sqlite3) no se toca.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+from django.db.models import Count, F
+from django.test import Client
+from django.urls import reverse
+
+from UTN.models import (
+    Alumno, AlumnoMateriaCurso, Carrera, CarreraMateria, Curso, Materia,
+    MateriaCurso, Profesor, ProfesorMateriaCurso
+)
+
+DIAS = ["Lunes y Miércoles", "Martes y Jueves", "Viernes", "Sábado"]
+TURNOS = [("manana", 8), ("tarde", 14), ("noche", 19)]
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano; valores ya ordenados."""
+    if not valores:
+        return None
+    indice = max(0, min(len(valores) - 1, round(p / 100 * len(valores)) - 1))
+    return valores[indice]
+
+
+def resumen_latencias(latencias):
+    latencias = sorted(round(lat, 2) for lat in latencias)
+    return {
+        "cantidad": len(latencias),
+        "p50_ms": percentil(latencias, 50),
+        "p95_ms": percentil(latencias, 95),
+        "p99_ms": percentil(latencias, 99),
+        "max_ms": latencias[-1] if latencias else None,
+    }
+
+
+def trabajador(args):
+    """Corre en un proceso hijo: un Client por proceso, alumnos en secuencia."""
+    alumno_ids, cursos_por_materia, materias_por_alumno, semilla, inicio = args
+
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+    # Los errores se cuentan acá; sin esto cada uno imprime su traceback
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+    azar = random.Random(semilla)
+    cliente = Client()
+    resultados = {"pagina": [], "reinscribir": [], "bloqueos": 0, "errores": 0, "detalle_errores": []}
+
+    # Todos los procesos arrancan juntos, como en la apertura real
+    time.sleep(max(0, inicio - time.time()))
+
+    def medir(tipo, metodo, url, datos=None):
+        t0 = time.perf_counter()
+        try:
+            respuesta = metodo(url, datos) if datos is not None else metodo(url)
+            if respuesta.status_code >= 500:
+                resultados["errores"] += 1
+        except OperationalError as e:
+            if "locked" in str(e):
+                resultados["bloqueos"] += 1
+            else:
+                resultados["errores"] += 1
+                resultados["detalle_errores"].append(str(e))
+        except Exception as e:
+            resultados["errores"] += 1
+            resultados["detalle_errores"].append(f"{type(e).__name__}: {e}")
+        resultados[tipo].append((time.perf_counter() - t0) * 1000)
+
+    for alumno_id in alumno_ids:
+        medir("pagina", cliente.get, reverse("materia_reinscripcion", args=[alumno_id]))
+
+        elegidas = azar.sample(sorted(cursos_por_materia), min(materias_por_alumno, len(cursos_por_materia)))
+        for sigla in elegidas:
+            curso_id = azar.choice(cursos_por_materia[sigla])
+            medir(
+                "reinscribir",
+                cliente.post,
+                reverse("materia_reinscribir", args=[alumno_id, sigla]),
+                {"curso_id": curso_id},
+            )
+
+    resultados["detalle_errores"] = resultados["detalle_errores"][:20]
+    connections.close_all()
+    return resultados
+
+
+class Command(BaseCommand):
+    help = "Prueba de carga concurrente de la reinscripción sobre una base SQLite aparte."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--db", help="Archivo SQLite a usar (se recrea). Por defecto, uno temporal.")
+        parser.add_argument("--alumnos", type=int, default=500)
+        parser.add_argument("--materias", type=int, default=40)
+        parser.add_argument("--cursos-por-materia", type=int, default=3)
+        parser.add_argument("--cupo", type=int, default=30, help="Vacantes por curso (0 = sin límite).")
+        parser.add_argument("--procesos", type=int, default=8)
+        parser.add_argument("--materias-por-alumno", type=int, default=4)
+        parser.add_argument("--semilla", type=int, default=1)
+        parser.add_argument("--salida", help="Archivo JSON de resultados.")
+
+    def handle(self, *args, **opciones):
+        if opciones["procesos"] < 1 or opciones["alumnos"] < 1:
+            raise CommandError("--procesos y --alumnos tienen que ser mayores a cero.")
+
+        ruta = opciones["db"] or os.path.join(tempfile.gettempdir(), "utn_carga_reinscripcion.sqlite3")
+        if os.path.abspath(ruta) == os.path.abspath(str(settings.DATABASES["default"]["NAME"])):
+            raise CommandError("La prueba de carga no puede correr sobre la base configurada.")
+
+        self.usar_base(ruta)
+        self.stdout.write(f"Base de prueba: {ruta}")
+
+        t0 = time.perf_counter()
+        alumno_ids, cursos_por_materia = self.sembrar(opciones)
+        self.stdout.write(
+            f"Sembrado: {len(alumno_ids)} alumnos, {len(cursos_por_materia)} materias "
+            f"({time.perf_counter() - t0:.1f}s)"
+        )
+
+        resultados = self.correr(alumno_ids, cursos_por_materia, opciones)
+        resultados["anomalias"] = self.anomalias()
+        resultados["configuracion"] = {
+            clave: opciones[clave]
+            for clave in ("alumnos", "materias", "cursos_por_materia", "cupo", "procesos", "materias_por_alumno", "semilla")
+        }
+        resultados["base"] = {
+            "engine": settings.DATABASES["default"]["ENGINE"],
+            "options": {k: str(v) for k, v in settings.DATABASES["default"].get("OPTIONS", {}).items()},
+            "conn_max_age": settings.DATABASES["default"].get("CONN_MAX_AGE", 0),
+        }
+        resultados["fecha"] = datetime.now().isoformat(timespec="seconds")
+
+        salida = opciones["salida"] or f"carga_reinscripcion_{datetime.now():%Y%m%d-%H%M%S}.json"
+        with open(salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+
+        self.informar(resultados)
+        self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {salida}"))
+
+    # =====================
+    # PREPARACIÓN
+    # =====================
+    def usar_base(self, ruta):
+        for sufijo in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(ruta + sufijo):
+                os.remove(ruta + sufijo)
+
+        connections.close_all()
+        settings.DATABASES["default"]["NAME"] = ruta
+        connections["default"].settings_dict["NAME"] = ruta
+        call_command("migrate", verbosity=0, interactive=False)
+
+    def sembrar(self, opciones):
+        azar = random.Random(opciones["semilla"])
+        cupo = opciones["cupo"] or None
+
+        carrera = Carrera.objects.create(nombre="Ingeniería de Carga", duracion_anios=5)
+        curso = Curso.objects.create(nombre="K1000", nivel="1", numero=1)
+        profesor = Profesor.objects.create(nombre="Carga", apellido="Docente", email="carga@utn.test")
+
+        materias = Materia.objects.bulk_create(
+            Materia(sigla=f"C{i:03d}", nombre=f"Materia de carga {i}", ciclo_lectivo=1 + i * 5 // opciones["materias"])
+            for i in range(opciones["materias"])
+        )
+        CarreraMateria.objects.bulk_create(
+            CarreraMateria(carrera=carrera, materia=materia, anio=materia.ciclo_lectivo)
+            for materia in materias
+        )
+
+        # Cada materia de 2° año en adelante pide una del año anterior
+        primer_anio = [m for m in materias if m.ciclo_lectivo == 1]
+        for materia in materias:
+            anteriores = [m for m in materias if m.ciclo_lectivo == materia.ciclo_lectivo - 1]
+            if anteriores:
+                materia.correlativas_requeridas.add(azar.choice(anteriores))
+
+        cursos_por_materia = {}
+        for materia in materias:
+            for n in range(opciones["cursos_por_materia"]):
+                turno, hora = TURNOS[n % len(TURNOS)]
+                hora += 2 * azar.randrange(2)
+                mc = MateriaCurso.objects.create(
+                    curso=curso,
+                    materia=materia,
+                    turno_cursado=turno,
+                    horario=f"{azar.choice(DIAS)} {hora:02d}:00-{hora + 2:02d}:00",
+                    modulo=str(n + 1),
+                    cupo=cupo,
+                )
+                ProfesorMateriaCurso.objects.create(profesor=profesor, materia_curso=mc)
+                cursos_por_materia.setdefault(materia.sigla, []).append(mc.pk)
+
+        alumnos = Alumno.objects.bulk_create(
+            Alumno(
+                nombre=f"Alumno{i}",
+                apellido="Carga",
+                dni=f"L{i:07d}",
+                email=f"alumno{i}@utn.test",
+                anio_universitario=1 + azar.randrange(5),
+                carrera=carrera,
+            )
+            for i in range(opciones["alumnos"])
+        )
+
+        # La mitad viene con 1° año aprobado, en un curso extra sin cupo
+        historico = MateriaCurso.objects.create(
+            curso=curso, materia=primer_anio[0], turno_cursado="manana",
+            horario="Domingo 08:00-09:00", modulo="H"
+        )
+        aprobadas = []
+        for alumno in alumnos[::2]:
+            for materia in primer_anio:
+                mc_id = historico.pk if materia == primer_anio[0] else cursos_por_materia[materia.sigla][0]
+                aprobadas.append(AlumnoMateriaCurso(
+                    alumno=alumno, materia_curso_id=mc_id,
+                    nota_1=8, nota_2=8, nota_3=8, promedio=8, nota=8,
+                    aprobado=True, finalizado=True,
+                ))
+        AlumnoMateriaCurso.objects.bulk_create(aprobadas, batch_size=500)
+
+        # bulk_create no pasa por save(): se sincroniza el contador a mano
+        for mc in MateriaCurso.objects.annotate(total=Count("alumnos")).filter(total__gt=0):
+            nuevo_cupo = None if mc.cupo is None else max(mc.cupo, mc.total)
+            MateriaCurso.objects.filter(pk=mc.pk).update(inscriptos=mc.total, cupo=nuevo_cupo)
+
+        return [a.pk for a in alumnos], cursos_por_materia
+
+    # =====================
+    # EJECUCIÓN
+    # =====================
+    def correr(self, alumno_ids, cursos_por_materia, opciones):
+        procesos = opciones["procesos"]
+        partes = [alumno_ids[i::procesos] for i in range(procesos)]
+        inicio = time.time() + 1.0
+
+        connections.close_all()
+        contexto = multiprocessing.get_context("fork")
+
+        with contexto.Pool(procesos) as pool:
+            parciales = pool.map(trabajador, [
+                (parte, cursos_por_materia, opciones["materias_por_alumno"], opciones["semilla"] + n, inicio)
+                for n, parte in enumerate(partes)
+            ])
+        # Se mide desde la largada común, no desde el fork
+        duracion = time.time() - inicio
+
+        pagina = [lat for p in parciales for lat in p["pagina"]]
+        reinscribir = [lat for p in parciales for lat in p["reinscribir"]]
+        total = len(pagina) + len(reinscribir)
+
+        return {
+            "duracion_s": round(duracion, 3),
+            "solicitudes": total,
+            "throughput_rps": round(total / duracion, 2) if duracion else None,
+            "latencias": {
+                "total": resumen_latencias(pagina + reinscribir),
+                "pagina": resumen_latencias(pagina),
+                "reinscribir": resumen_latencias(reinscribir),
+            },
+            "bloqueos": sum(p["bloqueos"] for p in parciales),
+            "errores": sum(p["errores"] for p in parciales),
+            "detalle_errores": [e for p in parciales for e in p["detalle_errores"]][:20],
+        }
+
+    # =====================
+    # VERIFICACIÓN
+    # =====================
+    def anomalias(self):
+        sobreasignados = MateriaCurso.objects.filter(cupo__isnull=False).annotate(
+            total=Count("alumnos")
+        ).filter(total__gt=F("cupo")).count()
+
+        contador_desfasado = MateriaCurso.objects.annotate(
+            total=Count("alumnos")
+        ).exclude(inscriptos=F("total")).count()
+
+        duplicados = AlumnoMateriaCurso.objects.filter(aprobado=False).values(
+            "alumno_id", "materia_curso__materia_id"
+        ).annotate(total=Count("pk")).filter(total__gt=1).count()
+
+        return {
+            "cursos_sobreasignados": sobreasignados,
+            "contadores_desfasados": contador_desfasado,
+            "inscripciones_duplicadas": duplicados,
+        }
+
+    def informar(self, r):
+        lat = r["latencias"]
+        self.stdout.write(
+            f"{r['solicitudes']} solicitudes en {r['duracion_s']}s → {r['throughput_rps']} req/s"
+        )
+        for nombre in ("pagina", "reinscribir", "total"):
+            l = lat[nombre]
+            self.stdout.write(
+                f"  {nombre:<12} p50 {self.ms(l['p50_ms'])}  p95 {self.ms(l['p95_ms'])}  p99 {self.ms(l['p99_ms'])}"
+            )
+        self.stdout.write(f"  bloqueos (database is locked): {r['bloqueos']}   otros errores: {r['errores']}")
+
+        a = r["anomalias"]
+        estilo = self.style.ERROR if any(a.values()) else self.style.SUCCESS
+        self.stdout.write(estilo(
+            f"  sobreasignados: {a['cursos_sobreasignados']}  "
+            f"contadores desfasados: {a['contadores_desfasados']}  "
+            f"duplicados: {a['inscripciones_duplicadas']}"
+        ))
+
+    @staticmethod
+    def ms(valor):
+        return "—" if valor is None else f"{valor:.1f}ms"
@@ -0,0 +1,32 @@
+"""
+Reconstruye el índice de búsqueda (FTS5) de materias y carreras.
+
+Las señales lo mantienen al día en cada alta, cambio y baja; hace falta
+correrlo después de cambios que no pasan por save() (queryset.update,
+bulk_create, SQL a mano) o de restaurar una base.
+
+    python manage.py reconstruir_busqueda
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from UTN.busqueda import disponible, reconstruir_indice
+from UTN.models import Carrera, Materia
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de materias y carreras."
+
+    def handle(self, *args, **options):
+        if not disponible():
+            raise CommandError("El índice de búsqueda sólo existe en SQLite.")
+
+        inicio = time.perf_counter()
+        total = reconstruir_indice(
+            Materia.objects.only('sigla', 'nombre'),
+            Carrera.objects.only('id_carrera', 'nombre')
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Índice reconstruido: {total} entradas en {time.perf_counter() - inicio:.2f} s."
+        ))
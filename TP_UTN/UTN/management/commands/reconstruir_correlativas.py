@@ -0,0 +1,28 @@
+"""
+Reconstruye la clausura transitiva de correlativas (CorrelativaClausura).
+
+Las señales de m2m_changed la mantienen al día con cada add, remove y
+clear; hace falta correrlo después de cambios que no pasan por el
+manager de la relación (bulk_create sobre la tabla intermedia, SQL a
+mano) o de restaurar una base.
+
+    python manage.py reconstruir_correlativas
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from UTN.correlativas import reconstruir_clausura
+
+
+class Command(BaseCommand):
+    help = "Reconstruye la clausura transitiva de las correlativas."
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        with transaction.atomic():
+            total = reconstruir_clausura()
+        self.stdout.write(self.style.SUCCESS(
+            f"Clausura reconstruida: {total} filas en {time.perf_counter() - inicio:.2f} s."
+        ))
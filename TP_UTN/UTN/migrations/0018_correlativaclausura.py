@@ -0,0 +1,79 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def calcular_clausura(aristas):
+    """
+    Copia de UTN.correlativas.calcular_clausura al momento de esta
+    migración: {(ancestro, descendiente): profundidad} con el camino más
+    corto. No se importa para que la migración no cambie si cambia la app.
+    """
+    requeridas = {}
+    for materia, requerida in aristas:
+        requeridas.setdefault(materia, []).append(requerida)
+
+    clausura = {}
+    for origen in requeridas:
+        visitadas = {}
+        frontera = [origen]
+        profundidad = 0
+
+        while frontera:
+            profundidad += 1
+            siguiente = []
+            for materia in frontera:
+                for requerida in requeridas.get(materia, []):
+                    if requerida != origen and requerida not in visitadas:
+                        visitadas[requerida] = profundidad
+                        siguiente.append(requerida)
+            frontera = siguiente
+
+        for ancestro, prof in visitadas.items():
+            clausura[(ancestro, origen)] = prof
+
+    return clausura
+
+
+def poblar_clausura(apps, schema_editor):
+    """
+    Las migraciones usan modelos históricos y no disparan las señales, así
+    que la clausura se arma acá a partir de las correlativas existentes.
+    Cualquier migración de datos futura que toque correlativas_requeridas
+    debería repetir este paso.
+    """
+    Materia = apps.get_model('UTN', 'Materia')
+    CorrelativaClausura = apps.get_model('UTN', 'CorrelativaClausura')
+
+    aristas = Materia.correlativas_requeridas.through.objects.values_list('from_materia_id', 'to_materia_id')
+
+    CorrelativaClausura.objects.all().delete()
+    CorrelativaClausura.objects.bulk_create(
+        CorrelativaClausura(ancestro_id=ancestro, descendiente_id=descendiente, profundidad=profundidad)
+        for (ancestro, descendiente), profundidad in calcular_clausura(aristas).items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0017_carreramateria_anio'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CorrelativaClausura',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profundidad', models.PositiveSmallIntegerField()),
+                ('ancestro', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='clausura_descendientes', to='UTN.materia')),
+                ('descendiente', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='clausura_ancestros', to='UTN.materia')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendiente', 'ancestro'], name='utn_clausura_desc_idx')],
+                'unique_together': {('ancestro', 'descendiente')},
+            },
+        ),
+        migrations.RunPython(poblar_clausura, migrations.RunPython.noop),
+    ]
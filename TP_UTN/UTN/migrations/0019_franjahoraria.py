@@ -0,0 +1,104 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:35
+
+import logging
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Copia de UTN/horarios.py:parsear_horario al momento de esta migración:
+# la migración no importa código de la app, que puede cambiar después
+DIAS_SEMANA = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
+
+HORARIO_RE = re.compile(
+    r"^(?P<dias>.*?)\s*(?P<h1>\d{1,2}):(?P<m1>\d{2})\s*-\s*(?P<h2>\d{1,2}):(?P<m2>\d{2})$"
+)
+
+
+def normalizar(texto):
+    texto = unicodedata.normalize('NFKD', texto)
+    return "".join(c for c in texto if not unicodedata.combining(c)).lower().strip()
+
+
+INDICE_DIAS = {normalizar(dia): i for i, dia in enumerate(DIAS_SEMANA)}
+
+
+def parsear_horario(horario):
+    match = HORARIO_RE.match((horario or "").strip())
+    if not match:
+        raise ValueError(f"Horario inválido: {horario!r}")
+
+    inicio = int(match.group('h1')) * 60 + int(match.group('m1'))
+    fin = int(match.group('h2')) * 60 + int(match.group('m2'))
+    if not 0 <= inicio < fin <= 24 * 60:
+        raise ValueError(f"Rango horario inválido: {horario!r}")
+
+    dias = []
+    for nombre in re.split(r",|\by\b|/", match.group('dias')):
+        if not nombre.strip():
+            continue
+        try:
+            dia = INDICE_DIAS[normalizar(nombre)]
+        except KeyError:
+            raise ValueError(f"Día inválido en el horario: {nombre.strip()!r}")
+        if dia not in dias:
+            dias.append(dia)
+
+    if not dias:
+        raise ValueError(f"El horario no indica días: {horario!r}")
+
+    return [(dia, inicio, fin) for dia in dias]
+
+
+def poblar_franjas(apps, schema_editor):
+    """Genera las franjas de los MateriaCurso existentes a partir de `horario`."""
+    MateriaCurso = apps.get_model('UTN', 'MateriaCurso')
+    FranjaHoraria = apps.get_model('UTN', 'FranjaHoraria')
+
+    franjas, salteados = [], []
+    for id_materia_curso, horario in MateriaCurso.objects.values_list('id_materia_curso', 'horario').iterator():
+        try:
+            parseadas = parsear_horario(horario)
+        except ValueError:
+            salteados.append(f"{id_materia_curso} ({horario!r})")
+            continue
+        franjas.extend(
+            FranjaHoraria(materia_curso_id=id_materia_curso, dia=dia, inicio=inicio, fin=fin)
+            for dia, inicio, fin in parseadas
+        )
+
+    FranjaHoraria.objects.bulk_create(franjas, batch_size=500)
+
+    if salteados:
+        # Sin franjas no se controlan sus superposiciones hasta corregir el horario
+        logging.getLogger('UTN.migrations').warning(
+            "%d MateriaCurso quedaron sin franjas por un horario ilegible: %s",
+            len(salteados), ", ".join(salteados)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0018_correlativaclausura'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FranjaHoraria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dia', models.PositiveSmallIntegerField(choices=[(0, 'Lunes'), (1, 'Martes'), (2, 'Miércoles'), (3, 'Jueves'), (4, 'Viernes'), (5, 'Sábado'), (6, 'Domingo')])),
+                ('inicio', models.PositiveSmallIntegerField()),
+                ('fin', models.PositiveSmallIntegerField()),
+                ('materia_curso', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='franjas', to='UTN.materiacurso')),
+            ],
+            options={
+                'ordering': ['dia', 'inicio'],
+                'indexes': [models.Index(fields=['dia', 'inicio', 'fin'], name='utn_franja_intervalo_idx')],
+            },
+        ),
+        migrations.RunPython(poblar_franjas, migrations.RunPython.noop),
+    ]
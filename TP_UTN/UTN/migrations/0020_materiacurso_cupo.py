@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:36
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def contar_inscriptos(apps, schema_editor):
+    MateriaCurso = apps.get_model('UTN', 'MateriaCurso')
+
+    cursos = MateriaCurso.objects.annotate(total=Count('alumnos')).filter(total__gt=0)
+    for curso in cursos:
+        MateriaCurso.objects.filter(pk=curso.pk).update(inscriptos=curso.total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0019_franjahoraria'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='materiacurso',
+            name='cupo',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='materiacurso',
+            name='inscriptos',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(contar_inscriptos, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='materiacurso',
+            constraint=models.CheckConstraint(condition=models.Q(('cupo__isnull', True), ('inscriptos__lte', models.F('cupo')), _connector='OR'), name='utn_materiacurso_cupo_check'),
+        ),
+    ]
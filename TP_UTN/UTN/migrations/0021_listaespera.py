@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0020_materiacurso_cupo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListaEspera',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha_alta', models.DateTimeField(auto_now_add=True)),
+                ('alumno', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listas_espera', to='UTN.alumno')),
+                ('materia_curso', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lista_espera', to='UTN.materiacurso')),
+            ],
+            options={
+                'ordering': ['fecha_alta', 'id'],
+                'indexes': [models.Index(fields=['materia_curso', 'fecha_alta', 'id'], name='utn_espera_fifo_idx')],
+                'unique_together': {('alumno', 'materia_curso')},
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+def poblar_estadisticas(apps, schema_editor):
+    """
+    Calcula las estadísticas iniciales de los cursos con inscriptos. Es la
+    misma consulta que UTN.estadisticas.agregados_por_curso al momento de
+    esta migración, copiada para no depender del código actual de la app.
+    """
+    AlumnoMateriaCurso = apps.get_model('UTN', 'AlumnoMateriaCurso')
+    EstadisticaMateriaCurso = apps.get_model('UTN', 'EstadisticaMateriaCurso')
+
+    calificada = Q(finalizado=True)
+    agregados = AlumnoMateriaCurso.objects.order_by().values('materia_curso').annotate(
+        inscriptos=Count('pk'),
+        calificados=Count('pk', filter=calificada),
+        aprobados=Count('pk', filter=calificada & Q(aprobado=True)),
+        suma_notas=Coalesce(Sum(F('nota_1') + F('nota_2') + F('nota_3'), filter=calificada), 0),
+        **{f'hist_{nota}': Count('pk', filter=calificada & Q(nota=nota)) for nota in range(11)}
+    )
+
+    EstadisticaMateriaCurso.objects.bulk_create(
+        EstadisticaMateriaCurso(materia_curso_id=valores.pop('materia_curso'), **valores)
+        for valores in agregados
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0021_listaespera'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadisticaMateriaCurso',
+            fields=[
+                ('materia_curso', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='estadistica', serialize=False, to='UTN.materiacurso')),
+                ('inscriptos', models.PositiveIntegerField(default=0)),
+                ('calificados', models.PositiveIntegerField(default=0)),
+                ('aprobados', models.PositiveIntegerField(default=0)),
+                ('suma_notas', models.PositiveIntegerField(default=0)),
+                ('hist_0', models.PositiveIntegerField(default=0)),
+                ('hist_1', models.PositiveIntegerField(default=0)),
+                ('hist_2', models.PositiveIntegerField(default=0)),
+                ('hist_3', models.PositiveIntegerField(default=0)),
+                ('hist_4', models.PositiveIntegerField(default=0)),
+                ('hist_5', models.PositiveIntegerField(default=0)),
+                ('hist_6', models.PositiveIntegerField(default=0)),
+                ('hist_7', models.PositiveIntegerField(default=0)),
+                ('hist_8', models.PositiveIntegerField(default=0)),
+                ('hist_9', models.PositiveIntegerField(default=0)),
+                ('hist_10', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(poblar_estadisticas, migrations.RunPython.noop),
+    ]
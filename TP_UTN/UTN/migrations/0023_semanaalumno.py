@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0022_estadisticamateriacurso'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SemanaAlumno',
+            fields=[
+                ('alumno', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='semana', serialize=False, to='UTN.alumno')),
+                ('datos', models.JSONField()),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0023_semanaalumno'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alumno',
+            name='inscripciones_modificadas',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AddField(
+            model_name='alumno',
+            name='version_inscripciones',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
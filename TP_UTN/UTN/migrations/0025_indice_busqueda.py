@@ -0,0 +1,53 @@
+from django.db import migrations
+
+
+# Copia del SQL de UTN/busqueda.py al momento de esta migración: la
+# migración no importa código de la app, que puede cambiar después
+TABLA_BUSQUEDA = 'UTN_busqueda'
+
+SQL_CREAR_INDICE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA_BUSQUEDA} USING fts5("
+    "tipo UNINDEXED, clave UNINDEXED, nombre, sigla, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+SQL_BORRAR_INDICE = f"DROP TABLE IF EXISTS {TABLA_BUSQUEDA}"
+SQL_VACIAR_INDICE = f"DELETE FROM {TABLA_BUSQUEDA}"
+SQL_INSERTAR_FILA = f"INSERT INTO {TABLA_BUSQUEDA} (tipo, clave, nombre, sigla) VALUES (%s, %s, %s, %s)"
+SQL_OPTIMIZAR_INDICE = f"INSERT INTO {TABLA_BUSQUEDA} ({TABLA_BUSQUEDA}) VALUES ('optimize')"
+
+
+def crear_indice(apps, schema_editor):
+    """Crea la tabla FTS5 y la llena con el catálogo actual (sólo en SQLite)."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Materia = apps.get_model('UTN', 'Materia')
+    Carrera = apps.get_model('UTN', 'Carrera')
+
+    filas = [
+        ('materia', sigla, nombre, sigla)
+        for sigla, nombre in Materia.objects.values_list('sigla', 'nombre')
+    ] + [
+        ('carrera', str(pk), nombre or '', '')
+        for pk, nombre in Carrera.objects.values_list('pk', 'nombre')
+    ]
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(SQL_CREAR_INDICE)
+        cursor.execute(SQL_VACIAR_INDICE)
+        cursor.executemany(SQL_INSERTAR_FILA, filas)
+        cursor.execute(SQL_OPTIMIZAR_INDICE)
+
+
+def borrar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(SQL_BORRAR_INDICE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0024_alumno_version_inscripciones'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+    ]
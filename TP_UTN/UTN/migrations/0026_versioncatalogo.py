@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def crear_version(apps, schema_editor):
+    apps.get_model('UTN', 'VersionCatalogo').objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0025_indice_busqueda'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersionCatalogo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('numero', models.PositiveBigIntegerField(default=0)),
+                ('modificado', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RunPython(crear_version, migrations.RunPython.noop),
+    ]
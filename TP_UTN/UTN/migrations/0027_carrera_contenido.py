@@ -0,0 +1,140 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:07
+
+from django.db import migrations, models
+
+# Textos que antes estaban fijos en templates/carreras/Ingenieria_*.html
+CONTENIDO_CARRERAS = {
+    'Ingeniería Civil': {
+        'descripcion': (
+            'La carrera de Ingeniería Civil forma profesionales capaces de diseñar, '
+            'planificar, construir y mantener obras de infraestructura tales como edificios, '
+            'puentes, carreteras y sistemas hidráulicos. Con una sólida formación técnica y '
+            'científica, prepara a los estudiantes para enfrentar los desafíos del desarrollo '
+            'urbano y ambiental.'
+        ),
+        'horarios': 'Lunes a viernes de 8:00 a 13:00 hs. — Clases teóricas y prácticas en laboratorio.',
+        'responsable': 'Ing. Carlos Fernández — Especialista en estructuras e ingeniería de transporte.',
+        'modalidad': 'Presencial — Sede Central Caleta Olivia.',
+    },
+    'Ingeniería Electrónica': {
+        'descripcion': (
+            'La carrera de Ingeniería Electrónica forma profesionales capaces de diseñar, '
+            'desarrollar y mantener sistemas electrónicos y de comunicación. Con una sólida '
+            'formación en circuitos, microcontroladores y sistemas embebidos, los estudiantes '
+            'adquieren las competencias necesarias para innovar en áreas de '
+            'telecomunicaciones, automatización y tecnología digital.'
+        ),
+        'horarios': 'Lunes a viernes de 8:00 a 13:00 hs. — Clases teóricas y prácticas en laboratorio.',
+        'responsable': 'Ing. Laura Gómez — Especialista en sistemas electrónicos y telecomunicaciones.',
+        'modalidad': 'Presencial — Sede Central Caleta Olivia.',
+    },
+    'Ingeniería en Energía Eléctrica': {
+        'descripcion': (
+            'La carrera de Ingeniería Eléctrica forma profesionales capacitados en '
+            'generación, transmisión y distribución de energía eléctrica. Los estudiantes '
+            'aprenden a diseñar, analizar y mantener sistemas eléctricos, instalaciones '
+            'industriales y proyectos de energías renovables, asegurando eficiencia y '
+            'seguridad en la infraestructura eléctrica.'
+        ),
+        'horarios': 'Lunes a viernes de 8:00 a 13:00 hs. — Clases teóricas y prácticas en laboratorio.',
+        'responsable': 'Ing. Martín López — Especialista en sistemas eléctricos y energías renovables.',
+        'modalidad': 'Presencial — Sede Central Caleta Olivia.',
+    },
+    'Ingeniería Industrial': {
+        'descripcion': (
+            'La carrera de Ingeniería Industrial forma profesionales capaces de optimizar '
+            'procesos productivos, mejorar la eficiencia de empresas y coordinar recursos '
+            'humanos, materiales y tecnológicos. Los estudiantes adquieren competencias en '
+            'gestión de operaciones, logística, calidad y productividad, preparándolos para '
+            'liderar proyectos industriales innovadores.'
+        ),
+        'horarios': 'Lunes a viernes de 8:00 a 13:00 hs. — Clases teóricas y prácticas en laboratorio.',
+        'responsable': 'Ing. Sofía Martínez — Especialista en gestión de procesos y optimización industrial.',
+        'modalidad': 'Presencial — Sede Central Caleta Olivia.',
+    },
+    'Ingeniería Mecánica': {
+        'descripcion': (
+            'La carrera de Ingeniería Mecánica forma profesionales capaces de diseñar, '
+            'fabricar y mantener sistemas mecánicos, maquinaria industrial y estructuras '
+            'móviles. Los estudiantes aprenden a aplicar principios de termodinámica, '
+            'mecánica de materiales y control de sistemas, preparándolos para el desarrollo '
+            'de proyectos innovadores en la industria.'
+        ),
+        'horarios': 'Lunes a viernes de 8:00 a 13:00 hs. — Clases teóricas y prácticas en laboratorio.',
+        'responsable': 'Ing. Federico Ramírez — Especialista en diseño mecánico y mantenimiento industrial.',
+        'modalidad': 'Presencial — Sede Central Caleta Olivia.',
+    },
+    'Ingeniería Metalúrgica': {
+        'descripcion': (
+            'La carrera de Ingeniería Metalúrgica forma profesionales especializados en el '
+            'estudio, diseño y transformación de metales y aleaciones. Los estudiantes '
+            'aprenden técnicas de extracción, procesamiento, tratamiento térmico y control de '
+            'calidad, preparándolos para innovar en industrias metalúrgicas, automotriz, '
+            'aeroespacial y de materiales avanzados.'
+        ),
+        'horarios': 'Lunes a viernes de 8:00 a 13:00 hs. — Clases teóricas y prácticas en laboratorio.',
+        'responsable': 'Ing. Valentina Herrera — Especialista en procesos metalúrgicos y control de calidad de materiales.',
+        'modalidad': 'Presencial — Sede Central Caleta Olivia.',
+    },
+    'Ingeniería Química': {
+        'descripcion': (
+            'La carrera de Ingeniería Química forma profesionales capaces de diseñar, operar '
+            'y optimizar procesos químicos y bioquímicos. Los estudiantes adquieren '
+            'conocimientos en química industrial, control de calidad, producción de '
+            'materiales y desarrollo de tecnologías sostenibles, preparándolos para innovar '
+            'en la industria química, farmacéutica y de alimentos.'
+        ),
+        'horarios': 'Lunes a viernes de 8:00 a 13:00 hs. — Clases teóricas y prácticas en laboratorio.',
+        'responsable': 'Ing. Mariana Torres — Especialista en procesos químicos y control de calidad industrial.',
+        'modalidad': 'Presencial — Sede Central Caleta Olivia.',
+    },
+    'Ingeniería en Sistemas de Información': {
+        'descripcion': (
+            'La carrera de Ingeniería en Sistemas forma profesionales capaces de diseñar, '
+            'desarrollar y administrar soluciones informáticas. Los estudiantes adquieren '
+            'conocimientos en programación, bases de datos, redes, ciberseguridad y gestión '
+            'de proyectos, preparándolos para enfrentar los desafíos tecnológicos de empresas '
+            'e instituciones modernas.'
+        ),
+        'horarios': 'Lunes a viernes de 14:00 a 19:00 hs — Clases teóricas y prácticas en laboratorio de informática.',
+        'responsable': 'Ing. Carlos Ramírez — Especialista en desarrollo de software y gestión de sistemas de información.',
+        'modalidad': 'Presencial — Sede Central Caleta Olivia.',
+    },
+}
+
+
+def cargar_contenido(apps, schema_editor):
+    Carrera = apps.get_model('UTN', 'Carrera')
+    for nombre, campos in CONTENIDO_CARRERAS.items():
+        Carrera.objects.filter(nombre=nombre).update(**campos)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0026_versioncatalogo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carrera',
+            name='descripcion',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='carrera',
+            name='horarios',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='carrera',
+            name='modalidad',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='carrera',
+            name='responsable',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.RunPython(cargar_contenido, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0027_carrera_contenido'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlanCarreraSnapshot',
+            fields=[
+                ('carrera', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='plan_snapshot', serialize=False, to='UTN.carrera')),
+                ('version', models.PositiveBigIntegerField()),
+                ('datos', models.JSONField()),
+                ('generado', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
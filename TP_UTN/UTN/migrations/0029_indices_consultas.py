@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0028_plancarrerasnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        # Después de la última migración que rehace auth_user: en SQLite
+        # rehacer la tabla borra los índices creados a mano
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alumno',
+            index=models.Index(fields=['carrera', 'anio_universitario', 'apellido', 'nombre'], name='utn_alumno_cohorte_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carreramateria',
+            index=models.Index(fields=['carrera', 'anio', 'materia'], name='utn_plan_anio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='materiacurso',
+            index=models.Index(fields=['turno_cursado', 'materia'], name='utn_curso_turno_idx'),
+        ),
+        # El login busca el usuario por email, que en auth_user no tiene
+        # índice (sólo username es único). La tabla es de django.contrib.auth,
+        # así que el índice se crea a mano.
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS utn_auth_user_email_idx ON auth_user (email)",
+            "DROP INDEX IF EXISTS utn_auth_user_email_idx",
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0029_indices_consultas'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeneracionRol',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='generacion_rol', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('numero', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 09:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('UTN', '0030_generacionrol'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='materia',
+            index=models.Index(fields=['ciclo_lectivo'], name='utn_materia_ciclo_idx'),
+        ),
+    ]
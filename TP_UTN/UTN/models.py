@@ -1,21 +1,36 @@
 from django.db import models
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q
 from django.urls import reverse
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from datetime import date
 from django.conf import settings
-import datetime, re
+import datetime, logging, re
 from django.core.exceptions import ValidationError
 from django.utils.safestring import mark_safe
 from django.contrib.auth.models import User
+from .horarios import DIAS_SEMANA, minutos_a_hora, parsear_horario
+
+logger = logging.getLogger(__name__)
 
 class Carrera(models.Model):
     id_carrera = models.AutoField(primary_key=True)
     nombre = models.CharField(max_length=100, null=True, blank=True)
     duracion_anios = models.PositiveIntegerField(null=True, blank=True)
 
+    # Contenido de la página pública de la carrera
+    descripcion = models.TextField(blank=True, default="")
+    horarios = models.CharField(max_length=200, blank=True, default="")
+    responsable = models.CharField(max_length=200, blank=True, default="")
+    modalidad = models.CharField(max_length=200, blank=True, default="")
+
     def __str__(self):
         return self.nombre or "Sin nombre"
 
+    def get_absolute_url(self):
+        return reverse('carrera_detail', kwargs={'pk': self.pk})
+
 
 class Alumno(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='alumno', null=True)
@@ -27,6 +42,36 @@ class Alumno(models.Model):
     anio_universitario = models.PositiveIntegerField(validators=[MinValueValidator(1), MaxValueValidator(10)], default=1)
     carrera = models.ForeignKey(Carrera, on_delete=models.CASCADE, related_name='alumnos', null=True, blank=True)
 
+    # Avanzan cada vez que cambian sus inscripciones, notas u horarios
+    # (ver UTN/semana.py). El feed .ics las usa como ETag y Last-Modified.
+    version_inscripciones = models.PositiveIntegerField(default=0, editable=False)
+    inscripciones_modificadas = models.DateTimeField(default=timezone.now, editable=False)
+
+    CAMPOS_VERSION = ('version_inscripciones', 'inscripciones_modificadas')
+
+    class Meta:
+        indexes = [
+            # Cohorte de una carrera (egreso por año), ya ordenada por apellido
+            models.Index(fields=['carrera', 'anio_universitario', 'apellido', 'nombre'], name='utn_alumno_cohorte_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Para saber si cambió el usuario vinculado (ver UTN/roles.py)
+        instance._user_original = instance.__dict__.get('user_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # La versión se actualiza sólo con UPDATE; no se pisa con el valor
+        # (posiblemente viejo) de la instancia
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.CAMPOS_VERSION
+            ]
+        super().save(*args, **kwargs)
+
     def __str__(self):
         carrera_nombre = self.carrera.nombre if self.carrera else "Sin carrera"
         return f"{self.anio_universitario}, {self.apellido}, {self.nombre} ({carrera_nombre})"
@@ -62,6 +107,13 @@ class Materia(models.Model):
     ciclo_lectivo = models.PositiveIntegerField()
     correlativas_requeridas = models.ManyToManyField('self', blank=True, symmetrical=False, related_name='materias_que_la_requieren', verbose_name='Materias Correlativas Requeridas')
 
+    class Meta:
+        indexes = [
+            # Exportación de notas de un ciclo lectivo: sin él la consulta
+            # recorre todas las inscripciones y descarta las de otros ciclos
+            models.Index(fields=['ciclo_lectivo'], name='utn_materia_ciclo_idx'),
+        ]
+
     def get_carreras_admin(self):
         """
         Genera una cadena de texto HTML para mostrar en el Admin con las carreras y sus IDs.
@@ -101,6 +153,29 @@ class Materia(models.Model):
         correlativas = self.correlativas_requeridas.all()
         return correlativas.first() if correlativas.exists() else None
 
+
+class CorrelativaClausura(models.Model):
+    """
+    Clausura transitiva de Materia.correlativas_requeridas.
+
+    Una fila (ancestro, descendiente, profundidad) indica que para cursar
+    `descendiente` hay que tener aprobada `ancestro`, a `profundidad`
+    saltos de distancia (1 = correlativa directa, se guarda el camino más
+    corto). Se mantiene desde UTN/signals.py al modificar las correlativas.
+    """
+    ancestro = models.ForeignKey(Materia, on_delete=models.CASCADE, related_name='clausura_descendientes')
+    descendiente = models.ForeignKey(Materia, on_delete=models.CASCADE, related_name='clausura_ancestros')
+    profundidad = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ('ancestro', 'descendiente')
+        indexes = [
+            models.Index(fields=['descendiente', 'ancestro'], name='utn_clausura_desc_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestro_id} → {self.descendiente_id} ({self.profundidad})"
+
     
     
 class AlumnoMateria(models.Model):
@@ -158,6 +233,10 @@ class CarreraMateria(models.Model):
 
     class Meta:
         unique_together = ('carrera', 'materia')
+        indexes = [
+            # Plan de una carrera por año (reinscripción, plan.json) sin ordenar aparte
+            models.Index(fields=['carrera', 'anio', 'materia'], name='utn_plan_anio_idx'),
+        ]
 
     def __str__(self):
         return f"{self.materia} - {self.carrera} ({self.anio}° año)"
@@ -178,6 +257,25 @@ class MateriaCurso(models.Model):
     modulo = models.CharField(max_length=50)
     grupo = models.CharField(max_length=50, null=True, blank=True)
 
+    # Vacío = sin límite. `inscriptos` es el contador de vacantes ocupadas y
+    # sólo se modifica con UPDATE condicionales (ver reservar_vacante).
+    cupo = models.PositiveIntegerField(null=True, blank=True)
+    inscriptos = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(cupo__isnull=True) | Q(inscriptos__lte=F('cupo')),
+                name='utn_materiacurso_cupo_check',
+            ),
+        ]
+        indexes = [
+            # Materias disponibles filtradas por turno, en el orden de su paginación
+            models.Index(fields=['turno_cursado', 'materia'], name='utn_curso_turno_idx'),
+            # Sin índice sobre horario: ninguna consulta lo filtra. Las
+            # superposiciones se buscan en FranjaHoraria (utn_franja_intervalo_idx)
+        ]
+
     def parse_horario(self):
         partes = self.horario.split(" ")
         rango = partes[-1]
@@ -191,10 +289,151 @@ class MateriaCurso(models.Model):
 
         return dias, h_inicio, h_fin
 
+    def clean(self):
+        try:
+            parsear_horario(self.horario)
+        except ValueError as e:
+            raise ValidationError({'horario': str(e)})
+
+        if self.cupo is not None and self.cupo < self.inscriptos:
+            raise ValidationError({
+                'cupo': f"El curso ya tiene {self.inscriptos} inscriptos."
+            })
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._cupo_original = instance.__dict__.get('cupo')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # El contador no se pisa con el valor (posiblemente viejo) de la instancia
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != 'inscriptos'
+            ]
+
+        cupo_original = getattr(self, '_cupo_original', None)
+        amplio_cupo = not self._state.adding and (
+            cupo_original is not None and (self.cupo is None or self.cupo > cupo_original)
+        )
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None or 'horario' in update_fields:
+                self.actualizar_franjas()
+
+            # Si el admin amplía el cupo, se promueve la lista de espera
+            if amplio_cupo:
+                from .inscripciones import promover_lista_espera
+                promover_lista_espera(self)
+
+        self._cupo_original = self.cupo
+
+    def actualizar_franjas(self):
+        """Regenera las FranjaHoraria a partir del texto de `horario`."""
+        try:
+            franjas = parsear_horario(self.horario)
+        except ValueError as e:
+            # clean() lo rechaza, pero save() sin full_clean() no. Sin
+            # franjas el curso no choca con ningún otro: se avisa
+            logger.warning(
+                "MateriaCurso %s queda sin franjas horarias, no se controlan sus superposiciones: %s",
+                self.pk, e
+            )
+            franjas = []
+
+        self.franjas.all().delete()
+        FranjaHoraria.objects.bulk_create(
+            FranjaHoraria(materia_curso=self, dia=dia, inicio=inicio, fin=fin)
+            for dia, inicio, fin in franjas
+        )
+
+    # =====================
+    # VACANTES
+    # =====================
+    @property
+    def vacantes_disponibles(self):
+        """None si el curso no tiene cupo; no consulta AlumnoMateriaCurso."""
+        if self.cupo is None:
+            return None
+        return max(self.cupo - self.inscriptos, 0)
+
+    def reservar_vacante(self, cantidad=1):
+        """
+        Ocupa `cantidad` vacantes con un único UPDATE condicional, que la
+        base ejecuta de forma atómica: nunca se supera el cupo aunque varios
+        procesos reserven a la vez. Devuelve True si se pudo reservar.
+        """
+        reservadas = MateriaCurso.objects.filter(
+            Q(cupo__isnull=True) | Q(inscriptos__lte=F('cupo') - cantidad),
+            pk=self.pk
+        ).update(inscriptos=F('inscriptos') + cantidad)
+
+        if reservadas:
+            self.inscriptos += cantidad
+        return bool(reservadas)
+
+    def liberar_vacante(self, cantidad=1):
+        MateriaCurso.objects.filter(
+            pk=self.pk,
+            inscriptos__gte=cantidad
+        ).update(inscriptos=F('inscriptos') - cantidad)
+
     def __str__(self):
         return f"{self.materia.nombre} - {self.curso.nombre}"
 
 
+class FranjaHorariaQuerySet(models.QuerySet):
+    def superpuestas_con(self, materia_curso):
+        """
+        Franjas que se pisan con alguna franja de `materia_curso`.
+        Es una sola consulta: EXISTS correlacionado sobre (dia, inicio, fin).
+        """
+        nuevas = FranjaHoraria.objects.filter(
+            materia_curso=materia_curso,
+            dia=OuterRef('dia'),
+            inicio__lt=OuterRef('fin'),
+            fin__gt=OuterRef('inicio'),
+        )
+        return self.filter(Exists(nuevas))
+
+
+class FranjaHoraria(models.Model):
+    """
+    Horario normalizado de un MateriaCurso: una fila por día, con inicio y
+    fin en minutos desde las 00:00. Se genera al guardar el MateriaCurso.
+    """
+    DIAS = list(enumerate(DIAS_SEMANA))
+
+    materia_curso = models.ForeignKey(MateriaCurso, on_delete=models.CASCADE, related_name='franjas')
+    dia = models.PositiveSmallIntegerField(choices=DIAS)
+    inicio = models.PositiveSmallIntegerField()
+    fin = models.PositiveSmallIntegerField()
+
+    objects = FranjaHorariaQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['dia', 'inicio']
+        indexes = [
+            models.Index(fields=['dia', 'inicio', 'fin'], name='utn_franja_intervalo_idx'),
+        ]
+
+    @property
+    def hora_inicio(self):
+        return minutos_a_hora(self.inicio)
+
+    @property
+    def hora_fin(self):
+        return minutos_a_hora(self.fin)
+
+    def __str__(self):
+        return f"{self.get_dia_display()} {self.hora_inicio}-{self.hora_fin}"
+
+
 # ============================================
 #   INSCRIPCIONES
 # ============================================
@@ -216,26 +455,23 @@ class Inscripcion(models.Model):
         return f"{self.alumno.nombre} {self.alumno.apellido} – {self.materia_curso}"
 
     def clean(self):
-        nueva_materia = self.materia_curso
-        nuevos_dias, nuevo_inicio, nuevo_fin = nueva_materia.parse_horario()
-
         inscripciones_existentes = Inscripcion.objects.filter(
             alumno=self.alumno,
             estado="inscripto"
         ).exclude(pk=self.pk)
 
-        for insc in inscripciones_existentes:
-            materia = insc.materia_curso
-            dias, inicio, fin = materia.parse_horario()
+        conflicto = FranjaHoraria.objects.filter(
+            materia_curso__inscripciones__in=inscripciones_existentes
+        ).superpuestas_con(
+            self.materia_curso
+        ).select_related('materia_curso__materia').first()
 
-            for dia in dias:
-                if dia in nuevos_dias:
-                    if not (nuevo_fin <= inicio or nuevo_inicio >= fin):
-                        raise ValidationError(
-                            f"Conflicto de horario: ya estás inscripto en "
-                            f"{materia.materia.nombre} el día {dia} "
-                            f"de {inicio.strftime('%H:%M')} a {fin.strftime('%H:%M')}."
-                        )
+        if conflicto is not None:
+            raise ValidationError(
+                f"Conflicto de horario: ya estás inscripto en "
+                f"{conflicto.materia_curso.materia.nombre} el día {conflicto.get_dia_display()} "
+                f"de {conflicto.hora_inicio} a {conflicto.hora_fin}."
+            )
 
     def save(self, *args, **kwargs):
         self.clean()
@@ -253,6 +489,13 @@ class Profesor(models.Model):
     apellido = models.CharField(max_length=50)
     email = models.EmailField()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Para saber si cambió el usuario vinculado (ver UTN/roles.py)
+        instance._user_original = instance.__dict__.get('user_id')
+        return instance
+
     def __str__(self):
         display = f"{self.nombre} {self.apellido}"
         if self.user:
@@ -264,6 +507,24 @@ class Profesor(models.Model):
 #   NUEVO — ASIGNACIÓN PROFESOR → MATERIA CURSO
 # ============================================
 
+class ProfesorMateriaCursoQuerySet(models.QuerySet):
+    def con_resumen(self):
+        """
+        Asignaciones con materia, curso y estadísticas ya unidas, más los
+        conteos de alumnos del curso. Una sola consulta agrupada, sin
+        importar cuántos cursos tenga el profesor.
+        """
+        return self.select_related(
+            'materia_curso__materia',
+            'materia_curso__curso',
+            'materia_curso__estadistica'
+        ).annotate(
+            total_inscriptos=Count('materia_curso__alumnos'),
+            total_sin_nota=Count('materia_curso__alumnos', filter=Q(materia_curso__alumnos__finalizado=False)),
+            total_finalizados=Count('materia_curso__alumnos', filter=Q(materia_curso__alumnos__finalizado=True))
+        ).order_by('materia_curso__materia__nombre', 'materia_curso__curso__nombre')
+
+
 class ProfesorMateriaCurso(models.Model):
     id_profesor_mc = models.AutoField(primary_key=True)
 
@@ -279,6 +540,8 @@ class ProfesorMateriaCurso(models.Model):
         related_name='profesores'
     )
 
+    objects = ProfesorMateriaCursoQuerySet.as_manager()
+
     class Meta:
         unique_together = ('profesor', 'materia_curso')
 
@@ -328,6 +591,44 @@ class Evaluacion(models.Model):
         return f"{self.tipo_evaluacion} - {self.nota}"
 
 
+def calcular_resultado(nota_1, nota_2, nota_3):
+    """
+    Reglas de promedio de una cursada, sin tocar la base:
+    devuelve (promedio, nota, aprobado, finalizado).
+    Sólo se cierra la cursada con las tres notas cargadas.
+    """
+    notas = [nota_1, nota_2, nota_3]
+
+    if not all(n is not None for n in notas):
+        return None, None, False, False
+
+    promedio = sum(notas) / 3
+    return promedio, round(promedio), promedio >= 6, True
+
+
+CAMPOS_APORTE = ('materia_curso_id', 'nota_1', 'nota_2', 'nota_3', 'nota', 'aprobado', 'finalizado')
+
+
+def aporte_estadistico(inscripcion):
+    """
+    Lo que una inscripción suma a EstadisticaMateriaCurso:
+    (materia_curso_id, finalizado, aprobado, suma de notas, nota).
+    Devuelve None si la instancia tiene campos diferidos.
+    """
+    datos = inscripcion.__dict__
+    if any(campo not in datos for campo in CAMPOS_APORTE):
+        return None
+
+    if not datos['finalizado']:
+        return datos['materia_curso_id'], False, False, 0, None
+
+    # Una fila finalizada sin alguna nota (escrita con update() o SQL
+    # directo) no suma notas, igual que en el SUM de agregados_por_curso
+    notas = (datos['nota_1'], datos['nota_2'], datos['nota_3'])
+    suma = sum(notas) if None not in notas else 0
+    return datos['materia_curso_id'], True, datos['aprobado'], suma, datos['nota']
+
+
 class AlumnoMateriaCurso(models.Model):
     id_alumno_materia_curso = models.AutoField(primary_key=True)
 
@@ -354,8 +655,20 @@ class AlumnoMateriaCurso(models.Model):
     finalizado = models.BooleanField(default=False)
 
     class Meta:
+        # Su índice (alumno, materia_curso) ya resuelve los filtros por
+        # alumno + aprobado: son pocas filas por alumno y otro índice sólo
+        # encarecería las escrituras de la reinscripción y la carga de notas
         unique_together = ('alumno', 'materia_curso')
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Curso original, para mover la vacante si se cambia de curso
+        instance._materia_curso_original = instance.__dict__.get('materia_curso_id')
+        # Aporte a EstadisticaMateriaCurso tal como está guardado
+        instance._aporte_original = aporte_estadistico(instance)
+        return instance
+
     # =====================
     # VALIDACIÓN HORARIOS (TUYA, INTACTA)
         # =====================
@@ -363,17 +676,15 @@ class AlumnoMateriaCurso(models.Model):
         # =====================
         # VALIDACIÓN HORARIOS (TUYA)
         # =====================
-        nuevo_horario = self.materia_curso.horario
-        nuevo_turno = self.materia_curso.turno_cursado
-
+        # Compara las franjas normalizadas, no el texto de `horario`
         materias_existentes = AlumnoMateriaCurso.objects.filter(
             alumno=self.alumno,
-            materia_curso__horario=nuevo_horario,
-            materia_curso__turno_cursado=nuevo_turno,
             finalizado=False
         ).exclude(pk=self.pk)
 
-        if materias_existentes.exists():
+        if FranjaHoraria.objects.filter(
+            materia_curso__alumnos__in=materias_existentes
+        ).superpuestas_con(self.materia_curso).exists():
             raise ValidationError(
                 "Ya estás inscripto en una materia en el mismo día y horario."
             )
@@ -381,13 +692,14 @@ class AlumnoMateriaCurso(models.Model):
         # =====================
         # VALIDACIÓN CORRELATIVIDADES
         # =====================
-        from .models import alumno_cumple_correlativas
+        from .correlativas import EvaluadorCorrelativas
 
         materia = self.materia_curso.materia
-        cumple, correlativa_faltante = alumno_cumple_correlativas(
-            self.alumno,
-            materia
-        )
+        evaluador = getattr(self, 'evaluador_correlativas', None)
+        if evaluador is None:
+            evaluador = EvaluadorCorrelativas(self.alumno, [materia])
+
+        cumple, correlativa_faltante = evaluador.cumple(materia)
 
         if not cumple:
             raise ValidationError(
@@ -400,27 +712,187 @@ class AlumnoMateriaCurso(models.Model):
     # LÓGICA DE PROMEDIO
     # =====================
     def calcular_promedio(self):
-        notas = [self.nota_1, self.nota_2, self.nota_3]
+        (
+            self.promedio,
+            self.nota,
+            self.aprobado,
+            self.finalizado,
+        ) = calcular_resultado(self.nota_1, self.nota_2, self.nota_3)
+
+    def save(self, *args, **kwargs):
+        self.calcular_promedio()
 
-        if not all(n is not None for n in notas):
-            self.promedio = None
-            self.nota = None
-            self.aprobado = False
-            self.finalizado = False
+        original = None if self._state.adding else getattr(self, '_materia_curso_original', None)
+        if original == self.materia_curso_id:
+            super().save(*args, **kwargs)
             return
 
-        self.promedio = sum(notas) / 3
-        self.nota = round(self.promedio)
-        self.aprobado = self.promedio >= 6
-        self.finalizado = True
+        # Alta o cambio de curso: reservar la vacante en la misma transacción
+        with transaction.atomic():
+            if not self.materia_curso.reservar_vacante():
+                raise ValidationError("No quedan vacantes en este curso.", code='sin_vacantes')
+            if original is not None:
+                MateriaCurso(pk=original).liberar_vacante()
+            super().save(*args, **kwargs)
 
-    def save(self, *args, **kwargs):
-        self.calcular_promedio()
-        super().save(*args, **kwargs)
+        self._materia_curso_original = self.materia_curso_id
 
     def __str__(self):
         return f"{self.alumno} en {self.materia_curso}"
 
+
+class EstadisticaMateriaCurso(models.Model):
+    """
+    Resumen de notas de un MateriaCurso. No se recalcula al leerlo: cada
+    alta, baja o cambio de notas aplica sólo su diferencia con F()
+    (ver UTN/estadisticas.py).
+    """
+    materia_curso = models.OneToOneField(
+        MateriaCurso,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='estadistica'
+    )
+    inscriptos = models.PositiveIntegerField(default=0)
+    calificados = models.PositiveIntegerField(default=0)
+    aprobados = models.PositiveIntegerField(default=0)
+    # nota_1 + nota_2 + nota_3 de los calificados. Entero para que los
+    # incrementos no acumulen error de punto flotante.
+    suma_notas = models.PositiveIntegerField(default=0)
+
+    hist_0 = models.PositiveIntegerField(default=0)
+    hist_1 = models.PositiveIntegerField(default=0)
+    hist_2 = models.PositiveIntegerField(default=0)
+    hist_3 = models.PositiveIntegerField(default=0)
+    hist_4 = models.PositiveIntegerField(default=0)
+    hist_5 = models.PositiveIntegerField(default=0)
+    hist_6 = models.PositiveIntegerField(default=0)
+    hist_7 = models.PositiveIntegerField(default=0)
+    hist_8 = models.PositiveIntegerField(default=0)
+    hist_9 = models.PositiveIntegerField(default=0)
+    hist_10 = models.PositiveIntegerField(default=0)
+
+    @property
+    def pendientes(self):
+        return self.inscriptos - self.calificados
+
+    @property
+    def promedio_general(self):
+        if not self.calificados:
+            return None
+        return self.suma_notas / (3 * self.calificados)
+
+    @property
+    def porcentaje_aprobados(self):
+        if not self.calificados:
+            return None
+        return 100 * self.aprobados / self.calificados
+
+    @property
+    def histograma(self):
+        """Lista de 11 (nota, cantidad) de 0 a 10."""
+        return [(nota, getattr(self, f'hist_{nota}')) for nota in range(11)]
+
+    def __str__(self):
+        return f"Estadísticas de {self.materia_curso}"
+
+
+class SemanaAlumno(models.Model):
+    """
+    Modelo de lectura del perfil del alumno: horario semanal y notas ya
+    armados en JSON. Se borra cuando cambia algo que lo afecta y se vuelve
+    a armar en la próxima visita (ver UTN/semana.py).
+    """
+    alumno = models.OneToOneField(
+        Alumno,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='semana'
+    )
+    datos = models.JSONField()
+    actualizado = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Semana de {self.alumno}"
+
+
+class ListaEspera(models.Model):
+    """
+    Cola FIFO de alumnos esperando vacante en un MateriaCurso completo.
+    La promoción está en UTN/inscripciones.py.
+    """
+    alumno = models.ForeignKey(Alumno, on_delete=models.CASCADE, related_name='listas_espera')
+    materia_curso = models.ForeignKey(MateriaCurso, on_delete=models.CASCADE, related_name='lista_espera')
+    fecha_alta = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('alumno', 'materia_curso')
+        ordering = ['fecha_alta', 'id']
+        indexes = [
+            models.Index(fields=['materia_curso', 'fecha_alta', 'id'], name='utn_espera_fifo_idx'),
+        ]
+
+    def posicion(self):
+        return ListaEspera.objects.filter(
+            Q(fecha_alta__lt=self.fecha_alta) | Q(fecha_alta=self.fecha_alta, id__lt=self.id),
+            materia_curso_id=self.materia_curso_id
+        ).count() + 1
+
+    def __str__(self):
+        return f"{self.alumno} esperando {self.materia_curso}"
+
+class VersionCatalogo(models.Model):
+    """
+    Contador único que avanza con cada cambio del catálogo (materias,
+    carreras, planes y correlativas). Lo que se arma a partir del catálogo
+    y se guarda en memoria o en caché se descarta cuando la versión cambia
+    (ver UTN/catalogo.py).
+    """
+    numero = models.PositiveBigIntegerField(default=0)
+    modificado = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Catálogo v{self.numero}"
+
+
+class GeneracionRol(models.Model):
+    """
+    Contador por usuario que avanza cuando cambia el alumno o profesor
+    vinculado. El rol guardado en la sesión lleva la generación con la que
+    se resolvió y se descarta cuando deja de coincidir (ver UTN/roles.py).
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='generacion_rol'
+    )
+    numero = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Rol de {self.user_id} v{self.numero}"
+
+
+class PlanCarreraSnapshot(models.Model):
+    """
+    Grafo del plan de una carrera ya calculado (ver UTN/plan.py), guardado
+    junto con la versión del catálogo con la que se armó. Sobrevive a los
+    reinicios: un proceso nuevo no tiene que recalcular los planes.
+    """
+    carrera = models.OneToOneField(
+        Carrera,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='plan_snapshot'
+    )
+    version = models.PositiveBigIntegerField()
+    datos = models.JSONField()
+    generado = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Plan de {self.carrera} (catálogo v{self.version})"
+
+
 # ======================================================
 #   VALIDACIÓN DE CORRELATIVIDADES (GLOBAL)
 # ======================================================
@@ -434,12 +906,12 @@ def alumno_aprobo_materia(alumno, materia):
 
 
 def alumno_cumple_correlativas(alumno, materia):
-    correlativas = materia.correlativas_requeridas.all()
-
-    for correlativa in correlativas:
-        if not alumno_aprobo_materia(alumno, correlativa):
-            return False, correlativa
+    """
+    Atajo para una sola materia. Para evaluar varias usar
+    EvaluadorCorrelativas directamente (ver UTN/correlativas.py).
+    """
+    from .correlativas import EvaluadorCorrelativas
 
-    return True, None
+    return EvaluadorCorrelativas(alumno, [materia]).cumple(materia)
 
 
@@ -0,0 +1,189 @@
+import csv
+import io
+import time
+
+from django.db import transaction
+
+from .estadisticas import actualizar_estadisticas
+from .models import AlumnoMateriaCurso, calcular_resultado
+from .semana import invalidar_semana_de_alumnos
+
+
+# ======================================================
+#   CARGA DE NOTAS POR LOTE
+# ======================================================
+
+CAMPOS_NOTAS = ['nota_1', 'nota_2', 'nota_3', 'promedio', 'nota', 'aprobado', 'finalizado']
+
+
+def parsear_nota(valor):
+    """"" -> None; "7" -> 7. Lanza ValueError si no es un entero de 0 a 10."""
+    valor = (valor or "").strip()
+    if not valor:
+        return None
+
+    nota = int(valor)
+    if not 0 <= nota <= 10:
+        raise ValueError(f"La nota {nota} está fuera del rango 0–10.")
+    return nota
+
+
+def aplicar_notas(inscripcion, nota_1, nota_2, nota_3):
+    """
+    Asigna las notas y recalcula el resultado en memoria.
+    Devuelve True si la fila cambió y hay que guardarla.
+    """
+    nuevos = (nota_1, nota_2, nota_3) + calcular_resultado(nota_1, nota_2, nota_3)
+    actuales = tuple(getattr(inscripcion, campo) for campo in CAMPOS_NOTAS)
+
+    if nuevos == actuales:
+        return False
+
+    for campo, valor in zip(CAMPOS_NOTAS, nuevos):
+        setattr(inscripcion, campo, valor)
+    return True
+
+
+def guardar_notas(inscripciones):
+    """
+    Escribe las inscripciones modificadas con un único bulk_update
+    (en lotes) dentro de una transacción. Como no pasa por save(),
+    actualiza las estadísticas del curso e invalida el horario de los
+    alumnos en la misma transacción.
+    """
+    if not inscripciones:
+        return
+
+    with transaction.atomic():
+        AlumnoMateriaCurso.objects.bulk_update(inscripciones, CAMPOS_NOTAS, batch_size=500)
+        actualizar_estadisticas(inscripciones)
+        invalidar_semana_de_alumnos({ins.alumno_id for ins in inscripciones})
+
+
+def resumir(inscripciones):
+    """Totales de la planilla: aprobados, desaprobados y pendientes."""
+    resumen = {'aprobados': 0, 'desaprobados': 0, 'pendientes': 0}
+    for ins in inscripciones:
+        if not ins.finalizado:
+            resumen['pendientes'] += 1
+        elif ins.aprobado:
+            resumen['aprobados'] += 1
+        else:
+            resumen['desaprobados'] += 1
+    return resumen
+
+
+# ======================================================
+#   IMPORTACIÓN DE NOTAS DESDE CSV
+# ======================================================
+
+COLUMNAS_CSV = ['dni', 'nota_1', 'nota_2', 'nota_3']
+TAMANIO_LOTE_CSV = 500
+MAX_ERRORES_REPORTADOS = 200
+
+
+def _leer_lotes(lector, tamanio_lote):
+    """Agrupa las filas del lector en listas de (numero_fila, fila)."""
+    lote = []
+    # La fila 1 es el encabezado
+    for numero, fila in enumerate(lector, start=2):
+        lote.append((numero, fila))
+        if len(lote) == tamanio_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def importar_notas_csv(materia_curso, archivo, tamanio_lote=TAMANIO_LOTE_CSV):
+    """
+    Importa notas de un CSV con columnas dni, nota_1, nota_2, nota_3.
+
+    El archivo se lee como stream (nunca entero en memoria) y se procesa en
+    lotes: una consulta por lote para buscar las inscripciones por DNI y un
+    bulk_update por lote para escribir. Cada lote se guarda en su propia
+    transacción, así un archivo grande no retiene el lock de escritura de
+    SQLite durante toda la importación.
+
+    Una fila inválida no frena el resto: se informa en `errores` con su
+    número de fila. Devuelve un dict con los totales, los errores y el
+    tiempo empleado.
+    """
+    inicio = time.perf_counter()
+    resultado = {
+        'filas': 0,
+        'actualizadas': 0,
+        'sin_cambios': 0,
+        'errores': [],
+        'total_errores': 0,
+        'segundos': 0.0,
+    }
+
+    def registrar_error(numero, dni, mensaje):
+        resultado['total_errores'] += 1
+        if len(resultado['errores']) < MAX_ERRORES_REPORTADOS:
+            resultado['errores'].append({'fila': numero, 'dni': dni, 'mensaje': mensaje})
+
+    # utf-8-sig descarta el BOM que agrega Excel al exportar CSV
+    texto = io.TextIOWrapper(archivo, encoding='utf-8-sig', newline='')
+    try:
+        lector = csv.DictReader(texto)
+        encabezado = [(c or '').strip().lower() for c in (lector.fieldnames or [])]
+        faltantes = [c for c in COLUMNAS_CSV if c not in encabezado]
+        if faltantes:
+            registrar_error(1, '', "Faltan columnas en el encabezado: " + ", ".join(faltantes) + ".")
+            return resultado
+        lector.fieldnames = encabezado
+
+        vistos = set()
+        for lote in _leer_lotes(lector, tamanio_lote):
+            resultado['filas'] += len(lote)
+
+            dnis = {(fila.get('dni') or '').strip() for _, fila in lote}
+            inscripciones = {
+                ins.alumno.dni: ins
+                for ins in AlumnoMateriaCurso.objects.filter(
+                    materia_curso=materia_curso,
+                    alumno__dni__in=dnis
+                ).select_related('alumno')
+            }
+
+            modificadas = []
+            for numero, fila in lote:
+                dni = (fila.get('dni') or '').strip()
+
+                if not dni:
+                    registrar_error(numero, dni, "Falta el DNI.")
+                    continue
+                if dni in vistos:
+                    registrar_error(numero, dni, "DNI repetido en el archivo.")
+                    continue
+                vistos.add(dni)
+
+                ins = inscripciones.get(dni)
+                if ins is None:
+                    registrar_error(numero, dni, "No hay un alumno con ese DNI inscripto en este curso.")
+                    continue
+
+                try:
+                    notas = [parsear_nota(fila.get(campo)) for campo in ('nota_1', 'nota_2', 'nota_3')]
+                except ValueError:
+                    registrar_error(numero, dni, "Las notas deben ser enteros de 0 a 10.")
+                    continue
+
+                if aplicar_notas(ins, *notas):
+                    modificadas.append(ins)
+                else:
+                    resultado['sin_cambios'] += 1
+
+            guardar_notas(modificadas)
+            resultado['actualizadas'] += len(modificadas)
+
+    except (UnicodeDecodeError, csv.Error) as e:
+        registrar_error(resultado['filas'] + 1, '', f"No se pudo leer el archivo como CSV UTF-8: {e}")
+    finally:
+        # Se desacopla el wrapper para no cerrar el archivo subido
+        texto.detach()
+        resultado['segundos'] = time.perf_counter() - inicio
+
+    return resultado
@@ -0,0 +1,160 @@
+from .catalogo import version_catalogo
+from .models import Carrera, CarreraMateria, Materia, PlanCarreraSnapshot
+
+
+# ======================================================
+#   GRAFO DE CORRELATIVAS
+# ======================================================
+
+class GrafoCorrelativas:
+    """
+    Grafo acíclico del plan: `requeridas[sigla]` son las correlativas
+    directas de cada materia, sólo entre materias del grafo. No consulta
+    la base.
+
+    - nivel: largo del camino de correlativas más largo que termina en la
+      materia (0 = no requiere ninguna). Las materias de un mismo nivel
+      no dependen entre sí.
+    - altura: largo del camino más largo que sale de la materia hacia las
+      que la requieren (0 = ninguna la requiere). Es lo que como mínimo
+      falta cursar después de ella: la ruta crítica.
+    - ciclicas: materias que quedaron en un ciclo (no debería haber,
+      validar_sin_ciclos los impide) y por eso no tienen nivel.
+    """
+
+    def __init__(self, nodos, requeridas):
+        self.nodos = sorted(nodos)
+        en_grafo = set(self.nodos)
+        self.requeridas = {n: sorted(set(requeridas.get(n, ())) & en_grafo) for n in self.nodos}
+        self.dependientes = {n: [] for n in self.nodos}
+        for materia, lista in self.requeridas.items():
+            for requerida in lista:
+                self.dependientes[requerida].append(materia)
+
+        # Kahn por rondas: cada ronda es un nivel
+        pendientes = {n: len(self.requeridas[n]) for n in self.nodos}
+        frontera = [n for n in self.nodos if pendientes[n] == 0]
+        self.nivel = {n: 0 for n in frontera}
+        self.orden = []
+        while frontera:
+            siguiente = []
+            for materia in frontera:
+                self.orden.append(materia)
+                for dependiente in self.dependientes[materia]:
+                    self.nivel[dependiente] = max(self.nivel.get(dependiente, 0), self.nivel[materia] + 1)
+                    pendientes[dependiente] -= 1
+                    if pendientes[dependiente] == 0:
+                        siguiente.append(dependiente)
+            frontera = sorted(siguiente)
+
+        ordenadas = set(self.orden)
+        self.ciclicas = [n for n in self.nodos if n not in ordenadas]
+
+        self.altura = {}
+        for materia in reversed(self.orden):
+            self.altura[materia] = max(
+                (self.altura[d] + 1 for d in self.dependientes[materia] if d in self.altura),
+                default=0
+            )
+
+    def niveles(self):
+        por_nivel = {}
+        for materia in self.orden:
+            por_nivel.setdefault(self.nivel[materia], []).append(materia)
+        return [sorted(por_nivel[nivel]) for nivel in sorted(por_nivel)]
+
+    def cadena_mas_larga(self):
+        """Una de las cadenas de correlativas más largas, de la primera a la última."""
+        if not self.orden:
+            return []
+        actual = min(self.orden, key=lambda m: (-self.nivel[m], m))
+        cadena = [actual]
+        while self.nivel[actual] > 0:
+            actual = min(r for r in self.requeridas[actual] if self.nivel[r] == self.nivel[actual] - 1)
+            cadena.append(actual)
+        return cadena[::-1]
+
+
+# ======================================================
+#   PLAN DE LA CARRERA COMO GRAFO (JSON)
+# ======================================================
+
+def calcular_plan(carrera_id):
+    """
+    Arma el plan con tres consultas (carrera, materias del plan y
+    correlativas entre ellas). Lanza Carrera.DoesNotExist si no existe.
+    """
+    carrera = Carrera.objects.only('id_carrera', 'nombre').get(pk=carrera_id)
+
+    filas = list(
+        CarreraMateria.objects.filter(carrera_id=carrera_id).values_list(
+            'materia_id', 'materia__nombre', 'anio'
+        ).order_by('anio', 'materia_id')
+    )
+    en_plan = {sigla for sigla, _, _ in filas}
+
+    requeridas, fuera_del_plan = {}, {}
+    for materia, requerida in Materia.correlativas_requeridas.through.objects.filter(
+        from_materia_id__in=en_plan
+    ).values_list('from_materia_id', 'to_materia_id'):
+        destino = requeridas if requerida in en_plan else fuera_del_plan
+        destino.setdefault(materia, []).append(requerida)
+
+    grafo = GrafoCorrelativas(en_plan, requeridas)
+    cadena = grafo.cadena_mas_larga()
+
+    return {
+        "carrera": {"id": carrera.pk, "nombre": carrera.nombre},
+        "nodos": [
+            {
+                "sigla": sigla,
+                "nombre": nombre,
+                "anio": anio,
+                "nivel": grafo.nivel.get(sigla),
+                "altura": grafo.altura.get(sigla),
+                "requiere": grafo.requeridas[sigla],
+                "requerida_por": sorted(grafo.dependientes[sigla]),
+                "requiere_fuera_del_plan": sorted(fuera_del_plan.get(sigla, [])),
+            }
+            for sigla, nombre, anio in filas
+        ],
+        # (requerida, materia): de la correlativa a la que la necesita
+        "aristas": [[requerida, materia] for materia in grafo.nodos for requerida in grafo.requeridas[materia]],
+        "niveles": grafo.niveles(),
+        "cadena_mas_larga": cadena,
+        "ciclicas": grafo.ciclicas,
+    }
+
+
+# {carrera_id: (version, datos)} en la memoria de cada proceso
+_planes = {}
+
+
+def plan_de(carrera_id):
+    """
+    Devuelve (version, datos). Busca primero en la memoria del proceso,
+    después en PlanCarreraSnapshot y recién si ninguno corresponde a la
+    versión actual del catálogo lo calcula y lo guarda en los dos.
+    """
+    version = version_catalogo()
+
+    guardado = _planes.get(carrera_id)
+    if guardado is not None and guardado[0] == version:
+        return guardado
+
+    datos = PlanCarreraSnapshot.objects.filter(
+        carrera_id=carrera_id,
+        version=version
+    ).values_list('datos', flat=True).first()
+
+    if datos is None:
+        datos = calcular_plan(carrera_id)
+        PlanCarreraSnapshot.objects.bulk_create(
+            [PlanCarreraSnapshot(carrera_id=carrera_id, version=version, datos=datos)],
+            update_conflicts=True,
+            unique_fields=['carrera'],
+            update_fields=['version', 'datos', 'generado']
+        )
+
+    _planes[carrera_id] = (version, datos)
+    return version, datos
@@ -0,0 +1,131 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils.functional import SimpleLazyObject
+
+from .models import GeneracionRol
+
+
+# ======================================================
+#   ROL DEL USUARIO (ALUMNO / PROFESOR) POR SESIÓN
+# ======================================================
+
+CLAVE_SESION_ROL = '_rol'
+
+# Cota de lo que puede durar un rol guardado aunque la generación no cambie
+DURACION_ROL = 5 * 60
+
+# Cada cuánto se relee de la base la generación de un usuario. Acota lo
+# que tarda un proceso en enterarse de una invalidación hecha en otro si
+# la caché no es compartida (como con UTN/catalogo.py:version_catalogo)
+DURACION_GENERACION_ROL = 30
+
+
+class Rol:
+    """Claves del alumno y del profesor vinculados al usuario, si los hay."""
+
+    __slots__ = ('alumno_id', 'profesor_id')
+
+    def __init__(self, alumno_id=None, profesor_id=None):
+        self.alumno_id = alumno_id
+        self.profesor_id = profesor_id
+
+    @property
+    def es_alumno(self):
+        return self.alumno_id is not None
+
+    @property
+    def es_profesor(self):
+        return self.profesor_id is not None
+
+    def __repr__(self):
+        return f"Rol(alumno_id={self.alumno_id}, profesor_id={self.profesor_id})"
+
+
+def _clave_generacion(user_id):
+    return f"rol:generacion:{user_id}"
+
+
+def generacion_rol(user_id):
+    clave = _clave_generacion(user_id)
+    generacion = cache.get(clave)
+    if generacion is None:
+        generacion = GeneracionRol.objects.filter(pk=user_id).values_list('numero', flat=True).first() or 0
+        cache.set(clave, generacion, DURACION_GENERACION_ROL)
+    return generacion
+
+
+def invalidar_rol(*user_ids):
+    """
+    Avanza en la base la generación del rol de esos usuarios: en su
+    próximo request la sesión guardada deja de coincidir y el rol se
+    vuelve a resolver. La caché se limpia al confirmar la transacción.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    for user_id in user_ids:
+        if not GeneracionRol.objects.filter(pk=user_id).update(numero=F('numero') + 1):
+            GeneracionRol.objects.get_or_create(pk=user_id, defaults={'numero': 1})
+    if user_ids:
+        claves = [_clave_generacion(user_id) for user_id in user_ids]
+        transaction.on_commit(lambda: cache.delete_many(claves))
+
+
+def resolver_rol(user):
+    """Alumno y profesor del usuario en una sola consulta."""
+    fila = get_user_model().objects.filter(pk=user.pk).values_list(
+        'alumno__id_alumno', 'profesor__id_profesor'
+    ).first()
+    return Rol(*fila) if fila else Rol()
+
+
+def obtener_rol(request):
+    """
+    Rol del usuario logueado. Se guarda en la sesión como
+    [user_id, generación, momento, alumno_id, profesor_id] y se reusa
+    mientras el usuario y la generación coincidan y no haya vencido.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return Rol()
+
+    generacion = generacion_rol(user.pk)
+    ahora = int(time.time())
+
+    guardado = request.session.get(CLAVE_SESION_ROL)
+    if guardado and guardado[:2] == [user.pk, generacion] and ahora - guardado[2] < DURACION_ROL:
+        return Rol(*guardado[3:])
+
+    rol = resolver_rol(user)
+    guardar_rol(request, rol, generacion)
+    return rol
+
+
+def guardar_rol(request, rol, generacion=None):
+    """Guarda en la sesión un rol ya resuelto (por ejemplo, al loguearse)."""
+    user_id = request.user.pk
+    if generacion is None:
+        generacion = generacion_rol(user_id)
+    request.session[CLAVE_SESION_ROL] = [user_id, generacion, int(time.time()), rol.alumno_id, rol.profesor_id]
+
+
+class RolMiddleware:
+    """
+    Deja `request.rol`. Es perezoso: las páginas que no lo usan no tocan
+    la sesión ni la base. Va después de AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.rol = SimpleLazyObject(lambda: obtener_rol(request))
+        return self.get_response(request)
+
+
+def rol(request):
+    """Context processor: `rol` en todos los templates."""
+    # Sin evaluarlo: sólo se resuelve si el template lo usa
+    return {'rol': request.rol if hasattr(request, 'rol') else Rol()}
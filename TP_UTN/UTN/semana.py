@@ -0,0 +1,119 @@
+from django.db.models import F
+from django.utils import timezone
+
+from .horarios import DIAS_SEMANA
+from .models import Alumno, AlumnoMateriaCurso, SemanaAlumno
+
+
+# ======================================================
+#   HORARIO SEMANAL DEL ALUMNO (MODELO DE LECTURA)
+# ======================================================
+
+# El perfil no muestra el domingo
+DIAS_PERFIL = DIAS_SEMANA[:6]
+
+
+def construir_semana(alumno):
+    """
+    Arma el horario semanal y la tabla de notas del alumno con una
+    cantidad fija de consultas (inscripciones, franjas, asignaciones y
+    profesores), sin importar cuántas materias curse.
+    """
+    inscripciones = AlumnoMateriaCurso.objects.filter(alumno=alumno).select_related(
+        "materia_curso",
+        "materia_curso__materia"
+    ).prefetch_related(
+        "materia_curso__franjas",
+        "materia_curso__profesores__profesor"
+    )
+
+    semana = {dia: [] for dia in DIAS_PERFIL}
+    cursadas = []
+
+    for ins in inscripciones:
+        mc = ins.materia_curso
+
+        nombres_profesores = ", ".join(
+            f"{p.profesor.nombre} {p.profesor.apellido}"
+            for p in mc.profesores.all()
+        )
+
+        notas = {
+            "nota_1": ins.nota_1,
+            "nota_2": ins.nota_2,
+            "nota_3": ins.nota_3,
+            "promedio": ins.promedio,
+            "aprobado": ins.aprobado,
+        }
+
+        cursadas.append({
+            "materia": mc.materia.nombre,
+            "finalizado": ins.finalizado,
+            **notas
+        })
+
+        for franja in mc.franjas.all():
+            dia = franja.get_dia_display()
+            if dia not in semana:
+                continue
+
+            semana[dia].append({
+                "materia": mc.materia.nombre,
+                "profesor": nombres_profesores or "Sin asignar",
+                "horario": f"{franja.hora_inicio}–{franja.hora_fin}",
+                "inicio": franja.inicio,
+                "turno": mc.turno_cursado.capitalize(),
+                **notas
+            })
+
+    for entradas in semana.values():
+        entradas.sort(key=lambda entrada: entrada["inicio"])
+
+    return {"semana": semana, "cursadas": cursadas}
+
+
+def semana_de(alumno):
+    """
+    Devuelve los datos guardados del alumno; si fueron invalidados los
+    vuelve a armar y los guarda. Con `alumno.semana` cargado por
+    select_related no hace ninguna consulta extra.
+    """
+    try:
+        return alumno.semana.datos
+    except SemanaAlumno.DoesNotExist:
+        pass
+
+    datos = construir_semana(alumno)
+    # Si otro request la guardó primero, la fila existente es igual de válida
+    SemanaAlumno.objects.bulk_create([SemanaAlumno(alumno=alumno, datos=datos)], ignore_conflicts=True)
+    return datos
+
+
+# ======================================================
+#   INVALIDACIÓN
+# ======================================================
+
+def avanzar_version_de_alumnos(alumno_ids):
+    """
+    Avanza la versión de inscripciones: el feed .ics responde con otro
+    ETag y el analítico cacheado deja de usarse.
+    """
+    Alumno.objects.filter(pk__in=alumno_ids).update(
+        version_inscripciones=F('version_inscripciones') + 1,
+        inscripciones_modificadas=timezone.now()
+    )
+
+
+def invalidar_semana_de_alumnos(alumno_ids):
+    """Borra el horario armado de los alumnos y avanza su versión."""
+    SemanaAlumno.objects.filter(alumno_id__in=alumno_ids).delete()
+    avanzar_version_de_alumnos(alumno_ids)
+
+
+def invalidar_semana_de_cursos(materia_curso_ids):
+    """Invalida a todos los alumnos inscriptos en esos cursos."""
+    invalidar_semana_de_alumnos(
+        AlumnoMateriaCurso.objects.filter(
+            materia_curso_id__in=materia_curso_ids
+        ).values('alumno_id')
+    )
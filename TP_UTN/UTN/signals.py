@@ -0,0 +1,189 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .busqueda import desindexar, indexar
+from .catalogo import avanzar_version_catalogo
+from .correlativas import agregar_a_clausura, recalcular_clausura, validar_sin_ciclos
+from .estadisticas import actualizar_estadisticas, descontar_estadisticas
+from .models import Alumno, AlumnoMateria, AlumnoMateriaCurso, Carrera, CarreraMateria, CorrelativaClausura, Materia, MateriaCurso, Profesor, ProfesorMateriaCurso
+from .roles import invalidar_rol
+from .semana import avanzar_version_de_alumnos, invalidar_semana_de_alumnos, invalidar_semana_de_cursos
+
+
+# ======================================================
+#   CLAUSURA DE CORRELATIVAS
+# ======================================================
+
+@receiver(m2m_changed, sender=Materia.correlativas_requeridas.through)
+def mantener_clausura_correlativas(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Mantiene CorrelativaClausura al día con cada add/remove/clear, tanto
+    desde materia.correlativas_requeridas como desde
+    materia.materias_que_la_requieren.
+    """
+    if action in ("pre_add", "post_add"):
+        if reverse:
+            aristas = [(materia, instance.pk) for materia in pk_set]
+        else:
+            aristas = [(instance.pk, requerida) for requerida in pk_set]
+
+        if action == "pre_add":
+            validar_sin_ciclos(aristas)
+        else:
+            agregar_a_clausura(aristas)
+
+    elif action == "post_remove":
+        recalcular_clausura(pk_set if reverse else [instance.pk])
+
+    elif action == "pre_clear" and reverse:
+        # Después del clear ya no se sabe qué materias la requerían
+        instance._clausura_afectadas = list(
+            instance.materias_que_la_requieren.values_list('pk', flat=True)
+        )
+
+    elif action == "post_clear":
+        if reverse:
+            recalcular_clausura(getattr(instance, '_clausura_afectadas', []))
+        else:
+            recalcular_clausura([instance.pk])
+
+
+@receiver(pre_delete, sender=Materia)
+def guardar_dependientes_de_materia(sender, instance, **kwargs):
+    instance._clausura_afectadas = list(
+        CorrelativaClausura.objects.filter(ancestro=instance).values_list('descendiente_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Materia)
+def recalcular_dependientes_de_materia(sender, instance, **kwargs):
+    # Los caminos que pasaban por la materia borrada dejan de existir
+    afectadas = getattr(instance, '_clausura_afectadas', [])
+    if afectadas:
+        recalcular_clausura(afectadas)
+
+
+# ======================================================
+#   VACANTES
+# ======================================================
+
+@receiver(post_delete, sender=AlumnoMateriaCurso)
+def liberar_vacante_al_borrar(sender, instance, **kwargs):
+    # También corre en borrados en cascada y desde querysets
+    MateriaCurso(pk=instance.materia_curso_id).liberar_vacante()
+
+
+# ======================================================
+#   ESTADÍSTICAS POR CURSO
+# ======================================================
+
+@receiver(post_save, sender=AlumnoMateriaCurso)
+def actualizar_estadisticas_al_guardar(sender, instance, created, **kwargs):
+    actualizar_estadisticas([instance], creadas=created)
+
+
+@receiver(post_delete, sender=AlumnoMateriaCurso)
+def descontar_estadisticas_al_borrar(sender, instance, **kwargs):
+    descontar_estadisticas(instance)
+
+
+# ======================================================
+#   HORARIO SEMANAL DEL ALUMNO
+# ======================================================
+
+@receiver(post_save, sender=AlumnoMateriaCurso)
+@receiver(post_delete, sender=AlumnoMateriaCurso)
+def invalidar_semana_por_inscripcion(sender, instance, **kwargs):
+    invalidar_semana_de_alumnos([instance.alumno_id])
+
+
+@receiver(post_save, sender=ProfesorMateriaCurso)
+@receiver(post_delete, sender=ProfesorMateriaCurso)
+def invalidar_semana_por_asignacion(sender, instance, **kwargs):
+    invalidar_semana_de_cursos([instance.materia_curso_id])
+
+
+@receiver(post_save, sender=MateriaCurso)
+def invalidar_semana_por_curso(sender, instance, created, **kwargs):
+    # Un curso recién creado todavía no tiene inscriptos
+    if not created:
+        invalidar_semana_de_cursos([instance.pk])
+
+
+@receiver(post_save, sender=Materia)
+def invalidar_semana_por_materia(sender, instance, created, **kwargs):
+    if not created:
+        invalidar_semana_de_cursos(instance.cursos_ofrecidos.values('pk'))
+
+
+@receiver(post_save, sender=Profesor)
+def invalidar_semana_por_profesor(sender, instance, created, **kwargs):
+    if not created:
+        invalidar_semana_de_cursos(instance.materias_asignadas.values('materia_curso_id'))
+
+
+# ======================================================
+#   ANALÍTICO
+# ======================================================
+
+@receiver(post_save, sender=AlumnoMateria)
+@receiver(post_delete, sender=AlumnoMateria)
+def avanzar_version_por_aprobacion(sender, instance, **kwargs):
+    # Las aprobaciones cargadas a mano no afectan el horario, sólo el analítico
+    avanzar_version_de_alumnos([instance.alumno_id])
+
+
+# ======================================================
+#   ROL DEL USUARIO EN SESIÓN
+# ======================================================
+
+@receiver(post_save, sender=Alumno)
+@receiver(post_save, sender=Profesor)
+def invalidar_rol_al_vincular(sender, instance, created, **kwargs):
+    # Sólo importa cuando cambia el usuario vinculado (o se crea el perfil)
+    anterior = getattr(instance, '_user_original', None)
+    if created or anterior != instance.user_id:
+        invalidar_rol(anterior, instance.user_id)
+    instance._user_original = instance.user_id
+
+
+@receiver(post_delete, sender=Alumno)
+@receiver(post_delete, sender=Profesor)
+def invalidar_rol_al_desvincular(sender, instance, **kwargs):
+    invalidar_rol(getattr(instance, '_user_original', None), instance.user_id)
+
+
+# ======================================================
+#   ÍNDICE DE BÚSQUEDA
+# ======================================================
+
+@receiver(post_save, sender=Materia)
+@receiver(post_save, sender=Carrera)
+def indexar_al_guardar(sender, instance, **kwargs):
+    indexar(instance)
+
+
+@receiver(post_delete, sender=Materia)
+@receiver(post_delete, sender=Carrera)
+def desindexar_al_borrar(sender, instance, **kwargs):
+    desindexar(instance)
+
+
+# ======================================================
+#   VERSIÓN DEL CATÁLOGO
+# ======================================================
+
+@receiver(post_save, sender=Materia)
+@receiver(post_delete, sender=Materia)
+@receiver(post_save, sender=Carrera)
+@receiver(post_delete, sender=Carrera)
+@receiver(post_save, sender=CarreraMateria)
+@receiver(post_delete, sender=CarreraMateria)
+def avanzar_version_por_catalogo(sender, **kwargs):
+    avanzar_version_catalogo()
+
+
+@receiver(m2m_changed, sender=Materia.correlativas_requeridas.through)
+def avanzar_version_por_correlativas(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        avanzar_version_catalogo()
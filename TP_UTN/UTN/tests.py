@@ -1,3 +1,1725 @@
-from django.test import TestCase
+import re
+from datetime import timedelta
+from importlib import import_module
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.messages import get_messages
+from django.contrib.messages.storage import default_storage
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .analitico import analitico_de
+from .busqueda import filtrar_por_texto
+from .calendario import firma_calendario
+from .correlativas import EvaluadorCorrelativas, alumnos_que_cumplen, calcular_clausura
+from .egreso import _grafos, egreso_de
+from .estadisticas import CAMPOS_ESTADISTICA, agregados_por_curso, recalcular_estadisticas
+from .inscripciones import anotar_en_lista_espera, promover_lista_espera, reinscribir_en_lote
+from .models import (
+    Alumno, AlumnoMateria, AlumnoMateriaCurso, Carrera, CarreraMateria, CorrelativaClausura, Curso,
+    EstadisticaMateriaCurso, FranjaHoraria, ListaEspera, Materia, MateriaCurso, Profesor, ProfesorMateriaCurso,
+    SemanaAlumno, aporte_estadistico
+)
+from .notas import aplicar_notas, guardar_notas, importar_notas_csv
+from .plan import GrafoCorrelativas, _planes, plan_de
+from .roles import generacion_rol, invalidar_rol, obtener_rol
+from .semana import semana_de
+from .views import MATERIAS_POR_PAGINA, login_profesores
+
+
+# ======================================================
+#   PLANES DE CONSULTA (EXPLAIN QUERY PLAN)
+# ======================================================
+
+# "SCAN tabla" a secas: SQLite recorre la tabla entera. "SCAN tabla USING
+# INDEX" la recorre en el orden del índice, que sólo está bien si la
+# consulta corta con LIMIT (las páginas por clave). "SEARCH", las
+# subconsultas, las filas constantes y la tabla FTS5 no cuentan.
+PATRON_SCAN = re.compile(r'^SCAN (?!CONSTANT ROW)(?!\()(?P<tabla>\S+)(?P<indice> USING (COVERING )?INDEX)?(?!.*VIRTUAL TABLE)')
+
+# Tablas que se recorren enteras a propósito: son chicas (una fila por
+# carrera o curso) y las páginas las listan completas
+TABLAS_PERMITIDAS = {
+    'UTN_carrera',
+    'UTN_curso',
+}
+
+# Consultas que leen todo a propósito
+CONSULTAS_PERMITIDAS = [
+    # Índice de autocompletado: una vez por versión del catálogo (UTN/catalogo.py)
+    re.compile(r'^SELECT "UTN_materia"\."sigla" AS "sigla", "UTN_materia"\."nombre" AS "nombre" FROM "UTN_materia"$'),
+    # Años del plan para el filtro del listado de materias
+    re.compile(r'^SELECT DISTINCT "UTN_carreramateria"\."anio" AS "anio" FROM "UTN_carreramateria" ORDER BY'),
+]
+
+PREFIJOS_EXPLICABLES = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+
+
+def planes_de(consultas):
+    """[(sql, [líneas del plan])] de cada consulta capturada que se puede explicar."""
+    planes = []
+    with connection.cursor() as cursor:
+        for consulta in consultas:
+            sql = consulta['sql']
+            if not sql.lstrip().upper().startswith(PREFIJOS_EXPLICABLES):
+                continue
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            planes.append((sql, [fila[3] for fila in cursor.fetchall()]))
+    return planes
+
+
+def recorridos_completos(planes):
+    """[(sql, línea)] de los planes que recorren una tabla entera."""
+    recorridos = []
+    for sql, lineas in planes:
+        if any(permitida.match(sql) for permitida in CONSULTAS_PERMITIDAS):
+            continue
+        for linea in lineas:
+            encontrado = PATRON_SCAN.match(linea)
+            if not encontrado or encontrado.group('tabla') in TABLAS_PERMITIDAS:
+                continue
+            if encontrado.group('indice') and ' LIMIT ' in sql:
+                continue
+            recorridos.append((sql, linea))
+    return recorridos
+
+
+class PlanesDeConsultaTests(TestCase):
+    """
+    Recorre las vistas como anónimo, alumno, profesor y staff y falla si
+    alguna consulta termina en un recorrido completo de tabla. Los planes
+    de SQLite no dependen de la cantidad de filas (no hay ANALYZE en la
+    base de prueba), así que alcanza con pocos datos.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera = Carrera.objects.create(nombre="Ingeniería en Sistemas de Información", duracion_anios=5)
+        curso = Curso.objects.create(nombre="K1", nivel="1", numero=1)
+
+        prof_user = User.objects.create_user("prof@utn.test", "prof@utn.test", "clave")
+        cls.profesor = Profesor.objects.create(user=prof_user, nombre="Ana", apellido="Paz", email="prof@utn.test")
+
+        materias, cls.cursos = [], []
+        for i in range(12):
+            materia = Materia.objects.create(sigla=f"M{i:02d}", nombre=f"Materia {i}", ciclo_lectivo=1 + i // 4)
+            CarreraMateria.objects.create(carrera=cls.carrera, materia=materia, anio=1 + i // 4)
+            if i >= 4:
+                materia.correlativas_requeridas.add(materias[i - 4])
+            dias = ["Lunes y Miércoles", "Martes y Jueves", "Viernes"][i % 3]
+            hora = 8 + (i % 4) * 2
+            materia_curso = MateriaCurso.objects.create(
+                curso=curso, materia=materia, turno_cursado="manana",
+                horario=f"{dias} {hora:02d}:00-{hora + 2:02d}:00", modulo="1"
+            )
+            if i < 8:
+                ProfesorMateriaCurso.objects.create(profesor=cls.profesor, materia_curso=materia_curso)
+            materias.append(materia)
+            cls.cursos.append(materia_curso)
+
+        alumno_user = User.objects.create_user("alu@utn.test", "alu@utn.test", "clave")
+        cls.alumno = Alumno.objects.create(
+            user=alumno_user, nombre="Juan", apellido="Pérez", dni="1", email="alu@utn.test",
+            anio_universitario=3, carrera=cls.carrera
+        )
+        AlumnoMateriaCurso.objects.create(
+            alumno=cls.alumno, materia_curso=cls.cursos[0], nota_1=8, nota_2=9,
+            nota=9, aprobado=True, finalizado=True
+        )
+        AlumnoMateriaCurso.objects.create(alumno=cls.alumno, materia_curso=cls.cursos[4])
+        AlumnoMateria.objects.create(alumno=cls.alumno, materia=materias[1], aprobado=True)
+        ListaEspera.objects.create(alumno=cls.alumno, materia_curso=cls.cursos[5])
+
+        User.objects.create_user("staff@utn.test", "staff@utn.test", "clave", is_staff=True)
+
+    def setUp(self):
+        # Las cachés (versión del catálogo, páginas de carrera, analítico)
+        # harían que algunas consultas no se ejecuten
+        cache.clear()
+
+    def assertSinRecorridosCompletos(self, urls, metodo='get', datos=None):
+        with CaptureQueriesContext(connection) as contexto:
+            for url in urls:
+                respuesta = getattr(self.client, metodo)(url, datos or {})
+                self.assertLess(respuesta.status_code, 400, url)
+                if respuesta.streaming:
+                    # Las exportaciones consultan recién al leerse
+                    b''.join(respuesta.streaming_content)
+        self.assertConsultasSinRecorridos(contexto.captured_queries)
+
+    def assertConsultasSinRecorridos(self, consultas):
+        recorridos = recorridos_completos(planes_de(consultas))
+        self.assertFalse(
+            recorridos,
+            "Consultas que recorren una tabla entera:\n" + "\n\n".join(
+                f"{linea}\n    {sql}" for sql, linea in recorridos
+            )
+        )
+
+    def test_anonimo(self):
+        self.assertSinRecorridosCompletos([
+            reverse('inicio'),
+            reverse('login'),
+            reverse('register'),
+            reverse('materia_list'),
+            reverse('materia_list') + '?q=materia',
+            reverse('materia_list') + f'?carrera={self.carrera.pk}&anio=2',
+            reverse('materia_list') + '?despues=M03',
+            reverse('materias_autocompletar') + '?q=mat',
+            reverse('carrera_list'),
+            reverse('carrera_detail', args=[self.carrera.pk]),
+            reverse('carrera_plan_json', args=[self.carrera.pk]),
+            reverse('alumno_detail', args=[self.alumno.pk]),
+            reverse('alumno_calendario', args=[self.alumno.pk, firma_calendario(self.alumno.pk)]),
+        ])
+
+    def test_login(self):
+        self.assertSinRecorridosCompletos(
+            [reverse('login')], metodo='post', datos={'email': 'alu@utn.test', 'password': 'clave'}
+        )
+
+    def test_alumno(self):
+        self.client.login(username="alu@utn.test", password="clave")
+        self.assertSinRecorridosCompletos([
+            reverse('post_login_check'),
+            reverse('alumno_detail', args=[self.alumno.pk]),
+            reverse('alumno_analitico', args=[self.alumno.pk]),
+            reverse('alumno_analitico_json', args=[self.alumno.pk]),
+            reverse('alumno_egreso_json', args=[self.alumno.pk]),
+            reverse('materia_reinscripcion', args=[self.alumno.pk]),
+        ])
+
+    def test_reinscripcion(self):
+        self.client.login(username="alu@utn.test", password="clave")
+        self.assertSinRecorridosCompletos(
+            [reverse('materia_reinscribir_lote', args=[self.alumno.pk])],
+            metodo='post', datos={'cursos': [self.cursos[1].pk]}
+        )
+
+    def test_profesor(self):
+        self.client.login(username="prof@utn.test", password="clave")
+        curso = self.cursos[0].pk
+        self.assertSinRecorridosCompletos([
+            reverse('dashboard', args=[self.profesor.pk]),
+            reverse('mis_clases'),
+            reverse('materias_disponibles'),
+            reverse('materias_disponibles') + '?turno=manana',
+            reverse('materias_disponibles') + f'?dia=0&carrera={self.carrera.pk}',
+            reverse('materias_disponibles') + '?turno=manana&despues=M08:9',
+            reverse('cargar_nota', args=[curso]),
+            reverse('exportar_notas_curso', args=[curso]),
+        ])
+
+    def test_reinscripcion_por_materia(self):
+        self.client.login(username="alu@utn.test", password="clave")
+        self.assertSinRecorridosCompletos(
+            [reverse('materia_reinscribir', args=[self.alumno.pk, self.cursos[2].materia_id])],
+            metodo='post', datos={'curso_id': self.cursos[2].pk}
+        )
+
+    def test_cancelar_reinscripcion(self):
+        self.client.login(username="alu@utn.test", password="clave")
+        # Una inscripción (libera la vacante) y una lista de espera
+        self.assertSinRecorridosCompletos([
+            reverse('cancelar_reinscripcion', args=[self.alumno.pk, self.cursos[4].materia_id]),
+            reverse('cancelar_reinscripcion', args=[self.alumno.pk, self.cursos[5].materia_id]),
+        ], metodo='post')
+
+    def test_alumno_abm(self):
+        self.client.login(username="staff@utn.test", password="clave")
+        self.assertSinRecorridosCompletos([
+            reverse('alumno_create'),
+            reverse('alumno_update', args=[self.alumno.pk]),
+        ])
+        self.assertSinRecorridosCompletos(
+            [reverse('alumno_create')], metodo='post',
+            datos={'dni': '2', 'anio_universitario': 1, 'carrera': self.carrera.pk}
+        )
+        self.assertSinRecorridosCompletos(
+            [reverse('alumno_update', args=[self.alumno.pk])], metodo='post',
+            datos={
+                'user': self.alumno.user_id, 'nombre': "Juan", 'apellido': "Pérez", 'dni': "1",
+                'email': "alu@utn.test", 'anio_universitario': 4, 'carrera': self.carrera.pk,
+            }
+        )
+        # La página de confirmación usa las URLs de social-auth, que no
+        # están instaladas: sólo el POST
+        self.assertSinRecorridosCompletos([reverse('alumno_delete', args=[self.alumno.pk])], metodo='post')
+
+    def test_asignacion_de_materias(self):
+        self.client.login(username="prof@utn.test", password="clave")
+        self.assertSinRecorridosCompletos([
+            reverse('asignar_materia_profesor', args=[self.cursos[9].pk]),
+            reverse('desasignar_materia', args=[self.cursos[1].pk]),
+        ], metodo='post')
+
+    def test_login_profesores(self):
+        # No tiene URL propia: se llama directo a la vista
+        request = RequestFactory().post('/', {'email': 'prof@utn.test', 'password': 'clave'})
+        request.user = AnonymousUser()
+        request.session = SessionStore()
+        request._messages = default_storage(request)
+        with CaptureQueriesContext(connection) as contexto:
+            respuesta = login_profesores(request)
+        self.assertEqual(respuesta.status_code, 302)
+        self.assertConsultasSinRecorridos(contexto.captured_queries)
+
+    def test_carga_de_notas(self):
+        self.client.login(username="prof@utn.test", password="clave")
+        inscripcion = AlumnoMateriaCurso.objects.get(materia_curso=self.cursos[4])
+        self.assertSinRecorridosCompletos(
+            [reverse('cargar_nota', args=[self.cursos[4].pk])],
+            metodo='post', datos={f'nota_1_{inscripcion.pk}': '7'}
+        )
+
+    def test_importacion_de_notas(self):
+        self.client.login(username="prof@utn.test", password="clave")
+        archivo = SimpleUploadedFile("notas.csv", b"dni,nota_1,nota_2,nota_3\n1,7,8,9\n", content_type="text/csv")
+        self.assertSinRecorridosCompletos(
+            [reverse('importar_notas', args=[self.cursos[4].pk])], metodo='post', datos={'archivo': archivo}
+        )
+
+    def test_exportaciones_sin_ordenar_en_memoria(self):
+        # Un ORDER BY que los índices no resuelven junta todo el resultado
+        # antes de mandar la primera fila
+        self.client.login(username="staff@utn.test", password="clave")
+        for url in [
+            reverse('exportar_notas_curso', args=[self.cursos[0].pk]),
+            reverse('exportar_notas_carrera', args=[self.carrera.pk]),
+            reverse('exportar_notas_ciclo', args=[1]),
+        ]:
+            with CaptureQueriesContext(connection) as contexto:
+                contenido = b''.join(self.client.get(url).streaming_content)
+            self.assertIn(b'dni,nota_1', contenido)
+            exportacion = [
+                (sql, lineas) for sql, lineas in planes_de(contexto.captured_queries)
+                if '"UTN_alumno"."dni" AS "alumno__dni"' in sql
+            ]
+            self.assertEqual(len(exportacion), 1, url)
+            self.assertFalse([l for l in exportacion[0][1] if 'TEMP B-TREE' in l], url)
+
+    def test_staff(self):
+        self.client.login(username="staff@utn.test", password="clave")
+        self.assertSinRecorridosCompletos([
+            reverse('alumno_analitico_json', args=[self.alumno.pk]),
+            reverse('carrera_egreso_json', args=[self.carrera.pk]) + '?anio=3',
+            reverse('exportar_notas_carrera', args=[self.carrera.pk]),
+            reverse('exportar_notas_ciclo', args=[1]),
+        ])
+
+
+# ======================================================
+#   DATOS DE PRUEBA
+# ======================================================
+
+def crear_carrera_con_materias(cantidad=4):
+    """Carrera con `cantidad` materias de 1° año, sin correlativas."""
+    carrera = Carrera.objects.create(nombre="Ingeniería Civil", duracion_anios=5)
+    materias = []
+    for i in range(cantidad):
+        materia = Materia.objects.create(sigla=f"T{i:02d}", nombre=f"Tema {i}", ciclo_lectivo=1)
+        CarreraMateria.objects.create(carrera=carrera, materia=materia, anio=1)
+        materias.append(materia)
+    return carrera, materias
+
+
+def crear_curso(materia, horario="Lunes 08:00-10:00", cupo=None, profesor=None):
+    curso, _ = Curso.objects.get_or_create(nombre="K1", defaults={'nivel': "1", 'numero': 1})
+    materia_curso = MateriaCurso.objects.create(
+        curso=curso, materia=materia, turno_cursado="manana", horario=horario, modulo="1", cupo=cupo
+    )
+    if profesor is not None:
+        ProfesorMateriaCurso.objects.create(profesor=profesor, materia_curso=materia_curso)
+    return materia_curso
+
+
+def encadenar_correlativas(materias):
+    """
+    Correlativas entre las seis primeras materias:
+    T00 → T01 → T02 → T05, T00 → T03 → T05 y T04 suelta.
+    """
+    t00, t01, t02, t03, _, t05 = materias[:6]
+    t01.correlativas_requeridas.add(t00)
+    t02.correlativas_requeridas.add(t01)
+    t03.correlativas_requeridas.add(t00)
+    t05.correlativas_requeridas.add(t02, t03)
+
+
+def crear_alumno(carrera, numero, anio=1):
+    return Alumno.objects.create(
+        nombre=f"Alumno{numero}", apellido="Prueba", dni=f"T{numero}", email=f"alumno{numero}@utn.test",
+        anio_universitario=anio, carrera=carrera
+    )
+
+
+# ======================================================
+#   VACANTES
+# ======================================================
+
+class VacantesTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, (cls.materia, cls.otra_materia, *_) = crear_carrera_con_materias()
+        cls.alumnos = [crear_alumno(cls.carrera, n) for n in range(3)]
+
+    def test_reservar_vacante_no_supera_el_cupo(self):
+        curso = crear_curso(self.materia, cupo=2)
+
+        self.assertTrue(curso.reservar_vacante())
+        self.assertTrue(curso.reservar_vacante())
+        self.assertFalse(curso.reservar_vacante())
+
+        curso.refresh_from_db()
+        self.assertEqual(curso.inscriptos, 2)
+        self.assertEqual(curso.vacantes_disponibles, 0)
+
+    def test_reservar_varias_vacantes_es_todo_o_nada(self):
+        curso = crear_curso(self.materia, cupo=3)
+        curso.reservar_vacante()
+
+        self.assertFalse(curso.reservar_vacante(3))
+        self.assertTrue(curso.reservar_vacante(2))
+
+        curso.refresh_from_db()
+        self.assertEqual(curso.inscriptos, 3)
+
+    def test_sin_cupo_no_hay_limite(self):
+        curso = crear_curso(self.materia)
+        for _ in range(5):
+            self.assertTrue(curso.reservar_vacante())
+        self.assertIsNone(curso.vacantes_disponibles)
+
+    def test_inscripcion_en_curso_lleno(self):
+        curso = crear_curso(self.materia, cupo=1)
+        AlumnoMateriaCurso.objects.create(alumno=self.alumnos[0], materia_curso=curso)
+
+        with self.assertRaises(ValidationError) as error:
+            AlumnoMateriaCurso.objects.create(alumno=self.alumnos[1], materia_curso=curso)
+
+        self.assertEqual(error.exception.code, 'sin_vacantes')
+        self.assertFalse(AlumnoMateriaCurso.objects.filter(alumno=self.alumnos[1]).exists())
+        curso.refresh_from_db()
+        self.assertEqual(curso.inscriptos, 1)
+
+    def test_borrar_inscripcion_libera_la_vacante(self):
+        curso = crear_curso(self.materia, cupo=1)
+        inscripcion = AlumnoMateriaCurso.objects.create(alumno=self.alumnos[0], materia_curso=curso)
+
+        inscripcion.delete()
+
+        curso.refresh_from_db()
+        self.assertEqual(curso.inscriptos, 0)
+        AlumnoMateriaCurso.objects.create(alumno=self.alumnos[1], materia_curso=curso)
+
+    def test_borrar_desde_queryset_libera_las_vacantes(self):
+        curso = crear_curso(self.materia, cupo=3)
+        for alumno in self.alumnos:
+            AlumnoMateriaCurso.objects.create(alumno=alumno, materia_curso=curso)
+
+        AlumnoMateriaCurso.objects.filter(materia_curso=curso).delete()
+
+        curso.refresh_from_db()
+        self.assertEqual(curso.inscriptos, 0)
+
+    def test_cambio_de_curso_mueve_la_vacante(self):
+        origen = crear_curso(self.materia, cupo=1)
+        destino = crear_curso(self.materia, horario="Martes 08:00-10:00", cupo=1)
+        inscripcion = AlumnoMateriaCurso.objects.create(alumno=self.alumnos[0], materia_curso=origen)
+
+        inscripcion = AlumnoMateriaCurso.objects.get(pk=inscripcion.pk)
+        inscripcion.materia_curso = destino
+        inscripcion.save()
+
+        origen.refresh_from_db()
+        destino.refresh_from_db()
+        self.assertEqual((origen.inscriptos, destino.inscriptos), (0, 1))
+
+    def test_cambio_a_curso_lleno_no_mueve_nada(self):
+        origen = crear_curso(self.materia, cupo=1)
+        destino = crear_curso(self.materia, horario="Martes 08:00-10:00", cupo=1)
+        inscripcion = AlumnoMateriaCurso.objects.create(alumno=self.alumnos[0], materia_curso=origen)
+        AlumnoMateriaCurso.objects.create(alumno=self.alumnos[1], materia_curso=destino)
+
+        inscripcion = AlumnoMateriaCurso.objects.get(pk=inscripcion.pk)
+        inscripcion.materia_curso = destino
+        with self.assertRaises(ValidationError):
+            inscripcion.save()
+
+        origen.refresh_from_db()
+        destino.refresh_from_db()
+        self.assertEqual((origen.inscriptos, destino.inscriptos), (1, 1))
+        self.assertEqual(AlumnoMateriaCurso.objects.get(pk=inscripcion.pk).materia_curso_id, origen.pk)
+
+    def test_guardar_el_curso_no_pisa_el_contador(self):
+        curso = crear_curso(self.materia, cupo=5)
+        viejo = MateriaCurso.objects.get(pk=curso.pk)
+        AlumnoMateriaCurso.objects.create(alumno=self.alumnos[0], materia_curso=curso)
+
+        # `viejo` todavía tiene inscriptos=0
+        viejo.modulo = "2"
+        viejo.save()
+
+        curso.refresh_from_db()
+        self.assertEqual(curso.inscriptos, 1)
+        self.assertEqual(curso.modulo, "2")
+
+
+# ======================================================
+#   LISTA DE ESPERA
+# ======================================================
+
+class ListaEsperaTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, (cls.materia, cls.correlativa, cls.otra_materia, _) = crear_carrera_con_materias()
+        cls.alumnos = [crear_alumno(cls.carrera, n) for n in range(3)]
+
+    def esperando(self, curso):
+        return list(ListaEspera.objects.filter(materia_curso=curso).values_list('alumno_id', flat=True))
+
+    def inscriptos_en(self, curso):
+        return set(AlumnoMateriaCurso.objects.filter(materia_curso=curso).values_list('alumno_id', flat=True))
+
+    def test_promueve_por_orden_de_llegada(self):
+        curso = crear_curso(self.materia, cupo=1)
+        for alumno in self.alumnos:
+            anotar_en_lista_espera(alumno, curso)
+        # El último en anotarse llegó primero: manda fecha_alta, no el id
+        ListaEspera.objects.filter(alumno=self.alumnos[2]).update(fecha_alta=timezone.now() - timedelta(hours=1))
+
+        promovidas = promover_lista_espera(curso)
+
+        self.assertEqual([i.alumno_id for i in promovidas], [self.alumnos[2].pk])
+        self.assertEqual(self.esperando(curso), [self.alumnos[0].pk, self.alumnos[1].pk])
+        curso.refresh_from_db()
+        self.assertEqual(curso.inscriptos, 1)
+
+    def test_saltea_a_quien_no_tiene_las_correlativas(self):
+        self.materia.correlativas_requeridas.add(self.correlativa)
+        aprobada = crear_curso(self.correlativa, horario="Sábado 08:00-10:00")
+        AlumnoMateriaCurso.objects.create(
+            alumno=self.alumnos[1], materia_curso=aprobada, nota_1=8, nota_2=8, nota_3=8
+        )
+        curso = crear_curso(self.materia, cupo=1)
+        anotar_en_lista_espera(self.alumnos[0], curso)
+        anotar_en_lista_espera(self.alumnos[1], curso)
+
+        promover_lista_espera(curso)
+
+        self.assertEqual(self.inscriptos_en(curso), {self.alumnos[1].pk})
+        # Sigue primero en la cola para una próxima vacante
+        self.assertEqual(self.esperando(curso), [self.alumnos[0].pk])
+
+    def test_saltea_a_quien_se_le_superpone_el_horario(self):
+        ocupado = crear_curso(self.otra_materia, horario="Lunes 09:00-11:00")
+        AlumnoMateriaCurso.objects.create(alumno=self.alumnos[0], materia_curso=ocupado)
+        curso = crear_curso(self.materia, horario="Lunes 08:00-10:00", cupo=1)
+        anotar_en_lista_espera(self.alumnos[0], curso)
+        anotar_en_lista_espera(self.alumnos[1], curso)
+
+        promover_lista_espera(curso)
+
+        self.assertEqual(self.inscriptos_en(curso), {self.alumnos[1].pk})
+        self.assertEqual(self.esperando(curso), [self.alumnos[0].pk])
+
+    def test_quita_de_la_cola_a_quien_ya_se_inscribio_en_otra_comision(self):
+        otra_comision = crear_curso(self.materia, horario="Viernes 08:00-10:00")
+        AlumnoMateriaCurso.objects.create(alumno=self.alumnos[0], materia_curso=otra_comision)
+        curso = crear_curso(self.materia, cupo=1)
+        anotar_en_lista_espera(self.alumnos[0], curso)
+        anotar_en_lista_espera(self.alumnos[1], curso)
+
+        promover_lista_espera(curso)
+
+        self.assertEqual(self.inscriptos_en(curso), {self.alumnos[1].pk})
+        self.assertEqual(self.esperando(curso), [])
+
+    def test_cancelar_reinscripcion_promueve_al_primero(self):
+        curso = crear_curso(self.materia, cupo=1)
+        AlumnoMateriaCurso.objects.create(alumno=self.alumnos[0], materia_curso=curso)
+        anotar_en_lista_espera(self.alumnos[1], curso)
+        anotar_en_lista_espera(self.alumnos[2], curso)
+
+        self.client.post(reverse('cancelar_reinscripcion', args=[self.alumnos[0].pk, self.materia.sigla]))
+
+        self.assertEqual(self.inscriptos_en(curso), {self.alumnos[1].pk})
+        self.assertEqual(self.esperando(curso), [self.alumnos[2].pk])
+        curso.refresh_from_db()
+        self.assertEqual(curso.inscriptos, 1)
+
+    def test_ampliar_el_cupo_promueve_la_cola(self):
+        curso = crear_curso(self.materia, cupo=1)
+        AlumnoMateriaCurso.objects.create(alumno=self.alumnos[0], materia_curso=curso)
+        anotar_en_lista_espera(self.alumnos[1], curso)
+        anotar_en_lista_espera(self.alumnos[2], curso)
+
+        curso = MateriaCurso.objects.get(pk=curso.pk)
+        curso.cupo = 2
+        curso.save()
+
+        self.assertEqual(self.inscriptos_en(curso), {self.alumnos[0].pk, self.alumnos[1].pk})
+        self.assertEqual(self.esperando(curso), [self.alumnos[2].pk])
+        curso.refresh_from_db()
+        self.assertEqual(curso.inscriptos, 2)
+
+
+# ======================================================
+#   REINSCRIPCIÓN POR LOTE
+# ======================================================
+
+class ReinscripcionEnLoteTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, cls.materias = crear_carrera_con_materias()
+        cls.profesor = Profesor.objects.create(nombre="Ana", apellido="Paz", email="ana@utn.test")
+        cls.alumno = crear_alumno(cls.carrera, 0)
+        cls.otro_alumno = crear_alumno(cls.carrera, 1)
+
+    def curso(self, materia, horario, cupo=None):
+        return crear_curso(materia, horario=horario, cupo=cupo, profesor=self.profesor)
+
+    def assertNadaCreado(self, *cursos):
+        self.assertFalse(AlumnoMateriaCurso.objects.filter(alumno=self.alumno).exists())
+        for curso in cursos:
+            curso.refresh_from_db()
+            self.assertEqual(curso.inscriptos, AlumnoMateriaCurso.objects.filter(materia_curso=curso).count())
+
+    def test_inscribe_en_todos(self):
+        cursos = [
+            self.curso(self.materias[0], "Lunes 08:00-10:00", cupo=5),
+            self.curso(self.materias[1], "Martes 08:00-10:00", cupo=5),
+        ]
+
+        nuevas = reinscribir_en_lote(self.alumno, [c.pk for c in cursos])
+
+        self.assertEqual({i.materia_curso_id for i in nuevas}, {c.pk for c in cursos})
+        for curso in cursos:
+            curso.refresh_from_db()
+            self.assertEqual(curso.inscriptos, 1)
+
+    def test_sin_vacantes_en_uno_no_inscribe_en_ninguno(self):
+        libre = self.curso(self.materias[0], "Lunes 08:00-10:00", cupo=5)
+        lleno = self.curso(self.materias[1], "Martes 08:00-10:00", cupo=1)
+        AlumnoMateriaCurso.objects.create(alumno=self.otro_alumno, materia_curso=lleno)
+
+        with self.assertRaises(ValidationError):
+            reinscribir_en_lote(self.alumno, [libre.pk, lleno.pk])
+
+        # La vacante que llegó a reservarse en `libre` se devuelve
+        self.assertNadaCreado(libre, lleno)
+
+    def test_superposicion_entre_los_elegidos(self):
+        cursos = [
+            self.curso(self.materias[0], "Lunes 08:00-10:00"),
+            self.curso(self.materias[1], "Lunes 09:00-11:00"),
+        ]
+
+        with self.assertRaises(ValidationError) as error:
+            reinscribir_en_lote(self.alumno, [c.pk for c in cursos])
+
+        self.assertIn("se superponen", error.exception.messages[0])
+        self.assertNadaCreado(*cursos)
+
+    def test_correlativa_faltante(self):
+        self.materias[1].correlativas_requeridas.add(self.materias[0])
+        cursos = [
+            self.curso(self.materias[1], "Martes 08:00-10:00"),
+            self.curso(self.materias[2], "Miércoles 08:00-10:00"),
+        ]
+
+        with self.assertRaises(ValidationError) as error:
+            reinscribir_en_lote(self.alumno, [c.pk for c in cursos])
+
+        self.assertEqual(len(error.exception.messages), 1)
+        self.assertNadaCreado(*cursos)
+
+    def test_dos_comisiones_de_la_misma_materia(self):
+        cursos = [
+            self.curso(self.materias[0], "Lunes 08:00-10:00"),
+            self.curso(self.materias[0], "Martes 08:00-10:00"),
+        ]
+
+        with self.assertRaises(ValidationError):
+            reinscribir_en_lote(self.alumno, [c.pk for c in cursos])
+
+        self.assertNadaCreado(*cursos)
+
+    def test_curso_sin_profesor(self):
+        con_profesor = self.curso(self.materias[0], "Lunes 08:00-10:00")
+        sin_profesor = crear_curso(self.materias[1], horario="Martes 08:00-10:00")
+
+        with self.assertRaises(ValidationError):
+            reinscribir_en_lote(self.alumno, [con_profesor.pk, sin_profesor.pk])
+
+        self.assertNadaCreado(con_profesor, sin_profesor)
+
+
+# ======================================================
+#   PERMISOS SOBRE LAS NOTAS DE UN CURSO
+# ======================================================
+
+class PermisosNotasTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, (materia, *_) = crear_carrera_con_materias()
+        profesor = Profesor.objects.create(
+            user=User.objects.create_user("prof@utn.test", "prof@utn.test", "clave"),
+            nombre="Ana", apellido="Paz", email="prof@utn.test"
+        )
+        Profesor.objects.create(
+            user=User.objects.create_user("otro@utn.test", "otro@utn.test", "clave"),
+            nombre="Luis", apellido="Sol", email="otro@utn.test"
+        )
+        cls.curso = crear_curso(materia, profesor=profesor)
+        alumno = crear_alumno(cls.carrera, 0)
+        alumno.user = User.objects.create_user("alu@utn.test", "alu@utn.test", "clave")
+        alumno.save()
+        cls.inscripcion = AlumnoMateriaCurso.objects.create(alumno=alumno, materia_curso=cls.curso)
+        User.objects.create_user("staff@utn.test", "staff@utn.test", "clave", is_staff=True)
+
+    def importar(self, usuario):
+        self.client.login(username=usuario, password="clave")
+        archivo = SimpleUploadedFile("notas.csv", b"dni,nota_1,nota_2,nota_3\nT0,9,9,9\n", content_type="text/csv")
+        return self.client.post(reverse('importar_notas', args=[self.curso.pk]), {'archivo': archivo})
+
+    def nota_1(self):
+        return AlumnoMateriaCurso.objects.get(pk=self.inscripcion.pk).nota_1
+
+    def test_importar_como_profesor_del_curso(self):
+        self.assertEqual(self.importar("prof@utn.test").status_code, 200)
+        self.assertEqual(self.nota_1(), 9)
+
+    def test_importar_como_staff(self):
+        self.assertEqual(self.importar("staff@utn.test").status_code, 200)
+        self.assertEqual(self.nota_1(), 9)
+
+    def test_importar_como_profesor_de_otro_curso(self):
+        self.assertEqual(self.importar("otro@utn.test").status_code, 404)
+        self.assertIsNone(self.nota_1())
+
+    def test_importar_como_alumno(self):
+        self.assertRedirects(self.importar("alu@utn.test"), reverse('login'), fetch_redirect_response=False)
+        self.assertIsNone(self.nota_1())
+
+    def exportar(self, usuario):
+        self.client.login(username=usuario, password="clave")
+        return self.client.get(reverse('exportar_notas_curso', args=[self.curso.pk]))
+
+    def test_exportar_como_profesor_del_curso_o_staff(self):
+        for usuario in ("prof@utn.test", "staff@utn.test"):
+            respuesta = self.exportar(usuario)
+            self.assertEqual(respuesta.status_code, 200, usuario)
+            self.assertIn(b"T0", b"".join(respuesta.streaming_content))
+
+    def test_exportar_como_profesor_de_otro_curso(self):
+        self.assertEqual(self.exportar("otro@utn.test").status_code, 404)
+
+    def test_exportar_como_alumno(self):
+        self.assertRedirects(self.exportar("alu@utn.test"), reverse('login'), fetch_redirect_response=False)
+
+    def cargar(self, usuario):
+        self.client.login(username=usuario, password="clave")
+        return self.client.post(
+            reverse('cargar_nota', args=[self.curso.pk]), {f'nota_1_{self.inscripcion.pk}': '9'}
+        )
+
+    def test_cargar_como_profesor_del_curso(self):
+        self.assertRedirects(self.cargar("prof@utn.test"), reverse('mis_clases'), fetch_redirect_response=False)
+        self.assertEqual(self.nota_1(), 9)
+
+    def test_cargar_como_profesor_de_otro_curso(self):
+        self.assertEqual(self.cargar("otro@utn.test").status_code, 404)
+        self.assertIsNone(self.nota_1())
+
+    def test_cargar_como_alumno(self):
+        self.assertRedirects(self.cargar("alu@utn.test"), reverse('login'), fetch_redirect_response=False)
+        self.assertIsNone(self.nota_1())
+
+
+# ======================================================
+#   CARGA DE NOTAS (PLANILLA)
+# ======================================================
+
+class CargaDeNotasTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, (materia, *_) = crear_carrera_con_materias()
+        profesor = Profesor.objects.create(
+            user=User.objects.create_user("prof@utn.test", "prof@utn.test", "clave"),
+            nombre="Ana", apellido="Paz", email="prof@utn.test"
+        )
+        cls.curso = crear_curso(materia, profesor=profesor)
+        cls.inscripciones = [
+            AlumnoMateriaCurso.objects.create(alumno=crear_alumno(cls.carrera, n), materia_curso=cls.curso)
+            for n in range(3)
+        ]
+
+    def setUp(self):
+        self.client.login(username="prof@utn.test", password="clave")
+
+    def cargar(self, planilla):
+        datos = {
+            f'nota_{n}_{ins.pk}': str(nota)
+            for ins, notas in zip(self.inscripciones, planilla)
+            for n, nota in enumerate(notas, start=1)
+        }
+        with CaptureQueriesContext(connection) as contexto:
+            respuesta = self.client.post(reverse('cargar_nota', args=[self.curso.pk]), datos)
+        updates = [q['sql'] for q in contexto.captured_queries if q['sql'].startswith('UPDATE "UTN_alumnomateriacurso"')]
+        return respuesta, updates
+
+    def guardadas(self):
+        return list(
+            AlumnoMateriaCurso.objects.filter(materia_curso=self.curso).order_by('pk').values_list(
+                'nota_1', 'nota_2', 'nota_3', 'promedio', 'nota', 'aprobado', 'finalizado'
+            )
+        )
+
+    def mensajes(self, respuesta):
+        return [str(m) for m in get_messages(respuesta.wsgi_request)]
+
+    def test_planilla_calcula_el_resultado_y_resume(self):
+        planilla = [(8, 9, 10), (2, 3, 4), (7, '', '')]
+        respuesta, updates = self.cargar(planilla)
+
+        self.assertRedirects(respuesta, reverse('mis_clases'), fetch_redirect_response=False)
+        # Las tres filas en un solo UPDATE
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.guardadas(), [
+            (8, 9, 10, 9.0, 9, True, True),
+            (2, 3, 4, 3.0, 3, False, True),
+            (7, None, None, None, None, False, False),
+        ])
+        self.assertEqual(self.mensajes(respuesta), [
+            "Tema 0: se actualizaron 3 alumno(s). Aprobados: 1 · Desaprobados: 1 · Pendientes: 1."
+        ])
+
+        # La misma planilla otra vez no escribe nada
+        respuesta, updates = self.cargar(planilla)
+        self.assertEqual(updates, [])
+        self.assertIn("se actualizaron 0 alumno(s)", self.mensajes(respuesta)[-1])
+
+    def test_un_valor_invalido_no_guarda_ninguna_fila(self):
+        for invalido in ('11', '-1', 'siete'):
+            respuesta, updates = self.cargar([(8, 8, 8), (invalido, 5, 5), (6, 6, 6)])
+
+            self.assertEqual(respuesta.status_code, 400, invalido)
+            self.assertEqual(updates, [])
+            self.assertEqual(self.guardadas(), [(None, None, None, None, None, False, False)] * 3)
+            mensaje, = self.mensajes(respuesta)
+            self.assertIn("No se guardó ninguna nota", mensaje)
+            self.assertIn("Prueba, Alumno1", mensaje)
+
+# ======================================================
+#   IMPORTACIÓN DE NOTAS (CSV)
+# ======================================================
+
+class ImportacionNotasTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, (materia, otra, *_) = crear_carrera_con_materias()
+        cls.curso = crear_curso(materia)
+        for n in range(4):
+            AlumnoMateriaCurso.objects.create(alumno=crear_alumno(cls.carrera, n), materia_curso=cls.curso)
+        # T9 existe pero cursa otra materia
+        AlumnoMateriaCurso.objects.create(alumno=crear_alumno(cls.carrera, 9), materia_curso=crear_curso(otra))
+
+    def importar(self, texto, **kwargs):
+        return importar_notas_csv(self.curso, BytesIO(texto.encode('utf-8')), **kwargs)
+
+    def notas(self, dni):
+        return AlumnoMateriaCurso.objects.filter(alumno__dni=dni).values_list(
+            'nota_1', 'nota_2', 'nota_3', 'nota', 'aprobado', 'finalizado'
+        ).get()
+
+    def errores(self, resultado):
+        return [(e['fila'], e['dni'], e['mensaje']) for e in resultado['errores']]
+
+    def test_busca_por_dni(self):
+        resultado = self.importar(
+            "\ufeffDNI,Nota_1,Nota_2,Nota_3\n"
+            " T2 ,4,5,6\n"
+            "T0,8,9,10\n"
+        )
+        self.assertEqual((resultado['filas'], resultado['actualizadas'], resultado['total_errores']), (2, 2, 0))
+        self.assertEqual(self.notas("T0"), (8, 9, 10, 9, True, True))
+        self.assertEqual(self.notas("T2"), (4, 5, 6, 5, False, True))
+        self.assertEqual(self.notas("T1"), (None, None, None, None, False, False))
+
+    def test_filas_invalidas_se_informan_y_no_frenan_el_resto(self):
+        resultado = self.importar(
+            "dni,nota_1,nota_2,nota_3\n"
+            "T0,11,5,5\n"
+            "T1,siete,5,5\n"
+            ",5,5,5\n"
+            "T404,5,5,5\n"
+            "T9,5,5,5\n"
+            "T3,6,6,6\n"
+        )
+        self.assertEqual(self.errores(resultado), [
+            (2, "T0", "Las notas deben ser enteros de 0 a 10."),
+            (3, "T1", "Las notas deben ser enteros de 0 a 10."),
+            (4, "", "Falta el DNI."),
+            (5, "T404", "No hay un alumno con ese DNI inscripto en este curso."),
+            (6, "T9", "No hay un alumno con ese DNI inscripto en este curso."),
+        ])
+        self.assertEqual(resultado['actualizadas'], 1)
+        self.assertEqual(self.notas("T3"), (6, 6, 6, 6, True, True))
+        self.assertEqual(self.notas("T0")[0], None)
+        self.assertEqual(self.notas("T9")[0], None)
+
+    def test_dni_repetido(self):
+        # También entre lotes distintos
+        resultado = self.importar(
+            "dni,nota_1,nota_2,nota_3\nT0,7,7,7\nT1,5,5,5\nT0,2,2,2\n", tamanio_lote=2
+        )
+        self.assertEqual(self.errores(resultado), [(4, "T0", "DNI repetido en el archivo.")])
+        self.assertEqual(self.notas("T0")[:3], (7, 7, 7))
+
+    def test_sin_cambios(self):
+        self.importar("dni,nota_1,nota_2,nota_3\nT0,7,7,7\n")
+        resultado = self.importar("dni,nota_1,nota_2,nota_3\nT0,7,7,7\nT1,,,\n")
+        self.assertEqual((resultado['actualizadas'], resultado['sin_cambios']), (0, 2))
+
+    def test_faltan_columnas(self):
+        resultado = self.importar("dni,nota_1,nota_3\nT0,7,7\n")
+        self.assertEqual(self.errores(resultado), [(1, "", "Faltan columnas en el encabezado: nota_2.")])
+        self.assertEqual(resultado['filas'], 0)
+        self.assertEqual(self.notas("T0")[0], None)
+
+# ======================================================
+#   ESTADÍSTICAS POR CURSO
+# ======================================================
+
+class EstadisticasTests(TestCase):
+    """Lo mantenido con incrementos tiene que coincidir con recalcular desde cero."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, (materia, *_) = crear_carrera_con_materias()
+        cls.curso = crear_curso(materia)
+        cls.otro_curso = crear_curso(materia, horario="Martes 08:00-10:00")
+        cls.alumnos = [crear_alumno(cls.carrera, n) for n in range(4)]
+
+    def assertCoincideConRecalculo(self, *cursos):
+        for curso in cursos:
+            esperado = {campo: 0 for campo in CAMPOS_ESTADISTICA}
+            for valores in agregados_por_curso(AlumnoMateriaCurso.objects.filter(materia_curso=curso)):
+                valores.pop('materia_curso')
+                esperado.update(valores)
+            guardado = EstadisticaMateriaCurso.objects.filter(materia_curso=curso).values(*CAMPOS_ESTADISTICA).first()
+            self.assertEqual(guardado or dict.fromkeys(CAMPOS_ESTADISTICA, 0), esperado)
+
+    def inscribir(self, alumno, curso=None, notas=(None, None, None)):
+        nota_1, nota_2, nota_3 = notas
+        return AlumnoMateriaCurso.objects.create(
+            alumno=alumno, materia_curso=curso or self.curso, nota_1=nota_1, nota_2=nota_2, nota_3=nota_3
+        )
+
+    def test_altas_notas_y_bajas(self):
+        self.inscribir(self.alumnos[0], notas=(8, 9, 10))
+        self.inscribir(self.alumnos[1], notas=(2, 3, 4))
+        pendiente = self.inscribir(self.alumnos[2])
+        self.assertCoincideConRecalculo(self.curso)
+
+        estadistica = EstadisticaMateriaCurso.objects.get(materia_curso=self.curso)
+        self.assertEqual((estadistica.inscriptos, estadistica.calificados, estadistica.aprobados), (3, 2, 1))
+        self.assertEqual((estadistica.hist_9, estadistica.hist_3), (1, 1))
+
+        pendiente = AlumnoMateriaCurso.objects.get(pk=pendiente.pk)
+        pendiente.nota_1, pendiente.nota_2, pendiente.nota_3 = 6, 6, 7
+        pendiente.save()
+        self.assertCoincideConRecalculo(self.curso)
+
+        AlumnoMateriaCurso.objects.get(alumno=self.alumnos[1]).delete()
+        self.assertCoincideConRecalculo(self.curso)
+
+    def test_cambio_de_curso(self):
+        inscripcion = self.inscribir(self.alumnos[0], notas=(7, 7, 7))
+
+        inscripcion = AlumnoMateriaCurso.objects.get(pk=inscripcion.pk)
+        inscripcion.materia_curso = self.otro_curso
+        inscripcion.save()
+
+        self.assertCoincideConRecalculo(self.curso, self.otro_curso)
+
+    def test_carga_por_lote(self):
+        for alumno in self.alumnos:
+            self.inscribir(alumno)
+        inscripciones = list(AlumnoMateriaCurso.objects.filter(materia_curso=self.curso))
+
+        modificadas = [ins for n, ins in enumerate(inscripciones) if aplicar_notas(ins, n + 4, 6, 8)]
+        guardar_notas(modificadas)
+        self.assertCoincideConRecalculo(self.curso)
+
+        # Volver a cargar lo mismo no cambia nada
+        recargadas = list(AlumnoMateriaCurso.objects.filter(materia_curso=self.curso))
+        self.assertFalse([ins for n, ins in enumerate(recargadas) if aplicar_notas(ins, n + 4, 6, 8)])
+
+        corregida = recargadas[0]
+        aplicar_notas(corregida, 10, 10, 10)
+        guardar_notas([corregida])
+        self.assertCoincideConRecalculo(self.curso)
+
+    def test_fila_finalizada_sin_notas(self):
+        inscripcion = self.inscribir(self.alumnos[0])
+        # Escrita por fuera de save(): finalizada pero sin notas
+        AlumnoMateriaCurso.objects.filter(pk=inscripcion.pk).update(finalizado=True, nota_2=None)
+        recalcular_estadisticas([self.curso.pk])
+
+        inscripcion = AlumnoMateriaCurso.objects.get(pk=inscripcion.pk)
+        self.assertEqual(aporte_estadistico(inscripcion), (self.curso.pk, True, False, 0, None))
+
+        inscripcion.nota_1, inscripcion.nota_2, inscripcion.nota_3 = 9, 9, 9
+        inscripcion.save()
+        self.assertCoincideConRecalculo(self.curso)
+
+        inscripcion.delete()
+        self.assertCoincideConRecalculo(self.curso)
+
+
+# ======================================================
+#   ROL DEL USUARIO EN SESIÓN
+# ======================================================
+
+class RolTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, _ = crear_carrera_con_materias(1)
+        cls.user = User.objects.create_user("rol@utn.test", "rol@utn.test", "clave")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_la_generacion_queda_en_la_base(self):
+        self.assertEqual(generacion_rol(self.user.pk), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidar_rol(self.user.pk)
+        self.assertEqual(generacion_rol(self.user.pk), 1)
+
+        # Otro proceso, con su propia caché, lee la misma generación
+        cache.clear()
+        self.assertEqual(generacion_rol(self.user.pk), 1)
+
+    def test_vincular_un_alumno_cambia_el_rol_guardado(self):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        request.session = SessionStore()
+        self.assertFalse(obtener_rol(request).es_alumno)
+
+        alumno = crear_alumno(self.carrera, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            alumno.user = self.user
+            alumno.save()
+        # Aunque la caché no sea compartida la sesión guardada se descarta
+        cache.clear()
+
+        self.assertEqual(obtener_rol(request).alumno_id, alumno.pk)
+
+
+# ======================================================
+#   CLAUSURA DE CORRELATIVAS
+# ======================================================
+
+class ClausuraCorrelativasTests(TestCase):
+    """Lo que mantienen las señales tiene que coincidir con calcular_clausura()."""
+
+    def setUp(self):
+        # a <- b <- c <- d: para cursar d hay que tener c, b y a
+        _, (self.a, self.b, self.c, self.d, self.e) = crear_carrera_con_materias(5)
+        self.b.correlativas_requeridas.add(self.a)
+        self.c.correlativas_requeridas.add(self.b)
+        self.d.correlativas_requeridas.add(self.c)
+
+    def assertClausuraAlDia(self):
+        aristas = Materia.correlativas_requeridas.through.objects.values_list('from_materia_id', 'to_materia_id')
+        guardada = {
+            (ancestro, descendiente): profundidad
+            for ancestro, descendiente, profundidad in CorrelativaClausura.objects.values_list(
+                'ancestro_id', 'descendiente_id', 'profundidad'
+            )
+        }
+        self.assertEqual(guardada, calcular_clausura(aristas))
+
+    def profundidad(self, ancestro, descendiente):
+        return CorrelativaClausura.objects.get(ancestro=ancestro, descendiente=descendiente).profundidad
+
+    def test_agregar(self):
+        self.assertClausuraAlDia()
+        self.assertEqual(self.profundidad(self.a, self.d), 3)
+
+        # Un atajo acorta el camino guardado
+        self.d.correlativas_requeridas.add(self.a)
+        self.assertClausuraAlDia()
+        self.assertEqual(self.profundidad(self.a, self.d), 1)
+
+    def test_agregar_desde_la_requerida(self):
+        self.d.materias_que_la_requieren.add(self.e)
+        self.assertClausuraAlDia()
+        self.assertEqual(self.profundidad(self.a, self.e), 4)
+
+    def test_quitar(self):
+        self.c.correlativas_requeridas.remove(self.b)
+        self.assertClausuraAlDia()
+        self.assertFalse(CorrelativaClausura.objects.filter(ancestro=self.a, descendiente=self.d).exists())
+
+    def test_quitar_desde_la_requerida(self):
+        self.b.materias_que_la_requieren.remove(self.c)
+        self.assertClausuraAlDia()
+        self.assertFalse(CorrelativaClausura.objects.filter(ancestro=self.b, descendiente=self.d).exists())
+
+    def test_vaciar(self):
+        self.d.correlativas_requeridas.add(self.a)
+        self.c.correlativas_requeridas.clear()
+        self.assertClausuraAlDia()
+        # d sigue requiriendo a por el atajo directo
+        self.assertEqual(self.profundidad(self.a, self.d), 1)
+
+    def test_vaciar_desde_la_requerida(self):
+        self.e.correlativas_requeridas.add(self.b)
+        self.b.materias_que_la_requieren.clear()
+        self.assertClausuraAlDia()
+        self.assertFalse(CorrelativaClausura.objects.filter(ancestro=self.b).exists())
+
+    def test_borrar_materia(self):
+        self.b.delete()
+        self.assertClausuraAlDia()
+        self.assertFalse(CorrelativaClausura.objects.filter(ancestro=self.a).exists())
+
+    def test_reconstruir(self):
+        # Filas escritas por fuera de las señales
+        Materia.correlativas_requeridas.through.objects.create(from_materia=self.e, to_materia=self.d)
+        CorrelativaClausura.objects.filter(descendiente=self.c).delete()
+
+        call_command('reconstruir_correlativas', stdout=StringIO())
+        self.assertClausuraAlDia()
+
+    def test_ciclo(self):
+        # add() no abre un savepoint: cada intento va en su propia transacción
+        for agregar in [
+            lambda: self.a.correlativas_requeridas.add(self.d),
+            lambda: self.d.materias_que_la_requieren.add(self.b),
+            lambda: self.a.correlativas_requeridas.add(self.a),
+        ]:
+            with self.assertRaises(ValidationError), transaction.atomic():
+                agregar()
+        self.assertFalse(self.a.correlativas_requeridas.exists())
+        self.assertClausuraAlDia()
+
+
+# ======================================================
+#   FRANJAS HORARIAS
+# ======================================================
+
+class FranjasHorariasTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        _, (cls.materia, *_) = crear_carrera_con_materias(1)
+
+    def test_horario_valido(self):
+        curso = crear_curso(self.materia, horario="Lunes y Miércoles 08:00-10:00")
+        self.assertEqual(
+            list(curso.franjas.values_list('dia', 'inicio', 'fin')),
+            [(0, 480, 600), (2, 480, 600)]
+        )
+
+    def test_horario_ilegible(self):
+        with self.assertLogs('UTN.models', 'WARNING') as registro:
+            curso = crear_curso(self.materia, horario="Lun 8 a 10")
+        self.assertFalse(curso.franjas.exists())
+        self.assertIn(str(curso.pk), registro.output[0])
+
+        with self.assertRaises(ValidationError) as error:
+            curso.full_clean()
+        self.assertIn('horario', error.exception.message_dict)
+
+    def test_migracion_informa_los_salteados(self):
+        migracion = import_module('UTN.migrations.0019_franjahoraria')
+        valido = crear_curso(self.materia)
+        with self.assertLogs('UTN.models', 'WARNING'):
+            ilegible = crear_curso(self.materia, horario="a definir")
+        FranjaHoraria.objects.all().delete()
+
+        with self.assertLogs('UTN.migrations', 'WARNING') as registro:
+            migracion.poblar_franjas(django_apps, None)
+        self.assertTrue(valido.franjas.exists())
+        self.assertIn(f"{ilegible.pk} ('a definir')", registro.output[0])
+
+
+# ======================================================
+#   BÚSQUEDA DE TEXTO COMPLETO
+# ======================================================
+
+class BusquedaTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fisica = Materia.objects.create(sigla="FIS1", nombre="Física I", ciclo_lectivo=1)
+        cls.analisis = Materia.objects.create(sigla="AM1", nombre="Análisis Matemático I", ciclo_lectivo=1)
+        cls.sistemas = Carrera.objects.create(nombre="Ingeniería en Sistemas de Información", duracion_anios=5)
+        cls.licenciatura = Carrera.objects.create(nombre="Licenciatura en Administración Rural", duracion_anios=4)
+
+    def materias(self, texto):
+        return list(filtrar_por_texto(Materia.objects.all(), texto).values_list('sigla', flat=True))
+
+    def carreras(self, texto):
+        return list(filtrar_por_texto(Carrera.objects.all(), texto))
+
+    def test_sin_acentos_ni_mayusculas(self):
+        self.assertEqual(self.materias("fisica"), ["FIS1"])
+        self.assertEqual(self.materias("ANALISIS matem"), ["AM1"])
+        self.assertEqual(self.carreras("ingenieria"), [self.sistemas])
+        self.assertEqual(self.carreras("administracion"), [self.licenciatura])
+
+    def test_prefijos_y_sigla(self):
+        self.assertEqual(self.materias("fis"), ["FIS1"])
+        self.assertEqual(self.materias("am1"), ["AM1"])
+        self.assertEqual(self.carreras("ing sist"), [self.sistemas])
+        self.assertEqual(self.materias("química"), [])
+
+    def test_sintaxis_fts_no_rompe(self):
+        # Comillas, paréntesis y operadores se toman como texto
+        self.assertEqual(self.materias('"fisica" ('), ["FIS1"])
+        self.assertEqual(self.materias('fisica OR analisis'), [])
+        # Sin palabras no hay consulta FTS: queda el filtro de texto
+        self.assertEqual(self.materias("*"), [])
+
+    def test_alta_cambio_y_baja(self):
+        quimica = Materia.objects.create(sigla="QUI", nombre="Química General", ciclo_lectivo=1)
+        self.assertEqual(self.materias("quimica"), ["QUI"])
+
+        quimica.nombre = "Química Aplicada"
+        quimica.save()
+        self.assertEqual(self.materias("general"), [])
+        self.assertEqual(self.materias("aplicada"), ["QUI"])
+
+        quimica.delete()
+        self.assertEqual(self.materias("quimica"), [])
+
+        self.sistemas.nombre = "Ingeniería Electrónica"
+        self.sistemas.save()
+        self.assertEqual(self.carreras("sistemas"), [])
+        self.assertEqual(self.carreras("electronica"), [self.sistemas])
+        self.sistemas.delete()
+        self.assertEqual(self.carreras("ingenieria"), [])
+
+    def test_sin_indice_usa_icontains(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE UTN_busqueda")
+        # icontains distingue acentos: "fisica" ya no encuentra "Física"
+        self.assertEqual(self.materias("Físi"), ["FIS1"])
+        self.assertEqual(self.materias("fis1"), ["FIS1"])
+        self.assertEqual(self.materias("fisica"), [])
+        self.assertEqual(self.carreras("Ingeniería"), [self.sistemas])
+
+
+# ======================================================
+#   CALENDARIO DEL ALUMNO (.ics)
+# ======================================================
+
+class CalendarioTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, (cls.materia, cls.otra, *_) = crear_carrera_con_materias()
+        cls.alumno = crear_alumno(cls.carrera, 0)
+        AlumnoMateriaCurso.objects.create(alumno=cls.alumno, materia_curso=crear_curso(cls.materia))
+
+    def setUp(self):
+        self.url = reverse('alumno_calendario', args=[self.alumno.pk, firma_calendario(self.alumno.pk)])
+
+    def test_feed(self):
+        respuesta = self.client.get(self.url)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta['Content-Type'], 'text/calendar; charset=utf-8')
+        self.assertIn(b'BEGIN:VCALENDAR', respuesta.content)
+        self.assertIn(b'Tema 0', respuesta.content)
+        self.assertTrue(respuesta.has_header('ETag'))
+        self.assertTrue(respuesta.has_header('Last-Modified'))
+
+    def test_no_modificado(self):
+        respuesta = self.client.get(self.url)
+
+        # Una sola consulta (la versión del alumno) y sin cuerpo
+        with self.assertNumQueries(1):
+            por_etag = self.client.get(self.url, HTTP_IF_NONE_MATCH=respuesta['ETag'])
+        self.assertEqual(por_etag.status_code, 304)
+        self.assertEqual(por_etag.content, b'')
+
+        por_fecha = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=respuesta['Last-Modified'])
+        self.assertEqual(por_fecha.status_code, 304)
+
+    def test_cambia_con_las_inscripciones(self):
+        etag = self.client.get(self.url)['ETag']
+
+        AlumnoMateriaCurso.objects.create(
+            alumno=self.alumno, materia_curso=crear_curso(self.otra, horario="Martes 10:00-12:00")
+        )
+
+        respuesta = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotEqual(respuesta['ETag'], etag)
+        self.assertIn(b'Tema 1', respuesta.content)
+
+    def test_firma_invalida(self):
+        otra_firma = reverse('alumno_calendario', args=[self.alumno.pk, firma_calendario(self.alumno.pk + 1)])
+        self.assertEqual(self.client.get(otra_firma).status_code, 404)
+
+
+# ======================================================
+#   PÁGINA DE CARRERA
+# ======================================================
+
+class PaginaCarreraTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, (cls.materia, *_) = crear_carrera_con_materias()
+        cls.url = reverse('carrera_detail', args=[cls.carrera.pk])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cache_caliente_sin_consultas(self):
+        primera = self.client.get(self.url)
+        self.assertContains(primera, "Tema 0")
+
+        with self.assertNumQueries(0):
+            segunda = self.client.get(self.url)
+        self.assertEqual(segunda.content, primera.content)
+
+    def test_no_modificada(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            respuesta = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 304)
+
+    def test_cambia_con_el_catalogo(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.materia.nombre = "Tema Renombrado"
+            self.materia.save()
+
+        respuesta = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotEqual(respuesta['ETag'], etag)
+        self.assertContains(respuesta, "Tema Renombrado")
+
+    def test_direccion_anterior(self):
+        self.carrera.nombre = "Ingeniería en Sistemas de Información"
+        self.carrera.save()
+        respuesta = self.client.get(reverse('carrera_anterior', args=['ingenieria_sistemas']))
+        self.assertRedirects(respuesta, self.url, status_code=301)
+        self.assertEqual(self.client.get(reverse('carrera_anterior', args=['no_existe'])).status_code, 404)
+
+
+# ======================================================
+#   HORARIO SEMANAL DEL ALUMNO
+# ======================================================
+
+class SemanaAlumnoTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, (cls.materia, cls.otra, *_) = crear_carrera_con_materias()
+        cls.alumno = crear_alumno(cls.carrera, 0)
+        cls.curso = crear_curso(cls.materia, horario="Lunes y Miércoles 08:00-10:00")
+        AlumnoMateriaCurso.objects.create(alumno=cls.alumno, materia_curso=cls.curso)
+
+    def semana(self):
+        alumno = Alumno.objects.select_related('semana').get(pk=self.alumno.pk)
+        return semana_de(alumno)
+
+    def materias_del(self, dia):
+        return [entrada['materia'] for entrada in self.semana()['semana'][dia]]
+
+    def test_se_guarda_y_se_reusa(self):
+        datos = self.semana()
+        self.assertEqual(self.materias_del('Lunes'), ["Tema 0"])
+        self.assertEqual(datos['semana']['Miércoles'][0]['horario'], "08:00–10:00")
+        self.assertTrue(SemanaAlumno.objects.filter(alumno=self.alumno).exists())
+
+        alumno = Alumno.objects.select_related('semana').get(pk=self.alumno.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(semana_de(alumno), datos)
+
+    def test_se_rearma_al_inscribirse(self):
+        self.semana()
+        AlumnoMateriaCurso.objects.create(
+            alumno=self.alumno, materia_curso=crear_curso(self.otra, horario="Lunes 10:00-12:00")
+        )
+        self.assertFalse(SemanaAlumno.objects.filter(alumno=self.alumno).exists())
+        self.assertEqual(self.materias_del('Lunes'), ["Tema 0", "Tema 1"])
+
+    def test_se_rearma_al_cambiar_el_curso(self):
+        self.semana()
+
+        self.curso.horario = "Viernes 18:00-20:00"
+        self.curso.save()
+        self.assertEqual(self.materias_del('Lunes'), [])
+        self.assertEqual(self.materias_del('Viernes'), ["Tema 0"])
+
+        profesor = Profesor.objects.create(nombre="Ana", apellido="Paz", email="ana@utn.test")
+        ProfesorMateriaCurso.objects.create(profesor=profesor, materia_curso=self.curso)
+        self.assertEqual(self.semana()['semana']['Viernes'][0]['profesor'], "Ana Paz")
+
+    def test_se_rearma_al_cargar_notas(self):
+        self.semana()
+        inscripcion = AlumnoMateriaCurso.objects.get(alumno=self.alumno)
+        aplicar_notas(inscripcion, 8, 8, 8)
+        guardar_notas([inscripcion])
+        cursada, = self.semana()['cursadas']
+        self.assertEqual((cursada['promedio'], cursada['aprobado'], cursada['finalizado']), (8.0, True, True))
+
+
+# ======================================================
+#   ANALÍTICO DEL ALUMNO
+# ======================================================
+
+class AnaliticoTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, cls.materias = crear_carrera_con_materias()
+        cls.alumno = crear_alumno(cls.carrera, 0)
+        cls.inscripcion = AlumnoMateriaCurso.objects.create(
+            alumno=cls.alumno, materia_curso=crear_curso(cls.materias[0])
+        )
+        AlumnoMateria.objects.create(alumno=cls.alumno, materia=cls.materias[1], aprobado=True, nota_final=7)
+
+    def setUp(self):
+        cache.clear()
+
+    def analitico(self):
+        return analitico_de(Alumno.objects.get(pk=self.alumno.pk))
+
+    def estados(self, datos):
+        return {m['sigla']: m['estado'] for m in datos['materias']}
+
+    def test_contenido(self):
+        datos = self.analitico()
+        self.assertEqual(self.estados(datos), {'T00': 'en_curso', 'T01': 'aprobada', 'T02': 'pendiente', 'T03': 'pendiente'})
+        self.assertEqual((datos['aprobadas'], datos['en_curso'], datos['total_plan']), (1, 1, 4))
+        self.assertEqual((datos['avance'], datos['promedio']), (25.0, 7.0))
+
+    def test_cache(self):
+        datos = self.analitico()
+        alumno = Alumno.objects.get(pk=self.alumno.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(analitico_de(alumno), datos)
+
+    def test_cambio_de_notas_invalida(self):
+        self.analitico()
+
+        inscripcion = AlumnoMateriaCurso.objects.get(pk=self.inscripcion.pk)
+        aplicar_notas(inscripcion, 9, 9, 9)
+        guardar_notas([inscripcion])
+
+        with CaptureQueriesContext(connection) as contexto:
+            datos = self.analitico()
+        self.assertGreater(len(contexto.captured_queries), 1)
+        self.assertEqual(self.estados(datos)['T00'], 'aprobada')
+        self.assertEqual((datos['aprobadas'], datos['promedio']), (2, 8.0))
+
+    def test_cambio_por_save_invalida(self):
+        self.analitico()
+        inscripcion = AlumnoMateriaCurso.objects.get(pk=self.inscripcion.pk)
+        inscripcion.nota_1, inscripcion.nota_2, inscripcion.nota_3 = 2, 2, 2
+        inscripcion.save()
+        self.assertEqual(self.analitico()['materias'][0]['desaprobadas'], 1)
+
+
+# ======================================================
+#   PANEL DEL PROFESOR
+# ======================================================
+
+class PanelProfesorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, cls.materias = crear_carrera_con_materias(6)
+        cls.profesor = Profesor.objects.create(
+            user=User.objects.create_user("prof@utn.test", "prof@utn.test", "clave"),
+            nombre="Ana", apellido="Paz", email="prof@utn.test"
+        )
+        cls.alumno = crear_alumno(cls.carrera, 0)
+
+    def setUp(self):
+        self.client.login(username="prof@utn.test", password="clave")
+
+    def asignar(self, materias):
+        for materia in materias:
+            curso = crear_curso(materia, profesor=self.profesor)
+            AlumnoMateriaCurso.objects.create(alumno=self.alumno, materia_curso=curso)
+
+    def consultas(self, url):
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as contexto:
+            respuesta = self.client.get(url)
+        self.assertEqual(respuesta.status_code, 200)
+        return len(contexto.captured_queries), respuesta
+
+    def test_consultas_constantes(self):
+        for url in (reverse('dashboard', args=[self.profesor.pk]), reverse('mis_clases')):
+            with self.subTest(url=url):
+                ProfesorMateriaCurso.objects.all().delete()
+                self.asignar(self.materias[:2])
+                con_dos, respuesta = self.consultas(url)
+                self.assertEqual(len(respuesta.context['asignaciones']), 2)
+
+                self.asignar(self.materias[2:])
+                con_seis, respuesta = self.consultas(url)
+                self.assertEqual(len(respuesta.context['asignaciones']), 6)
+                self.assertEqual(con_seis, con_dos)
+
+    def test_conteos(self):
+        self.asignar(self.materias[:1])
+        AlumnoMateriaCurso.objects.update(finalizado=True)
+        _, respuesta = self.consultas(reverse('mis_clases'))
+        asignacion = respuesta.context['asignaciones'][0]
+        self.assertEqual(
+            (asignacion.total_inscriptos, asignacion.total_sin_nota, asignacion.total_finalizados), (1, 0, 1)
+        )
+
+
+# ======================================================
+#   CHOQUES DE HORARIO AL ASIGNARSE UN CURSO
+# ======================================================
+
+class ChoquesDeHorarioTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        _, materias = crear_carrera_con_materias(3)
+        cls.profesor = Profesor.objects.create(
+            user=User.objects.create_user("prof@utn.test", "prof@utn.test", "clave"),
+            nombre="Ana", apellido="Paz", email="prof@utn.test"
+        )
+        crear_curso(materias[0], horario="Lunes 08:00-10:00", profesor=cls.profesor)
+        cls.pisado = crear_curso(materias[1], horario="Lunes 09:00-11:00")
+        cls.libre = crear_curso(materias[2], horario="Lunes 10:00-12:00")
+
+    def setUp(self):
+        self.client.login(username="prof@utn.test", password="clave")
+
+    def test_marca_los_cursos_en_conflicto(self):
+        respuesta = self.client.get(reverse('materias_disponibles'))
+        marcas = {mc.pk: mc.en_conflicto for mc in respuesta.context['materias']}
+        self.assertEqual(marcas, {self.pisado.pk: True, self.libre.pk: False})
+
+    def test_rechaza_la_asignacion_superpuesta(self):
+        respuesta = self.client.post(reverse('asignar_materia_profesor', args=[self.pisado.pk]))
+        self.assertRedirects(respuesta, reverse('materias_disponibles'), fetch_redirect_response=False)
+        self.assertFalse(ProfesorMateriaCurso.objects.filter(materia_curso=self.pisado).exists())
+        mensaje, = [str(m) for m in get_messages(respuesta.wsgi_request)]
+        self.assertIn("se superpone con Tema 0 el Lunes", mensaje)
+
+    def test_asigna_el_curso_que_empieza_cuando_termina_otro(self):
+        respuesta = self.client.post(reverse('asignar_materia_profesor', args=[self.libre.pk]))
+        self.assertRedirects(respuesta, reverse('materias_disponibles'), fetch_redirect_response=False)
+        self.assertTrue(ProfesorMateriaCurso.objects.filter(profesor=self.profesor, materia_curso=self.libre).exists())
+
+
+# ======================================================
+#   LISTADO DE MATERIAS (PAGINACIÓN POR CLAVE)
+# ======================================================
+
+class PaginacionMateriasTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, materias = crear_carrera_con_materias(MATERIAS_POR_PAGINA * 2 + 5)
+        cls.siglas = [materia.sigla for materia in materias]
+        cls.otra = Carrera.objects.create(nombre="Ingeniería Química", duracion_anios=5)
+        for materia in materias[::3]:
+            CarreraMateria.objects.create(carrera=cls.otra, materia=materia, anio=2)
+        cls.siglas_otra = [materia.sigla for materia in materias[::3]]
+
+    def recorrer(self, parametros=''):
+        """Siglas de todas las páginas, siguiendo el enlace `siguiente`."""
+        siglas, paginas = [], 0
+        url = f"{reverse('materia_list')}?{parametros}"
+        while url:
+            respuesta = self.client.get(url)
+            self.assertEqual(respuesta.status_code, 200)
+            pagina = [materia.sigla for materia in respuesta.context['materias']]
+            self.assertLessEqual(len(pagina), MATERIAS_POR_PAGINA)
+            siglas += pagina
+            paginas += 1
+            siguiente = respuesta.context['siguiente']
+            url = f"{reverse('materia_list')}?{siguiente}" if siguiente else None
+        return siglas, paginas
+
+    def test_recorre_todo_sin_repetir_ni_saltear(self):
+        siglas, paginas = self.recorrer()
+        self.assertEqual(siglas, self.siglas)
+        self.assertEqual(paginas, 3)
+
+    def test_los_filtros_siguen_en_las_paginas(self):
+        siglas, _ = self.recorrer(f"carrera={self.otra.pk}&anio=2")
+        self.assertEqual(siglas, self.siglas_otra)
+
+    def test_pagina_siguiente_empieza_despues_de_la_clave(self):
+        respuesta = self.client.get(reverse('materia_list'), {'despues': self.siglas[MATERIAS_POR_PAGINA - 1]})
+        self.assertFalse(respuesta.context['es_primera_pagina'])
+        self.assertEqual(respuesta.context['materias'][0].sigla, self.siglas[MATERIAS_POR_PAGINA])
+
+
+# ======================================================
+#   PLAN DE LA CARRERA (GRAFO DE CORRELATIVAS)
+# ======================================================
+
+class PlanCarreraTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, materias = crear_carrera_con_materias(6)
+        encadenar_correlativas(materias)
+        cls.materias = materias
+        cls.url = reverse('carrera_plan_json', args=[cls.carrera.pk])
+
+    def setUp(self):
+        cache.clear()
+        _planes.clear()
+
+    def test_niveles_y_cadena_mas_larga(self):
+        _, datos = plan_de(self.carrera.pk)
+        self.assertEqual(datos['niveles'], [['T00', 'T04'], ['T01', 'T03'], ['T02'], ['T05']])
+        self.assertEqual(datos['cadena_mas_larga'], ['T00', 'T01', 'T02', 'T05'])
+        self.assertEqual(datos['ciclicas'], [])
+
+        nodos = {nodo['sigla']: nodo for nodo in datos['nodos']}
+        self.assertEqual((nodos['T00']['nivel'], nodos['T00']['altura']), (0, 3))
+        self.assertEqual((nodos['T03']['nivel'], nodos['T03']['altura']), (1, 1))
+        self.assertEqual(nodos['T05']['requiere'], ['T02', 'T03'])
+        self.assertEqual(nodos['T00']['requerida_por'], ['T01', 'T03'])
+
+    def test_json_y_cambio_de_correlativas(self):
+        datos = self.client.get(self.url).json()
+        self.assertEqual(len(datos['cadena_mas_larga']), 4)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        t00, *_, t04, _ = self.materias
+        with self.captureOnCommitCallbacks(execute=True):
+            t00.correlativas_requeridas.add(t04)
+        datos = self.client.get(self.url).json()
+        self.assertEqual(datos['cadena_mas_larga'], ['T04', 'T00', 'T01', 'T02', 'T05'])
+
+    def test_carrera_inexistente(self):
+        self.assertEqual(self.client.get(reverse('carrera_plan_json', args=[0])).status_code, 404)
+
+    def test_ciclo(self):
+        grafo = GrafoCorrelativas(['A', 'B', 'C'], {'B': ['A', 'C'], 'C': ['B']})
+        self.assertEqual(grafo.niveles(), [['A']])
+        self.assertEqual(grafo.ciclicas, ['B', 'C'])
+
+
+# ======================================================
+#   CAMINO AL EGRESO
+# ======================================================
+
+class EgresoTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, materias = crear_carrera_con_materias(6)
+        encadenar_correlativas(materias)
+        cls.alumno = crear_alumno(cls.carrera, 0)
+        AlumnoMateria.objects.create(alumno=cls.alumno, materia=materias[0], aprobado=True, nota_final=8)
+        cls.nuevo = crear_alumno(cls.carrera, 1)
+        User.objects.create_user("staff@utn.test", "staff@utn.test", "clave", is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+        _planes.clear()
+        _grafos.clear()
+
+    def siglas_por_cuatrimestre(self, egreso):
+        return [[m['sigla'] for m in cuatrimestre['materias']] for cuatrimestre in egreso['plan']]
+
+    def test_plan_sugerido(self):
+        egreso = egreso_de(self.alumno, carga=2)
+        self.assertEqual(self.siglas_por_cuatrimestre(egreso), [['T01', 'T03'], ['T02', 'T04'], ['T05']])
+        self.assertEqual(egreso['ruta_critica'], ['T01', 'T02', 'T05'])
+        self.assertEqual((egreso['restantes'], egreso['cuatrimestres'], egreso['minimo_teorico']), (5, 3, 3))
+
+    def test_la_carga_acota_cada_cuatrimestre(self):
+        egreso = egreso_de(self.alumno, carga=1)
+        self.assertEqual(egreso['cuatrimestres'], 5)
+        self.assertEqual(egreso['minimo_teorico'], 5)
+        self.assertTrue(all(len(cuatrimestre) == 1 for cuatrimestre in self.siglas_por_cuatrimestre(egreso)))
+
+    def test_json_de_la_carrera(self):
+        self.client.login(username="staff@utn.test", password="clave")
+        datos = self.client.get(reverse('carrera_egreso_json', args=[self.carrera.pk]), {'carga': 2}).json()
+        self.assertEqual(datos['carga'], 2)
+        self.assertEqual(
+            [(alumno['id'], alumno['restantes'], alumno['cuatrimestres']) for alumno in datos['alumnos']],
+            [(self.alumno.pk, 5, 3), (self.nuevo.pk, 6, 4)]
+        )
+
+        datos = self.client.get(reverse('alumno_egreso_json', args=[self.nuevo.pk]), {'carga': 99}).json()
+        self.assertEqual(datos['carga'], 12)
+        self.assertEqual(self.siglas_por_cuatrimestre(datos)[0], ['T00', 'T04'])
+
+
+# ======================================================
+#   EVALUADOR DE CORRELATIVAS
+# ======================================================
+
+class EvaluadorCorrelativasTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.carrera, cls.materias = crear_carrera_con_materias(6)
+        encadenar_correlativas(cls.materias)
+        cls.alumno = crear_alumno(cls.carrera, 0)
+        cls.otro = crear_alumno(cls.carrera, 1)
+        inscripcion = AlumnoMateriaCurso(alumno=cls.alumno, materia_curso=crear_curso(cls.materias[0]))
+        aplicar_notas(inscripcion, 8, 8, 8)
+        inscripcion.save()
+
+    def test_dos_consultas_y_despues_en_memoria(self):
+        with self.assertNumQueries(2):
+            evaluador = EvaluadorCorrelativas.para_carrera(self.alumno)
+
+        with self.assertNumQueries(0):
+            estados = {materia.sigla: evaluador.estado(materia)[0] for materia in self.materias}
+            cumple, faltante = evaluador.cumple(self.materias[5])
+        self.assertEqual(estados, {
+            'T00': 'aprobada', 'T01': 'ok', 'T02': 'correlativa', 'T03': 'ok', 'T04': 'ok', 'T05': 'correlativa'
+        })
+        self.assertEqual((cumple, faltante.sigla), (False, 'T02'))
+
+    def test_solo_las_materias_pedidas(self):
+        with self.assertNumQueries(2):
+            evaluador = EvaluadorCorrelativas(self.otro, ['T01'])
+        self.assertEqual(evaluador.estado('T01')[1].sigla, 'T00')
+        self.assertEqual(evaluador.requeridas.keys(), {'T01'})
+
+    def test_por_lote(self):
+        with self.assertNumQueries(2):
+            cumplen = alumnos_que_cumplen([self.alumno.pk, self.otro.pk], self.materias[1])
+        self.assertEqual(cumplen, {self.alumno.pk})
@@ -3,21 +3,40 @@ from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView, View
 from django.urls import reverse_lazy
+from django.utils.http import urlencode
 from .models import (
     Alumno, AlumnoMateriaCurso, Carrera, Curso, Materia, MateriaCurso,
     Inscripcion, TipoEvaluacion, CondicionFinal, Evaluacion, CarreraMateria,
-    Profesor, ProfesorMateriaCurso, alumno_cumple_correlativas
+    Profesor, ProfesorMateriaCurso, ListaEspera, FranjaHoraria
 )
-from django.db.models import Q
+from .correlativas import EvaluadorCorrelativas
+from .horarios import DIAS_SEMANA, superposiciones
+from .notas import aplicar_notas, guardar_notas, importar_notas_csv, parsear_nota, resumir
+from .exportaciones import notas_de_carrera, notas_de_ciclo, notas_de_curso, respuesta_csv
+from .semana import semana_de
+from .analitico import analitico_de
+from .plan import plan_de
+from .egreso import carga_desde, egreso_de, egreso_de_cohorte
+from .busqueda import filtrar_por_texto
+from .catalogo import MAX_SUGERENCIAS, autocompletar_materias, version_catalogo
+from .calendario import etag_calendario, firma_calendario, firma_valida, generar_ics
+from .inscripciones import anotar_en_lista_espera, promover_lista_espera, reinscribir_en_lote
+from .roles import guardar_rol, obtener_rol, resolver_rol
+from django.db.models import Exists, OuterRef, Prefetch, Q
 from django.contrib.auth import logout
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.utils.decorators import method_decorator
 from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse, JsonResponse
+from django.views.decorators.http import condition
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.core.cache import cache
+from django.template.loader import render_to_string
 from .form import RegistroForm
 
 # ============================
@@ -33,9 +52,14 @@ def logout_view(request):
 @method_decorator(login_required, name='dispatch')
 class PostLoginCheckView(View):
     def get(self, request, *args, **kwargs):
-        alumno = getattr(request.user, 'alumno', None)
-
-        if alumno and alumno.dni and alumno.anio_universitario and alumno.carrera:
+        rol = request.rol
+
+        # Perfil completo: con DNI, año y carrera
+        if rol.es_alumno and Alumno.objects.filter(
+            pk=rol.alumno_id,
+            anio_universitario__gt=0,
+            carrera__isnull=False
+        ).exclude(dni='').exists():
             return redirect('inicio')
         else:
             return redirect('alumno_create')
@@ -53,58 +77,129 @@ class AlumnoDetailView(DetailView):
     model = Alumno
     template_name = 'alumno/alumno_detail.html'
 
+    def get_queryset(self):
+        # El horario y las notas ya armados vienen en la misma consulta
+        return Alumno.objects.select_related('semana', 'carrera')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        alumno = self.object
+        datos = semana_de(self.object)
 
-        inscripciones = alumno.materias_curso.select_related(
-            "materia_curso",
-            "materia_curso__materia"
-        )
+        context["materias_cursadas"] = datos["cursadas"]
+        context["semana"] = datos["semana"]
 
-        semana = {
-            "Lunes": [], "Martes": [], "Miércoles": [],
-            "Jueves": [], "Viernes": [], "Sábado": [],
-        }
+        # El link del feed y el analítico sólo se le muestran al propio alumno
+        if self.request.user.is_authenticated and self.request.user.pk == self.object.user_id:
+            context["firma_calendario"] = firma_calendario(self.object.pk)
+            context["analitico"] = analitico_de(self.object)
+        return context
 
-        for ins in inscripciones:
-            mc = ins.materia_curso
 
-            try:
-                dias, hora_inicio, hora_fin = mc.parse_horario()
-            except:
-                continue
+# ============================
+#   ALUMNO ANALÍTICO
+# ============================
+def _alumno_del_analitico(request, pk):
+    alumno = get_object_or_404(Alumno.objects.select_related('carrera'), pk=pk)
+    if request.user.pk != alumno.user_id and not request.user.is_staff:
+        raise Http404
+    return alumno
+
+
+@login_required
+def alumno_analitico(request, pk):
+    alumno = _alumno_del_analitico(request, pk)
+    return render(request, 'alumno/analitico.html', {
+        'alumno': alumno,
+        'analitico': analitico_de(alumno),
+    })
 
-          
-            profesores = mc.profesores.all()
-            nombres_profesores = ", ".join(
-                f"{p.profesor.nombre} {p.profesor.apellido}"
-                for p in profesores
-            )
 
-            entrada = {
-                "materia": mc.materia.nombre,
-                "profesor": nombres_profesores or "Sin asignar",
-                "horario": f"{hora_inicio.strftime('%H:%M')}–{hora_fin.strftime('%H:%M')}",
-                "turno": mc.turno_cursado.capitalize(),
+@login_required
+def alumno_analitico_json(request, pk):
+    alumno = _alumno_del_analitico(request, pk)
+    return JsonResponse(analitico_de(alumno))
 
-                "nota_1": ins.nota_1,
-                "nota_2": ins.nota_2,
-                "nota_3": ins.nota_3,
-                "promedio": ins.promedio,
 
-                "aprobado": ins.aprobado,
+@login_required
+def alumno_egreso_json(request, pk):
+    """Cuatrimestres que le faltan al alumno y una secuencia sugerida (?carga=N)."""
+    alumno = _alumno_del_analitico(request, pk)
+    if alumno.carrera_id is None:
+        raise Http404
+    return JsonResponse(egreso_de(alumno, carga_desde(request.GET.get('carga'))))
+
+
+@staff_member_required
+def carrera_egreso_json(request, pk):
+    """
+    Lo mismo para todos los alumnos de una carrera, opcionalmente de un
+    solo año (?anio=N). Pensado para que un asesor revise una cohorte.
+    """
+    carrera = get_object_or_404(Carrera, pk=pk)
+    alumnos = Alumno.objects.filter(carrera=carrera).only(
+        'id_alumno', 'nombre', 'apellido', 'anio_universitario', 'carrera'
+    ).order_by('apellido', 'nombre')
+    anio = request.GET.get('anio', '')
+    if anio.isdigit():
+        alumnos = alumnos.filter(anio_universitario=int(anio))
+
+    carga = carga_desde(request.GET.get('carga'))
+    return JsonResponse({
+        'carrera': {'id': carrera.pk, 'nombre': carrera.nombre},
+        'carga': carga,
+        'alumnos': [
+            {
+                'id': alumno.pk,
+                'apellido': alumno.apellido,
+                'nombre': alumno.nombre,
+                'anio_universitario': alumno.anio_universitario,
+                'restantes': egreso['restantes'],
+                'cuatrimestres': egreso['cuatrimestres'],
+                'minimo_teorico': egreso['minimo_teorico'],
             }
+            for alumno, egreso in egreso_de_cohorte(alumnos, carga)
+        ],
+    })
 
 
-            for dia in dias:
-                dia = dia.strip()
-                if dia in semana:
-                    semana[dia].append(entrada)
-        context["materias_cursadas"] = inscripciones
-        context["semana"] = semana
-        return context
+# ============================
+#   ALUMNO CALENDARIO (.ics)
+# ============================
+def _version_calendario(request, pk, firma):
+    """Versión del feed, consultada una sola vez por request."""
+    if not hasattr(request, '_version_calendario'):
+        if not firma_valida(pk, firma):
+            raise Http404
+        request._version_calendario = Alumno.objects.filter(pk=pk).values_list(
+            'version_inscripciones', 'inscripciones_modificadas'
+        ).first()
+        if request._version_calendario is None:
+            raise Http404
+    return request._version_calendario
+
+
+def _etag_calendario(request, pk, firma):
+    return etag_calendario(pk, _version_calendario(request, pk, firma)[0])
+
+
+def _modificado_calendario(request, pk, firma):
+    return _version_calendario(request, pk, firma)[1]
+
+
+@condition(etag_func=_etag_calendario, last_modified_func=_modificado_calendario)
+def alumno_calendario(request, pk, firma):
+    """
+    Feed .ics del horario del alumno. Los clientes de calendario lo
+    consultan cada pocos minutos: mientras la versión no cambie reciben
+    un 304 después de una consulta mínima, sin regenerar el archivo.
+    """
+    alumno = get_object_or_404(Alumno, pk=pk)
+
+    respuesta = HttpResponse(generar_ics(alumno), content_type='text/calendar; charset=utf-8')
+    respuesta['Content-Disposition'] = f'inline; filename="cursada-{alumno.pk}.ics"'
+    respuesta['Cache-Control'] = 'private, no-cache'
+    return respuesta
 
 
 # ============================
@@ -149,18 +244,96 @@ class AlumnoDeleteView(DeleteView):
 # ============================
 #   MATERIAS
 # ============================
+MATERIAS_POR_PAGINA = 30
+
+
 class MateriaListView(ListView):
+    """
+    Paginación por clave: ordenada por sigla (o por relevancia si se
+    busca) y con `despues` = última clave de la página anterior, así cada
+    página cuesta lo mismo sin importar cuántas haya antes. Las carreras
+    de cada materia vienen en una sola consulta extra.
+    """
     model = Materia
     template_name = 'materia/materia_list.html'
     context_object_name = 'materias'
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        query = self.request.GET.get('q')
+        queryset = Materia.objects.prefetch_related(
+            Prefetch(
+                'carreramateria_set',
+                queryset=CarreraMateria.objects.select_related('carrera').order_by('carrera__nombre')
+            )
+        )
+
+        # ---- Filtros ----
+        self.filtros = {}
+        plan = CarreraMateria.objects.filter(materia=OuterRef('pk'))
+
+        carrera = self.request.GET.get('carrera', '')
+        if carrera.isdigit():
+            plan = plan.filter(carrera_id=int(carrera))
+            self.filtros['carrera'] = carrera
+
+        anio = self.request.GET.get('anio', '')
+        if anio.isdigit():
+            plan = plan.filter(anio=int(anio))
+            self.filtros['anio'] = anio
 
+        # Carrera y año juntos se refieren a la misma fila del plan
+        if self.filtros:
+            queryset = queryset.filter(Exists(plan))
+
+        query = self.request.GET.get('q')
         if query:
-            queryset = queryset.filter(Q(nombre__icontains=query))
-        return queryset
+            queryset = filtrar_por_texto(queryset, query)
+            self.filtros['q'] = query
+
+        # ---- Página ----
+        despues = self.request.GET.get('despues', '')
+        if 'relevancia' in queryset.query.annotations:
+            self.clave_pagina = 'relevancia'
+            if despues.isdigit():
+                queryset = queryset.filter(relevancia__gt=int(despues))
+        else:
+            self.clave_pagina = 'sigla'
+            if despues:
+                queryset = queryset.filter(sigla__gt=despues)
+            queryset = queryset.order_by('sigla')
+        self.es_primera_pagina = not despues
+
+        return queryset[:MATERIAS_POR_PAGINA + 1]
+
+    def get_context_data(self, **kwargs):
+        pagina = list(self.object_list)
+        hay_mas = len(pagina) > MATERIAS_POR_PAGINA
+        pagina = pagina[:MATERIAS_POR_PAGINA]
+
+        context = super().get_context_data(object_list=pagina, **kwargs)
+        context['carreras'] = Carrera.objects.order_by('nombre')
+        context['anios'] = CarreraMateria.objects.values_list('anio', flat=True).distinct().order_by('anio')
+        context['filtros'] = self.filtros
+        context['primera_pagina'] = urlencode(self.filtros)
+        context['es_primera_pagina'] = self.es_primera_pagina
+        context['siguiente'] = None
+        if hay_mas:
+            context['siguiente'] = urlencode({
+                **self.filtros,
+                'despues': getattr(pagina[-1], self.clave_pagina)
+            })
+        return context
+
+
+def materias_autocompletar(request):
+    """
+    Sugerencias para el buscador de materias. Sale del índice en memoria
+    (UTN/catalogo.py): no consulta la base ni la sesión.
+    """
+    limite = request.GET.get('limite', '')
+    limite = min(int(limite), MAX_SUGERENCIAS) if limite.isdigit() and int(limite) > 0 else 8
+    return JsonResponse({
+        'resultados': autocompletar_materias(request.GET.get('q', ''), limite)
+    })
     
 
 
@@ -178,7 +351,7 @@ class MateriaReinscripcionView(TemplateView):
         # MATERIAS DE LA CARRERA + AÑO DEL ALUMNO
         # ==================================================
         materias_carrera = CarreraMateria.objects.filter(
-                carrera=alumno.carrera,
+                carrera_id=alumno.carrera_id,
                 anio__lte=alumno.anio_universitario
             ).select_related('materia')
 
@@ -191,7 +364,11 @@ class MateriaReinscripcionView(TemplateView):
         cursos_validos = MateriaCurso.objects.filter(
             materia__in=materias,
             profesores__isnull=False
-        ).distinct().order_by(
+        ).distinct().select_related(
+            'curso'
+        ).prefetch_related(
+            'profesores__profesor'
+        ).order_by(
             'turno_cursado',
             'horario'
         )
@@ -201,72 +378,61 @@ class MateriaReinscripcionView(TemplateView):
         # Agrupar cursos por materia
         cursos_por_materia = {}
         for curso in cursos_validos:
-            cursos_por_materia.setdefault(curso.materia.sigla, []).append(curso)
+            cursos_por_materia.setdefault(curso.materia_id, []).append(curso)
 
         # ==================================================
         # FILTRAR SOLO MATERIAS QUE TENGAN CURSOS
         # ==================================================
-        materias_validas = materias_carrera.filter(
-            materia__in=cursos_validos.values('materia')
-        ).order_by('anio', 'materia__nombre')
+        materias_validas = [
+            cm for cm in sorted(materias_carrera, key=lambda cm: (cm.anio, cm.materia.nombre))
+            if cm.materia_id in cursos_por_materia
+        ]
 
         # ==================================================
         # REINSCRIPCIONES ACTIVAS
         # ==================================================
-        materias_reins = AlumnoMateriaCurso.objects.filter(
-            alumno=alumno
-        ).values_list('materia_curso__materia__sigla', flat=True)
-
-        context['materias_reinscriptas'] = list(materias_reins)
-
         insc_activas = AlumnoMateriaCurso.objects.filter(
             alumno=alumno
-        ).select_related('materia_curso', 'materia_curso__materia')
+        ).select_related('materia_curso', 'materia_curso__materia', 'materia_curso__curso')
 
         context['inscripciones_por_materia'] = {
-            ins.materia_curso.materia.sigla: ins for ins in insc_activas
+            ins.materia_curso.materia_id: ins for ins in insc_activas
+        }
+        context['materias_reinscriptas'] = list(context['inscripciones_por_materia'])
+
+        context['listas_espera'] = {
+            entrada.materia_curso.materia_id: entrada
+            for entrada in ListaEspera.objects.filter(alumno=alumno).select_related('materia_curso')
         }
 
         # ==================================================
         # INFO POR MATERIA (SOLO LAS VALIDAS)
         # ==================================================
+        # Aprobadas + grafo de correlativas de la carrera en dos consultas
+        evaluador = EvaluadorCorrelativas.para_carrera(alumno)
         materias_info = []
 
         for cm in materias_validas:
             materia = cm.materia
             anio_materia = cm.anio
 
-            estado = "ok"
+            estado, correlativa_faltante = evaluador.estado(materia)
             mensaje = ""
 
-            # ¿YA APROBÓ?
-            aprobada = AlumnoMateriaCurso.objects.filter(
-                alumno=alumno,
-                materia_curso__materia=materia,
-                aprobado=True
-            ).exists()
-
-            if aprobada:
-                estado = "aprobada"
+            if estado == EvaluadorCorrelativas.APROBADA:
                 mensaje = "Ya aprobaste esta materia."
-            else:
-                cumple, correlativa_faltante = alumno_cumple_correlativas(
-                    alumno,
-                    materia
+            elif estado == EvaluadorCorrelativas.CORRELATIVA:
+                mensaje = (
+                    f"No podés cursar {materia.nombre} "
+                    f"sin aprobar {correlativa_faltante.nombre}."
                 )
 
-                if not cumple:
-                    estado = "correlativa"
-                    mensaje = (
-                        f"No podés cursar {materia.nombre} "
-                        f"sin aprobar {correlativa_faltante.nombre}."
-                    )
-
             materias_info.append({
                 "materia": materia,
                 "anio": anio_materia,
                 "estado": estado,
                 "mensaje": mensaje,
+                "correlativa_faltante": correlativa_faltante,
                 "cursos": cursos_por_materia.get(materia.sigla, [])
             })
 
@@ -305,6 +471,20 @@ def reinscribir_materia(request, alumno_id, materia_id):
         messages.warning(request, "Ya estás reinscripto en esta materia.")
         return redirect('materia_reinscripcion', alumno_id=alumno.id_alumno)
 
+    # =========================
+    # CORRELATIVAS
+    # =========================
+    evaluador = EvaluadorCorrelativas(alumno, [materia])
+    cumple, correlativa_faltante = evaluador.cumple(materia)
+
+    if not cumple:
+        messages.error(
+            request,
+            f"No podés inscribirte a {materia.nombre} "
+            f"sin aprobar {correlativa_faltante.nombre}."
+        )
+        return redirect('materia_reinscripcion', alumno_id=alumno.id_alumno)
+
     curso_id = request.POST.get('curso_id')
 
     materia_curso = get_object_or_404(
@@ -318,16 +498,56 @@ def reinscribir_materia(request, alumno_id, materia_id):
         alumno=alumno,
         materia_curso=materia_curso
     )
+    # clean() reutiliza el evaluador en lugar de volver a consultar
+    inscripcion.evaluador_correlativas = evaluador
 
     try:
-        inscripcion.full_clean()
-        inscripcion.save()
+        # La vacante se reserva con un UPDATE condicional dentro de save();
+        # si algo falla después, la transacción la devuelve.
+        with transaction.atomic():
+            inscripcion.full_clean()
+            inscripcion.save()
         messages.success(
             request,
             f"Te reinscribiste a {materia.nombre} correctamente."
         )
     except ValidationError as e:
-        messages.error(request, e.messages[0])
+        if getattr(e, 'code', None) == 'sin_vacantes':
+            entrada, _ = anotar_en_lista_espera(alumno, materia_curso)
+            messages.warning(
+                request,
+                f"El curso de {materia.nombre} no tiene vacantes. "
+                f"Quedaste en lista de espera (posición {entrada.posicion()})."
+            )
+        else:
+            messages.error(request, e.messages[0])
+
+    return redirect('materia_reinscripcion', alumno_id=alumno.id_alumno)
+
+
+
+def reinscribir_materias(request, alumno_id):
+    """
+    Reinscripción a varias materias en un solo POST: recibe la lista
+    `cursos` (ids de MateriaCurso) y crea todas las inscripciones o ninguna.
+    """
+    alumno = get_object_or_404(Alumno, id_alumno=alumno_id)
+
+    if request.method != "POST":
+        return redirect('materia_reinscripcion', alumno_id=alumno.id_alumno)
+
+    curso_ids = [c for c in request.POST.getlist('cursos') if c.isdigit()]
+
+    try:
+        inscripciones = reinscribir_en_lote(alumno, curso_ids)
+    except ValidationError as e:
+        for mensaje in e.messages:
+            messages.error(request, mensaje)
+    else:
+        messages.success(
+            request,
+            f"Te reinscribiste a {len(inscripciones)} materia(s) correctamente."
+        )
 
     return redirect('materia_reinscripcion', alumno_id=alumno.id_alumno)
 
@@ -340,11 +560,17 @@ def cancelar_reinscripcion(request, alumno_id, materia_id):
     inscripcion = AlumnoMateriaCurso.objects.filter(
         alumno=alumno,
         materia_curso__materia=materia
-    ).first()
+    ).select_related('materia_curso').first()
 
     if inscripcion:
-        inscripcion.delete()
+        # La vacante liberada pasa al primero de la lista de espera
+        # dentro de la misma transacción
+        with transaction.atomic():
+            inscripcion.delete()
+            promover_lista_espera(inscripcion.materia_curso)
         messages.success(request, f"Se canceló la reinscripción a {materia.nombre}.")
+    elif ListaEspera.objects.filter(alumno=alumno, materia_curso__materia=materia).delete()[0]:
+        messages.success(request, f"Saliste de la lista de espera de {materia.nombre}.")
     else:
         messages.warning(request, "No estabas reinscripto en esta materia.")
 
@@ -354,18 +580,6 @@ def cancelar_reinscripcion(request, alumno_id, materia_id):
 # ============================
 #   CARRERAS
 # ============================
-CARRERA_URL_MAP = {
-    "Ingeniería Civil": "Ingenieria_civil",
-    "Ingeniería Electrónica": "Ingenieria_electronica",
-    "Ingeniería en Energía Eléctrica": "Ingenieria_energia",
-    "Ingeniería Industrial": "Ingenieria_industrial",
-    "Ingeniería Mecánica": "Ingenieria_mecanica",
-    "Ingeniería Metalúrgica": "Ingenieria_metalurgica",
-    "Ingeniería Química": "Ingenieria_quimica",
-    "Ingeniería en Sistemas de Información": "ingenieria_sistemas",
-}
-
-
 class CarreraListView(ListView):
     model = Carrera
     template_name = 'carreras/carrera_list.html'
@@ -376,17 +590,9 @@ class CarreraListView(ListView):
         query = self.request.GET.get('q')
 
         if query:
-            queryset = queryset.filter(Q(nombre__icontains=query))
+            queryset = filtrar_por_texto(queryset, query)
         return queryset
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-
-        for carrera in context['carreras']:
-            carrera.url_name = CARRERA_URL_MAP.get(carrera.nombre, 'carrera_list')
-
-        return context
-
 def register_view(request):
     carreras = Carrera.objects.all()
 
@@ -450,18 +656,20 @@ def login_view(request):
 
         if user is not None:
             login(request, user)
+            # Queda guardado en la sesión para los próximos requests
+            rol = obtener_rol(request)
 
             # ================================
             # REDIRECCIÓN SEGÚN ROL
             # ================================
 
             # Si es alumno → ir a alumno_detail
-            if hasattr(user, "alumno"):
-                return redirect("/", pk=user.alumno.id_alumno)
+            if rol.es_alumno:
+                return redirect("/", pk=rol.alumno_id)
 
             # Si es profesor → ir a dashboard de profesor
-            if hasattr(user, "profesor"):
-                return redirect("dashboard", pk=user.profesor.id_profesor)
+            if rol.es_profesor:
+                return redirect("dashboard", pk=rol.profesor_id)
 
             # Si no tiene rol asociado
             messages.error(request, "Tu cuenta no tiene un rol asignado.")
@@ -476,49 +684,108 @@ def login_view(request):
 
 
 # ============================
-#  Páginas de Carrera (TemplateViews)
+#  Página de Carrera
 # ============================
-class Ingenieria_civil(TemplateView):
-    template_name = "carreras/Ingenieria_civil.html"
 
+# Las claves llevan la versión del catálogo, que avanza con cualquier
+# cambio de carreras, planes o materias: nunca hace falta borrarlas.
+DURACION_CACHE_CARRERA = 24 * 60 * 60
+
+# Direcciones de las páginas fijas que había antes de carrera_detail
+CARRERAS_ANTERIORES = {
+    "ingenieria_civil": "Ingeniería Civil",
+    "ingenieria_electronica": "Ingeniería Electrónica",
+    "ingenieria_energia": "Ingeniería en Energía Eléctrica",
+    "ingenieria_industrial": "Ingeniería Industrial",
+    "ingenieria_mecanica": "Ingeniería Mecánica",
+    "ingenieria_metalurgica": "Ingeniería Metalúrgica",
+    "ingenieria_quimica": "Ingeniería Química",
+    "ingenieria_sistemas": "Ingeniería en Sistemas de Información",
+}
 
-class Ingenieria_electronica(TemplateView):
-    template_name = "carreras/Ingenieria_electronica.html"
 
+def _etag_carrera(request, pk):
+    return f'"carrera-{pk}-k{version_catalogo()}"'
 
-class Ingenieria_energia(TemplateView):
-    template_name = "carreras/Ingenieria_energia.html"
 
+def _html_carrera(pk):
+    """
+    Página ya renderizada. No depende del usuario (no usa el request), así
+    una sola copia sirve para todos los visitantes.
+    """
+    clave = f"carrera:{pk}:k{version_catalogo()}"
+    html = cache.get(clave)
+    if html is None:
+        carrera = get_object_or_404(Carrera, pk=pk)
+        plan = CarreraMateria.objects.filter(carrera=carrera).select_related(
+            'materia'
+        ).prefetch_related(
+            'materia__correlativas_requeridas'
+        ).order_by('anio', 'materia__nombre')
 
-class Ingenieria_industrial(TemplateView):
-    template_name = "carreras/Ingenieria_industrial.html"
+        html = render_to_string('carreras/carrera_detail.html', {
+            'carrera': carrera,
+            'plan': plan,
+        })
+        cache.set(clave, html, DURACION_CACHE_CARRERA)
+    return html
 
 
-class Ingenieria_mecanica(TemplateView):
-    template_name = "carreras/Ingenieria_mecanica.html"
+@condition(etag_func=_etag_carrera)
+def carrera_detail(request, pk):
+    # Con la caché caliente no hace ninguna consulta
+    return HttpResponse(_html_carrera(pk))
 
 
-class Ingenieria_metalurgica(TemplateView):
-    template_name = "carreras/Ingenieria_metalurgica.html"
+def _etag_plan(request, pk):
+    return f'"plan-{pk}-k{version_catalogo()}"'
 
 
-class Ingenieria_quimica(TemplateView):
-    template_name = "carreras/Ingenieria_quimica.html"
+@condition(etag_func=_etag_plan)
+def carrera_plan_json(request, pk):
+    """Plan de la carrera como grafo: niveles, correlativas y cadena más larga."""
+    try:
+        _, datos = plan_de(pk)
+    except Carrera.DoesNotExist:
+        raise Http404
+    return JsonResponse(datos)
 
 
-class Ingenieria_sistemas(TemplateView):
-    template_name = "carreras/Ingenieria_sistema.html"
+def carrera_anterior(request, slug):
+    nombre = CARRERAS_ANTERIORES.get(slug)
+    if nombre is None:
+        raise Http404
+    return redirect(get_object_or_404(Carrera, nombre=nombre), permanent=True)
 
 
 # ============================
 #  VISTAS DE PROFESORES
 # ============================
 def get_profesor_or_redirect(request):
-    """ Devuelve profesor o redirige si el usuario NO es profesor. """
-    profesor = getattr(request.user, "profesor", None)
-    if profesor is None:
+    """
+    Devuelve el profesor logueado o None (con un mensaje) si el usuario NO
+    es profesor. Sale del rol guardado en la sesión, sin consultar la base:
+    es una referencia con sólo la clave, que alcanza para filtrar y asignar.
+    """
+    if not request.rol.es_profesor:
         messages.error(request, "Debés iniciar sesión como profesor.")
         return None
+    return Profesor(pk=request.rol.profesor_id)
+
+
+def cursos_a_cargo(request):
+    """
+    MateriaCurso cuyas notas puede ver y modificar el usuario: todos si es
+    staff, sólo los asignados si es profesor y None si no es ninguno.
+    """
+    cursos = MateriaCurso.objects.select_related('materia', 'curso')
+    if request.user.is_staff:
+        return cursos
+    profesor = get_profesor_or_redirect(request)
+    if profesor is None:
+        return None
+    return cursos.filter(profesores__profesor=profesor)
+
 # =======================================
 #   LOGIN PROFESORES (exclusivo)
 # =======================================
@@ -530,9 +797,11 @@ def login_profesores(request):
         user = authenticate(request, username=email, password=password)
 
         if user is not None:
-            if hasattr(user, "profesor"):
+            rol = resolver_rol(user)
+            if rol.es_profesor:
                 login(request, user)
-                return redirect("dashboard")
+                guardar_rol(request, rol)
+                return redirect("dashboard", pk=rol.profesor_id)
             else:
                 messages.error(request, "Este usuario no está registrado como profesor.")
         else:
@@ -558,8 +827,9 @@ def logout_profesores(request):
 
 @login_required
 def dashboard(request, pk):
-    profesor = Profesor.objects.get(user=request.user)
-    asignaciones = ProfesorMateriaCurso.objects.filter(profesor=profesor)
+    profesor = get_object_or_404(Profesor, pk=request.rol.profesor_id)
+    # Una sola consulta con los conteos y las estadísticas de cada curso
+    asignaciones = ProfesorMateriaCurso.objects.filter(profesor=profesor).con_resumen()
 
     return render(request, "profesores/dashboard.html", {
         "profesor": profesor,
@@ -572,21 +842,98 @@ def dashboard(request, pk):
 #   LISTAR MATERIAS DISPONIBLES
 # ===========================================
 
+MATERIAS_DISPONIBLES_POR_PAGINA = 24
+
+
+def _cursos_en_conflicto(profesor, cursos):
+    """
+    Ids de `cursos` que se superponen con lo que el profesor ya dicta.
+    Una consulta para las franjas del profesor y un barrido por día sobre
+    esas franjas más las de los cursos (ya prefetcheadas).
+    """
+    franjas = [
+        (dia, inicio, fin, None)
+        for dia, inicio, fin in FranjaHoraria.objects.filter(
+            materia_curso__profesores__profesor=profesor
+        ).values_list('dia', 'inicio', 'fin')
+    ]
+    if not franjas:
+        return set()
+
+    for mc in cursos:
+        franjas.extend((f.dia, f.inicio, f.fin, mc.pk) for f in mc.franjas.all())
+
+    # Sólo interesan los pares curso / carga actual (clave None)
+    en_conflicto = set()
+    for clave_a, clave_b in superposiciones(franjas):
+        if clave_a is None and clave_b is not None:
+            en_conflicto.add(clave_b)
+        elif clave_b is None and clave_a is not None:
+            en_conflicto.add(clave_a)
+    return en_conflicto
+
+
 @login_required
 def materias_disponibles(request):
-    profesor = request.user.profesor
+    profesor = get_profesor_or_redirect(request)
+    if profesor is None:
+        return redirect("login")
 
     materias = MateriaCurso.objects.exclude(
-        profesores__profesor=profesor
-    )
+        Exists(ProfesorMateriaCurso.objects.filter(profesor=profesor, materia_curso=OuterRef('pk')))
+    ).select_related('materia', 'curso').prefetch_related('franjas')
 
-    return render(request, "profesores/materias_disponibles.html", {
-        "materias": materias
-    })
+    # ---- Filtros ----
+    turno = request.GET.get('turno', '')
+    if turno in dict(MateriaCurso.Opciones_Turno):
+        materias = materias.filter(turno_cursado=turno)
+    else:
+        turno = ''
 
+    dia = request.GET.get('dia', '')
+    if dia.isdigit() and int(dia) < len(DIAS_SEMANA):
+        materias = materias.filter(Exists(FranjaHoraria.objects.filter(materia_curso=OuterRef('pk'), dia=int(dia))))
+    else:
+        dia = ''
 
+    carrera = request.GET.get('carrera', '')
+    if carrera.isdigit():
+        materias = materias.filter(Exists(CarreraMateria.objects.filter(carrera_id=int(carrera), materia=OuterRef('materia'))))
+    else:
+        carrera = ''
+
+    # ---- Paginación por clave (sigla, id): no recorre las páginas anteriores ----
+    despues = request.GET.get('despues', '')
+    sigla, _, ultimo_id = despues.rpartition(':')
+    if sigla and ultimo_id.isdigit():
+        materias = materias.filter(
+            Q(materia_id__gt=sigla) | Q(materia_id=sigla, id_materia_curso__gt=int(ultimo_id))
+        )
 
+    pagina = list(materias.order_by('materia_id', 'id_materia_curso')[:MATERIAS_DISPONIBLES_POR_PAGINA + 1])
+    hay_mas = len(pagina) > MATERIAS_DISPONIBLES_POR_PAGINA
+    pagina = pagina[:MATERIAS_DISPONIBLES_POR_PAGINA]
 
+    en_conflicto = _cursos_en_conflicto(profesor, pagina)
+    for mc in pagina:
+        mc.en_conflicto = mc.pk in en_conflicto
+
+    filtros = {k: v for k, v in (('turno', turno), ('dia', dia), ('carrera', carrera)) if v}
+    siguiente = None
+    if hay_mas:
+        ultimo = pagina[-1]
+        siguiente = urlencode({**filtros, 'despues': f"{ultimo.materia_id}:{ultimo.pk}"})
+
+    return render(request, "profesores/materias_disponibles.html", {
+        "materias": pagina,
+        "turnos": MateriaCurso.Opciones_Turno,
+        "dias": list(enumerate(DIAS_SEMANA)),
+        "carreras": Carrera.objects.order_by('nombre'),
+        "filtros": {'turno': turno, 'dia': dia, 'carrera': carrera},
+        "primera_pagina": urlencode(filtros),
+        "es_primera_pagina": not despues,
+        "siguiente": siguiente,
+    })
 
 
 # ===========================================
@@ -595,8 +942,25 @@ def materias_disponibles(request):
 
 @login_required
 def asignar_materia_profesor(request, id_materia_curso):
-    profesor = request.user.profesor
-    materia_curso = get_object_or_404(MateriaCurso, pk=id_materia_curso)
+    profesor = get_profesor_or_redirect(request)
+    if profesor is None:
+        return redirect("login")
+    materia_curso = get_object_or_404(MateriaCurso.objects.select_related('materia'), pk=id_materia_curso)
+
+    conflicto = FranjaHoraria.objects.filter(
+        materia_curso__profesores__profesor=profesor
+    ).exclude(
+        materia_curso=materia_curso
+    ).superpuestas_con(materia_curso).select_related('materia_curso__materia').first()
+
+    if conflicto is not None:
+        messages.error(
+            request,
+            f"No podés asignarte {materia_curso.materia.nombre}: se superpone con "
+            f"{conflicto.materia_curso.materia.nombre} el {conflicto.get_dia_display()} "
+            f"de {conflicto.hora_inicio} a {conflicto.hora_fin}."
+        )
+        return redirect("materias_disponibles")
 
     asignacion, creada = ProfesorMateriaCurso.objects.get_or_create(
         profesor=profesor,
@@ -618,7 +982,9 @@ def asignar_materia_profesor(request, id_materia_curso):
 
 @login_required
 def desasignar_materia(request, materia_id):
-    profesor = request.user.profesor
+    profesor = get_profesor_or_redirect(request)
+    if profesor is None:
+        return redirect("login")
 
     asignacion = get_object_or_404(
         ProfesorMateriaCurso,
@@ -639,11 +1005,11 @@ def desasignar_materia(request, materia_id):
 
 @login_required
 def mis_clases(request):
-    profesor = request.user.profesor
+    profesor = get_profesor_or_redirect(request)
+    if profesor is None:
+        return redirect("login")
 
-    asignaciones = ProfesorMateriaCurso.objects.filter(
-        profesor=profesor
-    ).select_related("materia_curso", "materia_curso__materia", "materia_curso__curso")
+    asignaciones = ProfesorMateriaCurso.objects.filter(profesor=profesor).con_resumen()
 
     return render(request, "profesores/mis_clases.html", {
         "asignaciones": asignaciones
@@ -657,44 +1023,58 @@ def mis_clases(request):
 # ===========================================
 @login_required
 def cargar_nota(request, clase_id):
-    curso = get_object_or_404(
-        MateriaCurso,
-        id_materia_curso=clase_id
-    )
+    cursos = cursos_a_cargo(request)
+    if cursos is None:
+        return redirect("login")
+    curso = get_object_or_404(cursos, id_materia_curso=clase_id)
 
-    inscripciones = AlumnoMateriaCurso.objects.filter(
-        materia_curso=curso
-    ).select_related('alumno')
+    inscripciones = list(
+        AlumnoMateriaCurso.objects.filter(
+            materia_curso=curso
+        ).select_related('alumno').order_by('alumno__apellido', 'alumno__nombre')
+    )
 
     if request.method == "POST":
+        # Se procesa toda la planilla en memoria y se escriben sólo las
+        # filas que cambiaron, con un bulk_update en una transacción
+        modificadas = []
+        errores = []
+
         for ins in inscripciones:
-            n1 = request.POST.get(f"nota_1_{ins.pk}")
-            n2 = request.POST.get(f"nota_2_{ins.pk}")
-            n3 = request.POST.get(f"nota_3_{ins.pk}")
-
-            ins.nota_1 = int(n1) if n1 else None
-            ins.nota_2 = int(n2) if n2 else None
-            ins.nota_3 = int(n3) if n3 else None
-
-            # ⛔ NO calcular promedio acá
-            # ⛔ NO tocar finalizado acá
-
-            ins.save()  # ← ACÁ se ejecuta toda la lógica real
-
-            # Mensajes solo si ya está finalizada
-            if ins.finalizado:
-                if ins.aprobado:
-                    messages.success(
-                        request,
-                        f"{ins.alumno} APROBÓ {curso.materia} "
-                        f"(Promedio: {ins.promedio})"
-                    )
-                else:
-                    messages.warning(
-                        request,
-                        f"{ins.alumno} DESAPROBÓ {curso.materia} "
-                        f"(Promedio: {ins.promedio})"
-                    )
+            try:
+                notas = [
+                    parsear_nota(request.POST.get(f"nota_{n}_{ins.pk}"))
+                    for n in (1, 2, 3)
+                ]
+            except ValueError:
+                errores.append(f"{ins.alumno.apellido}, {ins.alumno.nombre}")
+                continue
+
+            if aplicar_notas(ins, *notas):
+                modificadas.append(ins)
+
+        if errores:
+            messages.error(
+                request,
+                "No se guardó ninguna nota: hay valores inválidos (deben ser enteros de 0 a 10) en "
+                + "; ".join(errores) + "."
+            )
+            return render(
+                request,
+                "profesores/cargar_nota.html",
+                {"curso": curso, "inscripciones": inscripciones},
+                status=400
+            )
+
+        guardar_notas(modificadas)
+
+        resumen = resumir(inscripciones)
+        messages.success(
+            request,
+            f"{curso.materia.nombre}: se actualizaron {len(modificadas)} alumno(s). "
+            f"Aprobados: {resumen['aprobados']} · Desaprobados: {resumen['desaprobados']} · "
+            f"Pendientes: {resumen['pendientes']}."
+        )
 
         return redirect('mis_clases')
 
@@ -708,9 +1088,77 @@ def cargar_nota(request, clase_id):
     )
 
 
+# ===========================================
+#   IMPORTACIÓN DE NOTAS (CSV)
+# ===========================================
+@login_required
+def importar_notas(request, clase_id):
+    cursos = cursos_a_cargo(request)
+    if cursos is None:
+        return redirect("login")
+    # Un curso ajeno da 404, igual que uno inexistente
+    curso = get_object_or_404(cursos, id_materia_curso=clase_id)
+
+    resultado = None
+    status = 200
+
+    if request.method == "POST":
+        archivo = request.FILES.get("archivo")
+        if archivo is None:
+            messages.error(request, "Elegí un archivo CSV para importar.")
+            status = 400
+        else:
+            # Archivos grandes quedan en un temporal en disco: se recorren
+            # como stream sin cargarlos en memoria
+            resultado = importar_notas_csv(curso, archivo.file)
+            if resultado['filas']:
+                resultado['filas_por_segundo'] = resultado['filas'] / max(resultado['segundos'], 1e-6)
+            if resultado['total_errores'] and not resultado['actualizadas']:
+                status = 400
+
+    return render(
+        request,
+        "profesores/importar_notas.html",
+        {
+            "curso": curso,
+            "resultado": resultado
+        },
+        status=status
+    )
+
+
+# ======================================================
+#  Exportación de notas (CSV)
+# ======================================================
+
+@login_required
+def exportar_notas_curso(request, clase_id):
+    cursos = cursos_a_cargo(request)
+    if cursos is None:
+        return redirect("login")
+    curso = get_object_or_404(cursos, id_materia_curso=clase_id)
+    return respuesta_csv(
+        notas_de_curso(curso.pk),
+        f"notas_{curso.materia.sigla}_{curso.curso.nombre}.csv"
+    )
+
+
+@staff_member_required
+def exportar_notas_carrera(request, carrera_id):
+    carrera = get_object_or_404(Carrera, id_carrera=carrera_id)
+    return respuesta_csv(notas_de_carrera(carrera.pk), f"notas_carrera_{carrera.pk}.csv")
+
+
+@staff_member_required
+def exportar_notas_ciclo(request, ciclo_lectivo):
+    return respuesta_csv(notas_de_ciclo(ciclo_lectivo), f"notas_ciclo_{ciclo_lectivo}.csv")
+
+
 @login_required
 def desasignar_materia(request, id_materia_curso):
-    profesor = request.user.profesor
+    profesor = get_profesor_or_redirect(request)
+    if profesor is None:
+        return redirect("login")
 
     asignacion = get_object_or_404(
         ProfesorMateriaCurso,
@@ -25,6 +25,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'UTN.roles.RolMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -41,6 +42,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'UTN.roles.rol',
             ],
         },
     },
@@ -48,10 +50,38 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Se ejecutan al abrir cada conexión SQLite
+PRAGMAS_SQLITE = [
+    # WAL: las lecturas no esperan a las escrituras ni al revés. Con WAL,
+    # synchronous=NORMAL sigue siendo consistente ante un corte y evita
+    # un fsync por transacción. Deja db.sqlite3-wal y db.sqlite3-shm al
+    # lado de la base (ignorados en .gitignore, ver README)
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    # Espera hasta 20 s a que se libere el lock de escritura en lugar de
+    # fallar con "database is locked"
+    'PRAGMA busy_timeout=20000',
+    # 128 MB mapeados en memoria y 20 MB de caché de páginas por conexión
+    'PRAGMA mmap_size=134217728',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA temp_store=MEMORY',
+]
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': '; '.join(PRAGMAS_SQLITE),
+            # Las transacciones (transaction.atomic) toman el lock de
+            # escritura al empezar: con BEGIN a secas dos lecturas que
+            # después escriben se bloquean entre sí y una falla sin esperar
+            'transaction_mode': 'IMMEDIATE',
+        },
+        # Una conexión por proceso reutilizada entre requests, verificada
+        # antes de reusarla
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -9,22 +9,19 @@ from UTN.views import (
     InicioView, PostLoginCheckView,
 
     # Alumno
-    AlumnoDetailView, AlumnoCreateView, AlumnoUpdateView,
+    AlumnoDetailView, AlumnoCreateView, AlumnoUpdateView, alumno_calendario, alumno_analitico, alumno_analitico_json, alumno_egreso_json,
     AlumnoDeleteView,
 
     # Materias
-    MateriaListView, MateriaReinscripcionView,
-    cancelar_reinscripcion, reinscribir_materia,
+    MateriaListView, MateriaReinscripcionView, materias_autocompletar,
+    cancelar_reinscripcion, reinscribir_materia, reinscribir_materias,
 
     # Carreras
-    CarreraListView,
-    Ingenieria_civil, Ingenieria_electronica, Ingenieria_energia,
-    Ingenieria_industrial, Ingenieria_mecanica, Ingenieria_metalurgica,
-    Ingenieria_quimica, Ingenieria_sistemas,
+    CarreraListView, carrera_detail, carrera_plan_json, carrera_egreso_json, carrera_anterior,
 
     # PROFESORES - nuevas vistas
     
-    login_profesores, desasignar_materia, dashboard, mis_clases, cargar_nota, logout_profesores, materias_disponibles, asignar_materia_profesor,  
+    login_profesores, desasignar_materia, dashboard, mis_clases, cargar_nota, importar_notas, exportar_notas_curso, exportar_notas_carrera, exportar_notas_ciclo, logout_profesores, materias_disponibles, asignar_materia_profesor,  
 )
 
 urlpatterns = [
@@ -42,26 +39,29 @@ urlpatterns = [
 
     # Alumno
     path('alumnos/<int:pk>/', AlumnoDetailView.as_view(), name='alumno_detail'),
+    path('alumnos/<int:pk>/calendario/<str:firma>.ics', alumno_calendario, name='alumno_calendario'),
+    path('alumnos/<int:pk>/analitico/', alumno_analitico, name='alumno_analitico'),
+    path('alumnos/<int:pk>/analitico.json', alumno_analitico_json, name='alumno_analitico_json'),
+    path('alumnos/<int:pk>/egreso.json', alumno_egreso_json, name='alumno_egreso_json'),
     path('alumnos/create/', AlumnoCreateView.as_view(), name='alumno_create'),
     path('alumnos/<int:pk>/update/', AlumnoUpdateView.as_view(), name='alumno_update'),
     path('alumnos/<int:pk>/delete/', AlumnoDeleteView.as_view(), name='alumno_delete'),
 
     # Materias / reinscripción
     path('materias/', MateriaListView.as_view(), name='materia_list'),
+    path('materias/autocompletar/', materias_autocompletar, name='materias_autocompletar'),
     path('reinscripcion/<int:alumno_id>/', MateriaReinscripcionView.as_view(), name='materia_reinscripcion'),
+    path('reinscripcion/<int:alumno_id>/lote/', reinscribir_materias, name='materia_reinscribir_lote'),
     path('reinscripcion/<int:alumno_id>/materia/<path:materia_id>/confirmar/', reinscribir_materia, name='materia_reinscribir'),
     path('reinscripcion/<int:alumno_id>/materia/<path:materia_id>/cancelar/', cancelar_reinscripcion, name='cancelar_reinscripcion'),
 
     # Carreras
     path('carreras/', CarreraListView.as_view(), name='carrera_list'),
-    path('carreras/ingenieria_civil/', Ingenieria_civil.as_view(), name='Ingenieria_civil'),
-    path('carreras/ingenieria_electronica/', Ingenieria_electronica.as_view(), name='Ingenieria_electronica'),
-    path('carreras/ingenieria_energia/', Ingenieria_energia.as_view(), name='Ingenieria_energia'),
-    path('carreras/ingenieria_industrial/', Ingenieria_industrial.as_view(), name='Ingenieria_industrial'),
-    path('carreras/ingenieria_mecanica/', Ingenieria_mecanica.as_view(), name='Ingenieria_mecanica'),
-    path('carreras/ingenieria_metalurgica/', Ingenieria_metalurgica.as_view(), name='Ingenieria_metalurgica'),
-    path('carreras/ingenieria_quimica/', Ingenieria_quimica.as_view(), name='Ingenieria_quimica'),
-    path('carreras/ingenieria_sistemas/', Ingenieria_sistemas.as_view(), name='ingenieria_sistemas'),
+    path('carreras/<int:pk>/', carrera_detail, name='carrera_detail'),
+    path('carreras/<int:pk>/plan.json', carrera_plan_json, name='carrera_plan_json'),
+    path('carreras/<int:pk>/egreso.json', carrera_egreso_json, name='carrera_egreso_json'),
+    # Páginas fijas anteriores: redirigen a la de la carrera
+    path('carreras/<slug:slug>/', carrera_anterior, name='carrera_anterior'),
 
     
     # ==========================
@@ -70,6 +70,10 @@ urlpatterns = [
     path("profesores/panel/<int:pk>/", dashboard, name="dashboard"),
     path("profesores/mis-clases/", mis_clases, name="mis_clases"),
     path("profesores/cargar-nota/<int:clase_id>/", cargar_nota, name="cargar_nota"),
+    path("profesores/cargar-nota/<int:clase_id>/importar/", importar_notas, name="importar_notas"),
+    path("profesores/cargar-nota/<int:clase_id>/exportar/", exportar_notas_curso, name="exportar_notas_curso"),
+    path("exportar/notas/carrera/<int:carrera_id>/", exportar_notas_carrera, name="exportar_notas_carrera"),
+    path("exportar/notas/ciclo/<int:ciclo_lectivo>/", exportar_notas_ciclo, name="exportar_notas_ciclo"),
     path("profesores/logout/", logout_profesores, name="logout_profesores"),
     path("profesores/materias-disponibles/", materias_disponibles, name="materias_disponibles"),
     path("profesores/asignar/<int:id_materia_curso>/", asignar_materia_profesor, name="asignar_materia_profesor"),